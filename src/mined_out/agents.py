@@ -0,0 +1,86 @@
+from typing import Callable, Dict, List, Optional
+
+from mined_out.common import CellType, Direction, Position, move_position
+from mined_out.game_state import GameState
+from mined_out.grid_operations import can_move_to_cell
+from mined_out.mine_probability import MineHints
+from mined_out.path_planner import (
+    DANGER_WEIGHT, PathPlanner, move_start, next_direction, replan, set_goals, set_risk, update_cells
+)
+from mined_out.rng import GameRng, new_seed
+
+# An agent picks the next direction for a state, or None to wait
+Agent = Callable[[GameState, int, int], Optional[Direction]]
+
+DIRECTIONS = tuple(Direction)
+
+class RandomAgent:
+    """Agent that walks in a random passable direction each tick."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = GameRng(new_seed() if seed is None else seed).split("agent")
+
+    def __call__(self, state: GameState, width: int, height: int) -> Optional[Direction]:
+        options = [d for d in DIRECTIONS
+                   if can_move_to_cell(state.grid, move_position(state.player_pos, d), width, height)]
+        return self.rng.choice(options) if options else None
+
+def planner_goals(state: GameState, width: int, height: int) -> List[Position]:
+    """Remaining items, or the exit once they are all collected."""
+    items = [Position(x, y) for y, row in enumerate(state.grid) for x, cell in enumerate(row)
+             if cell == CellType.ITEM]
+    return items or [state.exit_pos]
+
+def visible_cell(cell: CellType, index: int, probabilities: Dict[int, float]) -> CellType:
+    """A cell as the player knows it: a hidden mine reads as empty until the trail proves it."""
+    if cell == CellType.MINE and probabilities.get(index, 0.0) < 1.0:
+        return CellType.EMPTY
+    return cell
+
+def sync_view(view: List[List[CellType]], grid: List[List[CellType]], probabilities: Dict[int, float],
+              width: int) -> List[Position]:
+    """Bring the player's view up to date with the grid, returning the cells that changed."""
+    changed = []
+    for y, row in enumerate(grid):
+        view_row = view[y]
+        for x, cell in enumerate(row):
+            cell = visible_cell(cell, y * width + x, probabilities)
+            if view_row[x] != cell:
+                view_row[x] = cell
+                changed.append(Position(x, y))
+    return changed
+
+class PlannerAgent:
+    """Agent that follows the cheapest danger-weighted path to the nearest item, then the exit.
+
+    It plans only from what the player can see: the planner gets a view of
+    the grid in which hidden mines are unknown cells, weighted by their mine
+    probability, and only mines the trail proves are avoided outright. The
+    planner survives between ticks and is only rebuilt for a new level;
+    picking up an item just retargets it. With no way on it waits (None).
+    """
+
+    def __init__(self, danger_weight: float = DANGER_WEIGHT):
+        self.danger_weight = danger_weight
+        self.planner: Optional[PathPlanner] = None
+        self.grid: Optional[List[List[CellType]]] = None
+        self.view: List[List[CellType]] = []
+        self.hints = MineHints()
+
+    def __call__(self, state: GameState, width: int, height: int) -> Optional[Direction]:
+        probabilities = self.hints.update(state, width, height)
+        planner = self.planner
+        if planner is None or self.grid is not state.grid:
+            self.grid = state.grid
+            self.view = [list(row) for row in state.grid]
+            sync_view(self.view, state.grid, probabilities, width)
+            planner = self.planner = PathPlanner(self.view, width, height, state.player_pos,
+                                                 planner_goals(state, width, height), self.danger_weight)
+        else:
+            move_start(planner, state.player_pos)
+            update_cells(planner, sync_view(self.view, state.grid, probabilities, width))
+            if planner.start in planner.goals:
+                set_goals(planner, planner_goals(state, width, height))
+        set_risk(planner, probabilities)
+        replan(planner)
+        return next_direction(planner)
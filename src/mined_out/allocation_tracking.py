@@ -0,0 +1,166 @@
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ALLOC_DEBUG_ENV = "MINED_OUT_ALLOC_DEBUG"
+REPORT_INTERVAL = 300  # frames between debug reports
+TOP_LINES = 5
+
+# Allocations made by the tracker itself are not the game's
+IGNORED_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+                 "<frozen importlib._bootstrap_external>", "<unknown>")
+
+# (file:line, blocks, bytes)
+LineAllocations = Tuple[str, int, int]
+
+@dataclass(frozen=True)
+class FrameAllocations:
+    """Memory a measured call left allocated, attributed to source lines.
+
+    blocks and size are net: what is still alive when the call returns, which
+    is what grows the heap and wakes the garbage collector. They miss
+    temporaries freed before the call returns (f-strings, str() results,
+    Position objects); peak catches those. It is the most memory the call
+    held at once above where it started. measure_allocations subtracts its
+    own overhead, so there a peak of 0 means the call allocated nothing.
+    """
+    label: str
+    blocks: int
+    size: int
+    peak: int
+    top: List[LineAllocations]
+
+class AllocationTracker:
+    """Per-label allocation totals for the frames measured so far."""
+
+    def __init__(self, report_interval: int = REPORT_INTERVAL, top_lines: int = TOP_LINES):
+        self.report_interval = report_interval
+        self.top_lines = top_lines
+        self.frames: Dict[str, int] = {}
+        self.blocks: Dict[str, int] = {}
+        self.size: Dict[str, int] = {}
+        self.lines: Dict[str, Dict[str, List[int]]] = {}
+        self.last: Dict[str, FrameAllocations] = {}
+
+def alloc_debug_from_env() -> bool:
+    """Check whether the environment asks for allocation debugging."""
+    return os.environ.get(ALLOC_DEBUG_ENV, "") not in ("", "0")
+
+def start_tracing() -> bool:
+    """Start tracemalloc if nothing else has, returning whether this call started it."""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start()
+    return True
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Snapshot of traced memory without the tracker's own allocations."""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES])
+
+def compare_snapshots(label: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                      peak: int, top_lines: int = TOP_LINES) -> FrameAllocations:
+    """Net allocations between two snapshots, largest source lines first."""
+    diffs = [diff for diff in after.compare_to(before, "lineno") if diff.count_diff or diff.size_diff]
+    top = [(f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}", diff.count_diff, diff.size_diff)
+           for diff in diffs if diff.count_diff > 0][:top_lines]
+    return FrameAllocations(label, sum(diff.count_diff for diff in diffs),
+                            sum(diff.size_diff for diff in diffs), peak, top)
+
+@contextmanager
+def measure_block(label: str, top_lines: int = TOP_LINES) -> Iterator[List[FrameAllocations]]:
+    """Measure the allocations of the with-block; the result is appended to the yielded list."""
+    started = start_tracing()
+    result: List[FrameAllocations] = []
+    before = take_snapshot()
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield result
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        after = take_snapshot()
+        if started:
+            tracemalloc.stop()
+        result.append(compare_snapshots(label, before, after, max(peak - start, 0), top_lines))
+
+def record_frame(tracker: AllocationTracker, frame: FrameAllocations) -> None:
+    """Add one measured frame to the tracker's totals."""
+    label = frame.label
+    tracker.frames[label] = tracker.frames.get(label, 0) + 1
+    tracker.blocks[label] = tracker.blocks.get(label, 0) + frame.blocks
+    tracker.size[label] = tracker.size.get(label, 0) + frame.size
+    lines = tracker.lines.setdefault(label, {})
+    for line, blocks, size in frame.top:
+        totals = lines.setdefault(line, [0, 0])
+        totals[0] += blocks
+        totals[1] += size
+    tracker.last[label] = frame
+
+@contextmanager
+def track_frame(tracker: AllocationTracker, label: str) -> Iterator[None]:
+    """Measure one update or draw call into the tracker, printing a report every report_interval frames."""
+    with measure_block(label, tracker.top_lines) as result:
+        yield
+    record_frame(tracker, result[0])
+    if tracker.report_interval and tracker.frames[label] % tracker.report_interval == 0:
+        print(format_report(tracker, label), file=sys.stderr)
+
+def format_report(tracker: AllocationTracker, label: str) -> str:
+    """Average allocations per frame for a label and the lines responsible."""
+    frames = tracker.frames.get(label, 0) or 1
+    lines = [f"{label}: {tracker.blocks.get(label, 0) / frames:.1f} blocks, "
+             f"{tracker.size.get(label, 0) / frames:.0f} bytes per frame over {frames} frames"]
+    ranked = sorted(tracker.lines.get(label, {}).items(), key=lambda item: item[1][1], reverse=True)
+    for line, (blocks, size) in ranked[:tracker.top_lines]:
+        lines.append(f"  {line}: {blocks / frames:.1f} blocks, {size / frames:.0f} bytes")
+    return "\n".join(lines)
+
+def no_op() -> None:
+    pass
+
+def call_peak(func: Callable, args: tuple, kwargs: dict) -> int:
+    """Most traced memory held at once during a call, above where it started."""
+    start = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    func(*args, **kwargs)
+    return tracemalloc.get_traced_memory()[1] - start
+
+def measure_allocations(func: Callable, *args, label: Optional[str] = None, **kwargs) -> FrameAllocations:
+    """Allocations of one call.
+
+    Unlike measure_block, nothing but the call runs while the peak is
+    tracked, so a call that allocates nothing measures a peak of exactly 0.
+    """
+    started = start_tracing()
+    before = take_snapshot()
+    overhead = call_peak(no_op, (), {})  # the measurement's own integers
+    peak = call_peak(func, args, kwargs)
+    after = take_snapshot()
+    if started:
+        tracemalloc.stop()
+    return compare_snapshots(label or getattr(func, "__name__", "call"), before, after, max(peak - overhead, 0))
+
+def assert_max_allocations(func: Callable, max_blocks: int, *args, max_peak: Optional[int] = 0,
+                           warmup: int = 2, **kwargs) -> FrameAllocations:
+    """Fail if one call leaves more than max_blocks allocated, or peaks above max_peak bytes.
+
+    The default max_peak of 0 forbids temporaries too, which the net block
+    count cannot see; pass None to check only what the call leaves behind.
+    The call runs warmup times first so caches it fills count as setup
+    rather than as a per-frame cost.
+    """
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    allocations = measure_allocations(func, *args, **kwargs)
+    if allocations.blocks > max_blocks:
+        details = "\n".join(f"  {line}: {blocks} blocks, {size} bytes" for line, blocks, size in allocations.top)
+        raise AssertionError(f"{allocations.label} left {allocations.blocks} blocks allocated "
+                             f"(budget {max_blocks}):\n{details}")
+    if max_peak is not None and allocations.peak > max_peak:
+        raise AssertionError(f"{allocations.label} allocated {allocations.peak} bytes of temporaries "
+                             f"(budget {max_peak})")
+    return allocations
@@ -1,14 +1,129 @@
 import pyxel
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+CHANNEL_COUNT = 4  # pyxel mixes four channels
+
+EXPLOSION = "explosion"
+ITEM_COLLECT = "item_collect"
+
+@dataclass(frozen=True)
+class SoundDef:
+    """A sound bank slot, its pyxel definition and how much it matters when channels run out."""
+    slot: int
+    notes: str
+    tones: str
+    volumes: str
+    effects: str
+    speed: int
+    priority: int  # higher pre-empts lower
+
+SOUNDS: Dict[str, SoundDef] = {
+    EXPLOSION: SoundDef(0, "c2e2g2c3", "p", "7", "f", 10, priority=2),
+    ITEM_COLLECT: SoundDef(1, "g3c4e4g4", "p", "7", "f", 8, priority=1),
+}
+
+class NullAudioBackend:
+    """Plays nothing; the mixer skips all work for it, so batch runs pay nothing for audio."""
+
+    silent = True
+
+    def compile(self, sounds: Dict[str, SoundDef]) -> None:
+        pass
+
+    def play(self, channel: int, sound: SoundDef) -> None:
+        pass
+
+    def is_playing(self, channel: int) -> bool:
+        return False
+
+class PyxelAudioBackend:
+    """Plays through pyxel; sound definitions are written to the sound bank once."""
+
+    silent = False
+
+    def __init__(self):
+        self.compiled = False
+
+    def compile(self, sounds: Dict[str, SoundDef]) -> None:
+        if self.compiled:
+            return
+        for sound in sounds.values():
+            pyxel.sounds[sound.slot].set(sound.notes, sound.tones, sound.volumes, sound.effects, sound.speed)
+        self.compiled = True
+
+    def play(self, channel: int, sound: SoundDef) -> None:
+        pyxel.play(channel, sound.slot)
+
+    def is_playing(self, channel: int) -> bool:
+        return pyxel.play_pos(channel) is not None
+
+class AudioMixer:
+    """Collects sound events during a tick and plays them together at its end.
+
+    A sound queued twice in one tick plays once. Louder-priority sounds get
+    channels first; when all channels are busy a sound replaces one of
+    lower priority, or is dropped.
+    """
+
+    def __init__(self, backend=None, channel_count: int = CHANNEL_COUNT):
+        self.backend = backend or NullAudioBackend()
+        self.pending: List[str] = []
+        self.channels: List[Optional[SoundDef]] = [None] * channel_count
+
+_mixer = AudioMixer()
+
+def get_mixer() -> AudioMixer:
+    """Get the mixer game logic sends sounds to."""
+    return _mixer
+
+def set_audio_backend(backend) -> None:
+    """Switch the shared mixer's backend, e.g. to NullAudioBackend for headless runs."""
+    backend.compile(SOUNDS)
+    _mixer.backend = backend
+    _mixer.pending.clear()
+    _mixer.channels = [None] * len(_mixer.channels)
+
+def queue_sound(mixer: AudioMixer, name: str) -> None:
+    """Queue a sound for the end of this tick, once however often it is queued."""
+    if mixer.backend.silent or name in mixer.pending:
+        return
+    mixer.pending.append(name)
+
+def pick_channel(mixer: AudioMixer, sound: SoundDef) -> Optional[int]:
+    """A free channel, else the one playing the lowest priority sound below this one."""
+    backend = mixer.backend
+    lowest: Optional[int] = None
+    for channel, playing in enumerate(mixer.channels):
+        if playing is None or not backend.is_playing(channel):
+            return channel
+        if playing.priority < sound.priority and (lowest is None or playing.priority < mixer.channels[lowest].priority):
+            lowest = channel
+    return lowest
+
+def flush_sounds(mixer: AudioMixer) -> int:
+    """Play this tick's queued sounds, highest priority first, returning how many started."""
+    if not mixer.pending:
+        return 0
+    started = 0
+    for name in sorted(mixer.pending, key=lambda queued: SOUNDS[queued].priority, reverse=True):
+        sound = SOUNDS[name]
+        channel = pick_channel(mixer, sound)
+        if channel is not None:
+            mixer.backend.play(channel, sound)
+            mixer.channels[channel] = sound
+            started += 1
+    mixer.pending.clear()
+    return started
 
 def setup_sounds() -> None:
-    """Initialize game sounds."""
-    pyxel.sounds[0].set("c2e2g2c3", "p", "7", "f", 10)  # Explosion
-    pyxel.sounds[1].set("g3c4e4g4", "p", "7", "f", 8)   # Item collect
+    """Play game sounds through pyxel."""
+    set_audio_backend(PyxelAudioBackend())
 
 def play_explosion() -> None:
-    """Play explosion sound."""
-    pyxel.play(0, 0)
+    """Queue explosion sound."""
+    queue_sound(_mixer, EXPLOSION)
 
 def play_item_collect() -> None:
-    """Play item collection sound."""
-    pyxel.play(0, 1)
+    """Queue item collection sound."""
+    queue_sound(_mixer, ITEM_COLLECT)
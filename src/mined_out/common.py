@@ -13,6 +13,10 @@ class CellType(Enum):
     REVEALED_MINE = "revealed_mine"
     VISITED = "visited"
 
+# Stable numeric codes for compact encodings of the grid
+CELL_TYPES = tuple(CellType)
+CELL_CODES = {cell_type: code for code, cell_type in enumerate(CELL_TYPES)}
+
 class Direction(Enum):
     UP = (0, -1)
     DOWN = (0, 1)
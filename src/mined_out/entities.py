@@ -0,0 +1,135 @@
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Set
+
+from mined_out.common import Position
+
+CHUNK_SHIFT = 3  # 8x8-cell chunks
+ENTITY_CAPACITY = 1024
+NO_SLOT = -1
+
+class EntityKind(IntEnum):
+    PLAYER = 0
+    SPREADER = 1
+    BUG = 2
+
+class EntityStore:
+    """Fixed-capacity actors kept in parallel arrays, indexed by a chunked spatial hash.
+
+    Entities are referred to by stable ids. Live entities occupy dense
+    slots [0, count) and dead ones are swap-removed, as in ParticlePool;
+    slot_of maps an id to its current slot. chunks maps a chunk key to the
+    ids inside it, so a move updates at most two sets and a query only
+    looks at the chunks it overlaps.
+    """
+
+    def __init__(self, capacity: int = ENTITY_CAPACITY, chunk_shift: int = CHUNK_SHIFT):
+        self.capacity = capacity
+        self.chunk_shift = chunk_shift
+        self.count = 0
+        self.ids = array("i", [0] * capacity)
+        self.x = array("h", [0] * capacity)
+        self.y = array("h", [0] * capacity)
+        self.kind = array("B", [0] * capacity)
+        self.slot_of = array("i", [NO_SLOT] * capacity)
+        self.free_ids: List[int] = list(range(capacity - 1, -1, -1))
+        self.chunks: Dict[int, Set[int]] = {}
+
+def chunk_key(store: EntityStore, x: int, y: int) -> int:
+    """Spatial hash key of the chunk holding a cell; an int, so lookups build no tuples."""
+    return ((y >> store.chunk_shift) << 16) ^ (x >> store.chunk_shift)
+
+def spawn_entity(store: EntityStore, kind: EntityKind, x: int, y: int) -> Optional[int]:
+    """Add an entity and return its id, or None when the store is full."""
+    if not store.free_ids:
+        return None
+    entity = store.free_ids.pop()
+    slot = store.count
+    store.ids[slot] = entity
+    store.x[slot] = x
+    store.y[slot] = y
+    store.kind[slot] = kind
+    store.slot_of[entity] = slot
+    store.count = slot + 1
+    store.chunks.setdefault(chunk_key(store, x, y), set()).add(entity)
+    return entity
+
+def live_slot(store: EntityStore, entity: int) -> int:
+    """Slot of a live entity; raises KeyError for a removed or unknown id."""
+    if not is_alive(store, entity):
+        raise KeyError(f"entity {entity} is not alive")
+    return store.slot_of[entity]
+
+def remove_entity(store: EntityStore, entity: int) -> None:
+    """Remove an entity by moving the last live one into its slot."""
+    slot = live_slot(store, entity)
+    key = chunk_key(store, store.x[slot], store.y[slot])
+    members = store.chunks[key]
+    members.discard(entity)
+    if not members:
+        del store.chunks[key]
+
+    last = store.count - 1
+    if slot != last:
+        moved = store.ids[last]
+        store.ids[slot] = moved
+        store.x[slot] = store.x[last]
+        store.y[slot] = store.y[last]
+        store.kind[slot] = store.kind[last]
+        store.slot_of[moved] = slot
+    store.slot_of[entity] = NO_SLOT
+    store.count = last
+    store.free_ids.append(entity)
+
+def move_entity(store: EntityStore, entity: int, x: int, y: int) -> None:
+    """Move an entity; the spatial hash only changes when it crosses into another chunk."""
+    slot = live_slot(store, entity)
+    old_key = chunk_key(store, store.x[slot], store.y[slot])
+    new_key = chunk_key(store, x, y)
+    store.x[slot] = x
+    store.y[slot] = y
+    if old_key != new_key:
+        members = store.chunks[old_key]
+        members.discard(entity)
+        if not members:
+            del store.chunks[old_key]
+        store.chunks.setdefault(new_key, set()).add(entity)
+
+def is_alive(store: EntityStore, entity: int) -> bool:
+    """Check whether an id refers to a live entity."""
+    return 0 <= entity < store.capacity and store.slot_of[entity] != NO_SLOT
+
+def entity_position(store: EntityStore, entity: int) -> Position:
+    """Get the cell an entity stands on."""
+    slot = live_slot(store, entity)
+    return Position(store.x[slot], store.y[slot])
+
+def entity_kind(store: EntityStore, entity: int) -> EntityKind:
+    """Get what kind of actor an entity is."""
+    return EntityKind(store.kind[live_slot(store, entity)])
+
+def entities_in_rect(store: EntityStore, x0: int, y0: int, x1: int, y1: int) -> Iterator[int]:
+    """Ids of entities with x0 <= x <= x1 and y0 <= y <= y1, visiting only overlapping chunks."""
+    shift = store.chunk_shift
+    chunks, slot_of, xs, ys = store.chunks, store.slot_of, store.x, store.y
+    for cy in range(y0 >> shift, (y1 >> shift) + 1):
+        for cx in range(x0 >> shift, (x1 >> shift) + 1):
+            members = chunks.get((cy << 16) ^ cx)
+            if not members:
+                continue
+            for entity in members:
+                slot = slot_of[entity]
+                if x0 <= xs[slot] <= x1 and y0 <= ys[slot] <= y1:
+                    yield entity
+
+def entities_at(store: EntityStore, x: int, y: int) -> List[int]:
+    """Ids of entities standing on a cell, for collision checks."""
+    return list(entities_in_rect(store, x, y, x, y))
+
+def entities_near(store: EntityStore, x: int, y: int, radius: int = 1) -> List[int]:
+    """Ids of entities within radius cells (including diagonals) of a cell."""
+    return list(entities_in_rect(store, x - radius, y - radius, x + radius, y + radius))
+
+def entities_in_viewport(store: EntityStore, camera_x: int, camera_y: int, width: int, height: int) -> Iterator[int]:
+    """Ids of entities inside a viewport of width x height cells, for render culling."""
+    return entities_in_rect(store, camera_x, camera_y, camera_x + width - 1, camera_y + height - 1)
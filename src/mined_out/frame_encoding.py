@@ -0,0 +1,183 @@
+import struct
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+
+from mined_out.common import CellType, Position, CELL_CODES, CELL_TYPES
+from mined_out.game_state import CellChange, GameState
+
+KEYFRAME = ord("K")
+DELTA = ord("D")
+KEYFRAME_INTERVAL = 120
+
+FLAG_GAME_OVER = 1
+FLAG_WON = 2
+FLAG_EXPLODING = 4
+FLAG_REVEALING = 8
+
+# Every frame is sent as: length prefix, header, payload
+FRAME_LENGTH = struct.Struct("<H")
+# kind, sequence, level, player x, player y, items collected, total items, mines nearby, flags, payload count
+FRAME_HEADER = struct.Struct("<BIBBBBBBBH")
+# keyframe payload prefix: width, height (followed by one code byte per cell)
+KEYFRAME_SIZE = struct.Struct("<BB")
+# delta payload entry: flat cell index, new cell code
+CELL_DELTA = struct.Struct("<HB")
+
+class FrameEncoder:
+    """Turns successive game states into keyframes and cell deltas."""
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.codes: Optional[bytes] = None
+        self.fields: Optional[Tuple[int, ...]] = None
+        self.frames_since_keyframe = 0
+
+@dataclass
+class SpectatorView:
+    """Decoded copy of the game as seen by a viewer."""
+    width: int = 0
+    height: int = 0
+    codes: bytearray = field(default_factory=bytearray)
+    seq: int = 0
+    level: int = 0
+    player_pos: Position = Position(0, 0)
+    items_collected: int = 0
+    total_items: int = 0
+    mine_count_nearby: int = 0
+    flags: int = 0
+
+# Enum members are singletons; keying on id() skips Enum.__hash__, which runs in Python
+CODES_BY_ID = {id(cell_type): code for cell_type, code in CELL_CODES.items()}
+
+def grid_codes(grid: List[List[CellType]]) -> bytes:
+    """Flatten grid into one code byte per cell, row by row."""
+    return bytes(map(CODES_BY_ID.__getitem__, map(id, chain.from_iterable(grid))))
+
+def changed_indices(codes: bytes, previous: bytes) -> List[int]:
+    """Indices where two equally long code strings differ, found by XOR-ing them as integers.
+
+    The loop runs once per changed cell rather than once per cell.
+    """
+    diff = int.from_bytes(codes, "little") ^ int.from_bytes(previous, "little")
+    changed = []
+    while diff:
+        index = ((diff & -diff).bit_length() - 1) >> 3
+        changed.append(index)
+        diff &= ~(0xFF << (index << 3))
+    return changed
+
+def state_flags(state: GameState) -> int:
+    """Pack boolean state into frame flags."""
+    flags = 0
+    if state.game_over:
+        flags |= FLAG_GAME_OVER
+    if state.won:
+        flags |= FLAG_WON
+    if state.explosion is not None:
+        flags |= FLAG_EXPLODING
+    if state.mine_reveal_timer > 0:
+        flags |= FLAG_REVEALING
+    return flags
+
+def header_fields(state: GameState) -> Tuple[int, ...]:
+    """Collect the per-frame counters sent in every header."""
+    return (state.level, state.player_pos.x, state.player_pos.y, state.items_collected,
+            state.total_items, state.mine_count_nearby, state_flags(state))
+
+def frame_kind(frame: bytes) -> int:
+    """Get kind byte of a length-prefixed frame."""
+    return frame[FRAME_LENGTH.size]
+
+def _pack_frame(kind: int, seq: int, fields: Tuple[int, ...], count: int, payload: bytes) -> bytes:
+    body = FRAME_HEADER.pack(kind, seq, *fields, count) + payload
+    return FRAME_LENGTH.pack(len(body)) + body
+
+def encode_frame(encoder: FrameEncoder, state: GameState, width: int, height: int,
+                 force_keyframe: bool = False, always: bool = False) -> Optional[bytes]:
+    """Encode state relative to the previous call, or None if nothing changed.
+
+    With always set an unchanged state still gives an empty delta, so
+    request/reply protocols get one frame per request.
+    """
+    codes = grid_codes(state.grid)
+    fields = header_fields(state)
+    previous = encoder.codes
+
+    if (force_keyframe or previous is None or len(previous) != len(codes)
+            or encoder.frames_since_keyframe >= encoder.keyframe_interval):
+        kind, count = KEYFRAME, len(codes)
+        payload = KEYFRAME_SIZE.pack(width, height) + codes
+        encoder.frames_since_keyframe = 0
+    else:
+        if codes == previous and fields == encoder.fields and not always:
+            return None
+        changed = changed_indices(codes, previous) if codes != previous else []
+        kind, count = DELTA, len(changed)
+        payload = b"".join(CELL_DELTA.pack(i, codes[i]) for i in changed)
+        encoder.frames_since_keyframe += 1
+
+    encoder.seq += 1
+    encoder.codes = codes
+    encoder.fields = fields
+    return _pack_frame(kind, encoder.seq, fields, count, payload)
+
+def apply_frame(view: SpectatorView, body: bytes) -> bool:
+    """Apply a frame body (without length prefix); False if a delta arrives before any keyframe."""
+    kind, seq, level, px, py, items, total, mines, flags, count = FRAME_HEADER.unpack_from(body)
+    offset = FRAME_HEADER.size
+
+    if kind == KEYFRAME:
+        view.width, view.height = KEYFRAME_SIZE.unpack_from(body, offset)
+        offset += KEYFRAME_SIZE.size
+        view.codes = bytearray(body[offset:offset + count])
+    elif not view.codes:
+        return False
+    else:
+        codes = view.codes
+        for _ in range(count):
+            index, code = CELL_DELTA.unpack_from(body, offset)
+            codes[index] = code
+            offset += CELL_DELTA.size
+
+    view.seq = seq
+    view.level = level
+    if view.player_pos.x != px or view.player_pos.y != py:
+        view.player_pos = Position(px, py)
+    view.items_collected = items
+    view.total_items = total
+    view.mine_count_nearby = mines
+    view.flags = flags
+    return True
+
+def view_cell(view: SpectatorView, x: int, y: int) -> CellType:
+    """Get decoded cell type at position."""
+    return CELL_TYPES[view.codes[y * view.width + x]]
+
+def encode_changes(encoder: FrameEncoder, state: GameState, changes: Iterable[CellChange], width: int, height: int,
+                   always: bool = False) -> Optional[bytes]:
+    """Encode a delta straight from a set_cell change log instead of rescanning the grid.
+
+    The log must cover every write since the previous frame, so the caller
+    keeps it attached to the state and clears it after each call. Falls back
+    to encode_frame when a keyframe is due.
+    """
+    previous = encoder.codes
+    if (previous is None or len(previous) != width * height
+            or encoder.frames_since_keyframe >= encoder.keyframe_interval):
+        return encode_frame(encoder, state, width, height, always=always)
+
+    codes = bytearray(previous)
+    for x, y, _, new_cell in changes:
+        codes[y * width + x] = CELL_CODES[new_cell]
+    fields = header_fields(state)
+    if codes == previous and fields == encoder.fields and not always:
+        return None
+    changed = changed_indices(codes, previous) if codes != previous else []
+    encoder.frames_since_keyframe += 1
+    encoder.seq += 1
+    encoder.codes = bytes(codes)
+    encoder.fields = fields
+    payload = b"".join(CELL_DELTA.pack(i, codes[i]) for i in changed)
+    return _pack_frame(DELTA, encoder.seq, fields, len(changed), payload)
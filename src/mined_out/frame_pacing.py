@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+FPS = 30  # pyxel's default frame rate, which MinedOut runs at
+DRAW_BUDGET_SHARE = 0.5  # the rest of the frame is left for update and the flip
+DRAW_BUDGET = DRAW_BUDGET_SHARE / FPS
+SMOOTHING = 0.1  # weight of the newest sample in the moving average
+DOWNGRADE_RATIO = 1.0  # average draw cost above budget * ratio counts as over budget
+UPGRADE_RATIO = 0.6  # ... and below budget * ratio as headroom
+DOWNGRADE_FRAMES = 15  # half a second over budget before dropping a level
+UPGRADE_FRAMES = 90  # three seconds of headroom before raising one
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """How much effect work a frame may do."""
+    spark_stride: int  # draw every nth explosion spark
+    hud_interval: int  # frames between HUD redraws
+    overlays: bool     # hint overlay on or off
+
+# Best first; each step sheds more draw work
+QUALITY_LEVELS: Tuple[QualityLevel, ...] = (
+    QualityLevel(spark_stride=1, hud_interval=1, overlays=True),
+    QualityLevel(spark_stride=2, hud_interval=1, overlays=True),
+    QualityLevel(spark_stride=2, hud_interval=4, overlays=True),
+    QualityLevel(spark_stride=4, hud_interval=8, overlays=False),
+)
+
+class PacingController:
+    """Picks an effect quality level from recent draw cost.
+
+    Draw times feed an exponential moving average. Quality drops one level
+    after the average has been over budget for downgrade_frames frames in a
+    row and rises one level only after upgrade_frames frames well under
+    budget; the gap between the two thresholds and the longer wait to
+    upgrade keep it from flapping. The average restarts at every change so
+    each level is judged on its own cost. Only drawing is scaled: the
+    logic tick rate never changes.
+    """
+
+    def __init__(self, budget: float = DRAW_BUDGET, levels: Tuple[QualityLevel, ...] = QUALITY_LEVELS,
+                 downgrade_frames: int = DOWNGRADE_FRAMES, upgrade_frames: int = UPGRADE_FRAMES):
+        self.budget = budget
+        self.levels = levels
+        self.downgrade_frames = downgrade_frames
+        self.upgrade_frames = upgrade_frames
+        self.level = 0
+        self.average = 0.0
+        self.over_frames = 0
+        self.under_frames = 0
+        self.frame = 0
+
+def current_quality(controller: PacingController) -> QualityLevel:
+    """Quality settings for the next frame."""
+    return controller.levels[controller.level]
+
+def record_draw_time(controller: PacingController, seconds: float) -> int:
+    """Add one draw duration and return the quality level index to use next."""
+    controller.frame += 1
+    if controller.average == 0.0:
+        controller.average = seconds
+    else:
+        controller.average += SMOOTHING * (seconds - controller.average)
+
+    if controller.average > controller.budget * DOWNGRADE_RATIO:
+        controller.over_frames += 1
+        controller.under_frames = 0
+    elif controller.average < controller.budget * UPGRADE_RATIO:
+        controller.under_frames += 1
+        controller.over_frames = 0
+    else:
+        controller.over_frames = controller.under_frames = 0
+
+    if controller.over_frames >= controller.downgrade_frames and controller.level < len(controller.levels) - 1:
+        set_quality_level(controller, controller.level + 1)
+    elif controller.under_frames >= controller.upgrade_frames and controller.level > 0:
+        set_quality_level(controller, controller.level - 1)
+    return controller.level
+
+def set_quality_level(controller: PacingController, level: int) -> None:
+    """Switch level and start measuring afresh, so cost from the old level cannot trigger another step."""
+    controller.level = level
+    controller.average = 0.0
+    controller.over_frames = controller.under_frames = 0
+
+def hud_due(controller: PacingController) -> bool:
+    """Check whether the HUD should be redrawn this frame."""
+    return controller.frame % current_quality(controller).hud_interval == 0
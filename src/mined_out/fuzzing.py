@@ -0,0 +1,170 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from mined_out.common import CellType, Direction
+from mined_out.constants import GRID_WIDTH, GRID_HEIGHT
+from mined_out.game_state import GameState
+from mined_out.audio_operations import NullAudioBackend, set_audio_backend
+from mined_out.game_logic import try_player_move, update_game_timers
+from mined_out.grid_operations import count_adjacent_mines, count_cells_of_type, is_border_position, is_valid_position
+from mined_out.level_generation import create_level_state
+from mined_out.rng import GameRng
+
+MOVE_CODES = {"U": Direction.UP, "D": Direction.DOWN, "L": Direction.LEFT, "R": Direction.RIGHT}
+MOVE_ALPHABET = "UDLR"
+CASES_PER_BATCH = 256
+
+@dataclass(frozen=True)
+class FuzzFailure:
+    seed: int
+    moves: str
+    step: int
+    message: str
+
+    def replay(self) -> str:
+        """Replay string accepted by the --replay option."""
+        return f"{self.seed}:{self.moves}"
+
+def check_invariants(state: GameState, width: int, height: int) -> Optional[str]:
+    """Get description of the first broken game-rule invariant, or None."""
+    pos = state.player_pos
+    if not is_valid_position(pos, width, height) or is_border_position(pos.x, pos.y, width, height):
+        return f"player escaped to {pos}"
+    player_cells = count_cells_of_type(state.grid, CellType.PLAYER)
+    if player_cells != 1:
+        return f"expected 1 PLAYER cell, found {player_cells}"
+    if state.grid[pos.y][pos.x] != CellType.PLAYER:
+        return f"player_pos {pos} holds {state.grid[pos.y][pos.x]}"
+    if not 0 <= state.items_collected <= state.total_items:
+        return f"items_collected {state.items_collected} outside 0..{state.total_items}"
+    if pos != state.exit_pos and state.grid[state.exit_pos.y][state.exit_pos.x] != CellType.EXIT:
+        return f"exit at {state.exit_pos} was erased"
+    if state.mine_reveal_timer == 0 and not state.game_over:
+        expected = count_adjacent_mines(state.grid, pos, width, height)
+        if state.mine_count_nearby != expected:
+            return f"mine_count_nearby {state.mine_count_nearby} != recomputed {expected}"
+    return None
+
+def settle_timers(state: GameState) -> None:
+    """Run timers until a pending mine reveal has resolved."""
+    while state.mine_reveal_timer > 0:
+        update_game_timers(state)
+
+def run_case(seed: int, moves: str, width: int, height: int) -> Tuple[int, Optional[FuzzFailure]]:
+    """Play moves on the level for seed, returning steps run and the first failure."""
+    state = create_level_state(1, width, height, seed)
+    message = check_invariants(state, width, height)
+    if message:
+        return 0, FuzzFailure(seed, "", 0, message)
+
+    for step, code in enumerate(moves, 1):
+        if state.game_over:
+            return step - 1, None
+        try:
+            try_player_move(state, MOVE_CODES[code], width, height)
+            settle_timers(state)
+        except Exception as e:
+            return step, FuzzFailure(seed, moves[:step], step, f"{type(e).__name__}: {e}")
+        message = check_invariants(state, width, height)
+        if message:
+            return step, FuzzFailure(seed, moves[:step], step, message)
+    return len(moves), None
+
+def random_moves(seed: int, steps: int) -> str:
+    """Random move sequence from its own stream, independent of level generation."""
+    return "".join(GameRng(seed).split("moves").choices(MOVE_ALPHABET, k=steps))
+
+def shrink_moves(moves: str, still_fails: Callable[[str], bool]) -> str:
+    """Delta-debug a failing move sequence down to a locally minimal one."""
+    chunk = max(1, len(moves) // 2)
+    while moves:
+        start, shrunk = 0, False
+        while start < len(moves):
+            candidate = moves[:start] + moves[start + chunk:]
+            if still_fails(candidate):
+                moves, shrunk = candidate, True
+            else:
+                start += chunk
+        if not shrunk:
+            if chunk == 1:
+                break
+            chunk = max(1, chunk // 2)
+    return moves
+
+def shrink_failure(failure: FuzzFailure, width: int, height: int) -> FuzzFailure:
+    """Reduce a failure to a minimal replay that still breaks an invariant."""
+    def still_fails(moves: str) -> bool:
+        return run_case(failure.seed, moves, width, height)[1] is not None
+
+    moves = shrink_moves(failure.moves, still_fails)
+    return run_case(failure.seed, moves, width, height)[1] or failure
+
+def fuzz_batch(first_seed: int, cases: int, steps: int,
+               width: int = GRID_WIDTH, height: int = GRID_HEIGHT) -> Tuple[int, List[FuzzFailure]]:
+    """Run consecutive seeds, returning total steps and shrunk failures."""
+    set_audio_backend(NullAudioBackend())
+    total_steps, failures = 0, []
+    for seed in range(first_seed, first_seed + cases):
+        ran, failure = run_case(seed, random_moves(seed, steps), width, height)
+        total_steps += ran
+        if failure:
+            failures.append(shrink_failure(failure, width, height))
+    return total_steps, failures
+
+def batch_ranges(first_seed: int, cases: int, batch_size: int) -> Iterator[Tuple[int, int]]:
+    """Split a seed range into (start, count) batches."""
+    for start in range(first_seed, first_seed + cases, batch_size):
+        yield start, min(batch_size, first_seed + cases - start)
+
+def run_fuzz(cases: int, steps: int, first_seed: int = 0, workers: Optional[int] = None,
+             width: int = GRID_WIDTH, height: int = GRID_HEIGHT) -> Tuple[int, List[FuzzFailure]]:
+    """Fuzz many seeds across a process pool."""
+    workers = workers or os.cpu_count() or 1
+    batches = list(batch_ranges(first_seed, cases, CASES_PER_BATCH))
+    if workers == 1:
+        results = [fuzz_batch(start, count, steps, width, height) for start, count in batches]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(fuzz_batch, start, count, steps, width, height) for start, count in batches]
+            results = [future.result() for future in futures]
+    total_steps = sum(ran for ran, _ in results)
+    failures = [failure for _, batch_failures in results for failure in batch_failures]
+    return total_steps, failures
+
+def replay(replay_string: str, width: int = GRID_WIDTH, height: int = GRID_HEIGHT) -> Optional[FuzzFailure]:
+    """Re-run a 'seed:moves' replay string."""
+    set_audio_backend(NullAudioBackend())
+    seed, _, moves = replay_string.partition(":")
+    return run_case(int(seed), moves, width, height)[1]
+
+def main() -> None:
+    """Command line entry point for CI fuzzing runs."""
+    parser = argparse.ArgumentParser(description="Fuzz Mined-Out game rules with random move sequences.")
+    parser.add_argument("--cases", type=int, default=10000, help="Number of seeds to play")
+    parser.add_argument("--steps", type=int, default=500, help="Random moves per seed")
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--replay", help="Re-run a single 'seed:moves' failure")
+    args = parser.parse_args()
+
+    if args.replay:
+        failure = replay(args.replay)
+        print(failure.message if failure else "no invariant broken")
+        sys.exit(1 if failure else 0)
+
+    started = time.perf_counter()
+    total_steps, failures = run_fuzz(args.cases, args.steps, args.seed, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"{total_steps} steps in {elapsed:.1f}s ({total_steps / elapsed:,.0f} steps/s)")
+    for failure in failures:
+        print(f"FAIL step {failure.step}: {failure.message}  replay: {failure.replay()}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
+from typing import Callable
+
 from mined_out.common import Direction, CellType, Position, Explosion, MAX_LEVEL, move_position
 from mined_out.game_state import GameState
 from mined_out.audio_operations import play_item_collect, play_explosion
 from mined_out.grid_operations import count_adjacent_mines, can_move_to_cell
 from mined_out.level_generation import create_level_state
 
+# Builds the state for (level, width, height, seed); tournaments load levels from a pack instead
+LevelLoader = Callable[[int, int, int, int], GameState]
+
 def can_exit_level(items_collected: int, total_items: int) -> bool:
     """Check if player can exit current level."""
     return items_collected >= total_items
@@ -23,19 +28,26 @@ def handle_cell_interaction(state: GameState, cell_type: CellType) -> None:
         state.items_collected += 1
         play_item_collect()
 
+def set_cell(state: GameState, pos: Position, cell_type: CellType) -> None:
+    """Write grid cell, logging the change if the state has a change log attached."""
+    old_cell = state.grid[pos.y][pos.x]
+    state.grid[pos.y][pos.x] = cell_type
+    if state.cell_changes is not None:
+        state.cell_changes.append((pos.x, pos.y, old_cell, cell_type))
+
 def move_player_to_position(state: GameState, new_pos: Position, width: int, height: int) -> None:
     """Move player to new position and update state."""
     old_pos = state.player_pos
     if state.grid[old_pos.y][old_pos.x] == CellType.PLAYER:
-        state.grid[old_pos.y][old_pos.x] = CellType.VISITED
+        set_cell(state, old_pos, CellType.EXIT if old_pos == state.exit_pos else CellType.VISITED)
 
     state.player_pos = new_pos
-    state.grid[new_pos.y][new_pos.x] = CellType.PLAYER
+    set_cell(state, new_pos, CellType.PLAYER)
     state.mine_count_nearby = count_adjacent_mines(state.grid, state.player_pos, width, height)
 
 def start_mine_reveal(state: GameState, mine_pos: Position) -> None:
     """Start mine reveal sequence."""
-    state.grid[mine_pos.y][mine_pos.x] = CellType.REVEALED_MINE
+    set_cell(state, mine_pos, CellType.REVEALED_MINE)
     state.revealing_mine_pos = mine_pos
     state.mine_reveal_timer = 5
 
@@ -45,7 +57,8 @@ def explode_mine(state: GameState, mine_pos: Position) -> None:
     state.game_over = True
     play_explosion()
 
-def try_player_move(state: GameState, direction: Direction, width: int, height: int) -> None:
+def try_player_move(state: GameState, direction: Direction, width: int, height: int,
+                    load_level: LevelLoader = create_level_state) -> None:
     """Attempt to move player in direction."""
     new_pos = move_position(state.player_pos, direction)
 
@@ -60,12 +73,13 @@ def try_player_move(state: GameState, direction: Direction, width: int, height:
         move_player_to_position(state, new_pos, width, height)
         handle_cell_interaction(state, cell)
 
-        if should_advance_level(state):
+        if cell == CellType.EXIT and can_exit_level(state.items_collected, state.total_items):
             if should_win_game(state.level):
                 state.won = True
                 state.game_over = True
             else:
-                new_state = create_level_state(state.level + 1, width, height)
+                new_state = load_level(state.level + 1, width, height, state.seed)
+                new_state.cell_changes = state.cell_changes
                 state.__dict__.update(new_state.__dict__)
                 state.mine_count_nearby = count_adjacent_mines(state.grid, state.player_pos, width, height)
 
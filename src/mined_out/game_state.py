@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from mined_out.common import Position, CellType, Explosion
 
+# (x, y, old cell, new cell)
+CellChange = Tuple[int, int, CellType, CellType]
+
 @dataclass
 class GameState:
     player_pos: Position
@@ -17,3 +20,5 @@ class GameState:
     explosion: Optional[Explosion] = None
     revealing_mine_pos: Optional[Position] = None
     mine_reveal_timer: int = 0
+    seed: int = 0
+    cell_changes: Optional[List[CellChange]] = None
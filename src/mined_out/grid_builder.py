@@ -1,8 +1,8 @@
-from typing import List
-import random
+from typing import List, Optional
 
 from mined_out.common import CellType, Position
-from mined_out.grid_operations import get_random_interior_position
+from mined_out.grid_operations import is_safe_player_position
+from mined_out.rng import GameRng
 
 def calculate_mine_count(level_num: int) -> int:
     """Calculate the number of mines based on level progression."""
@@ -18,29 +18,66 @@ def calculate_item_count(level_num: int) -> int:
     total_items = min(base_items + item_increase, 25)   # cap at 25 items
     return total_items
 
-def place_random_cells(grid: List[List[CellType]], cell_type: CellType, count: int, width: int, height: int) -> int:
-    """Place random cells of the given type in the grid."""
-    placed = 0
-    while placed < count:
-        x = random.randint(1, width - 2)
-        y = random.randint(1, height - 2)
-        if grid[y][x] == CellType.EMPTY:
-            grid[y][x] = cell_type
-            placed += 1
-    return placed
-
-def place_exit_in_grid(grid: List[List[CellType]], width: int, height: int) -> Position:
-    """Place exit in a random interior position without checking for emptiness."""
-    pos = get_random_interior_position(width, height)
-    grid[pos.y][pos.x] = CellType.EXIT
-    return pos
-
-
-def place_player_safely(grid: List[List[CellType]], width: int, height: int) -> Position:
-    """Place the player safely at an empty cell in the grid."""
-    while True:  # Keep trying until we find a safe position
-        x = random.randint(1, width-2)
-        y = random.randint(1, height-2)
-        if grid[y][x] == CellType.EMPTY:
-            grid[y][x] = CellType.PLAYER  # Assuming you have a PLAYER cell type
-            return Position(x, y)   # Return the position of the player
+class PlacementError(ValueError):
+    """Raised when the grid has too few free cells for a placement."""
+
+def collect_free_cells(grid: List[List[CellType]], width: int, height: int) -> List[int]:
+    """Collect flat indices (y * width + x) of empty interior cells."""
+    return [y * width + x
+            for y in range(1, height - 1)
+            for x, cell in enumerate(grid[y][1:width - 1], 1)
+            if cell == CellType.EMPTY]
+
+def take_random_cell(free_cells: List[int], rng: GameRng) -> int:
+    """Remove and return a random free cell in O(1) by swapping it with the last one."""
+    i = rng.randrange(len(free_cells))
+    cell = free_cells[i]
+    free_cells[i] = free_cells[-1]
+    free_cells.pop()
+    return cell
+
+def place_random_cells(grid: List[List[CellType]], cell_type: CellType, count: int, width: int, height: int,
+                       rng: GameRng, free_cells: Optional[List[int]] = None) -> int:
+    """Place random cells of the given type in the grid, drawing from the free-cell pool."""
+    if free_cells is None:
+        free_cells = collect_free_cells(grid, width, height)
+    if count > len(free_cells):
+        raise PlacementError(f"cannot place {count} {cell_type.value} cells, only {len(free_cells)} free")
+    for _ in range(count):
+        y, x = divmod(take_random_cell(free_cells, rng), width)
+        grid[y][x] = cell_type
+    return count
+
+def place_exit_in_grid(grid: List[List[CellType]], width: int, height: int, rng: GameRng,
+                       free_cells: Optional[List[int]] = None) -> Position:
+    """Place exit in a random free interior cell."""
+    if free_cells is None:
+        free_cells = collect_free_cells(grid, width, height)
+    if not free_cells:
+        raise PlacementError("no free cell for the exit")
+    y, x = divmod(take_random_cell(free_cells, rng), width)
+    grid[y][x] = CellType.EXIT
+    return Position(x, y)
+
+def place_player_safely(grid: List[List[CellType]], width: int, height: int, rng: GameRng,
+                        free_cells: Optional[List[int]] = None, require_safe: bool = False) -> Position:
+    """Place the player at a random free cell, optionally one with no adjacent mines.
+
+    Candidates are visited in random order by a partial Fisher-Yates shuffle,
+    so each free cell is tried at most once.
+    """
+    if free_cells is None:
+        free_cells = collect_free_cells(grid, width, height)
+    end = len(free_cells)
+    while end:
+        i = rng.randrange(end)
+        end -= 1
+        free_cells[i], free_cells[end] = free_cells[end], free_cells[i]
+        y, x = divmod(free_cells[end], width)
+        pos = Position(x, y)
+        if not require_safe or is_safe_player_position(grid, pos, width, height):
+            free_cells[end] = free_cells[-1]
+            free_cells.pop()
+            grid[y][x] = CellType.PLAYER
+            return pos
+    raise PlacementError("no safe free cell for the player" if require_safe else "no free cell for the player")
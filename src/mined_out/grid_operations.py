@@ -1,11 +1,11 @@
 from typing import List
-import random
 
 from mined_out.common import CellType, Position
+from mined_out.rng import GameRng
 
 def create_empty_grid(width: int, height: int) -> List[List[CellType]]:
     """Create empty grid filled with EMPTY cells."""
-    return [[CellType.EMPTY for _ in range(width)] for _ in range(height)]
+    return [[CellType.EMPTY] * width for _ in range(height)]
 
 def is_valid_position(pos: Position, width: int, height: int) -> bool:
     """Check if position is within grid bounds."""
@@ -30,12 +30,11 @@ def count_cells_of_type(grid: List[List[CellType]], cell_type: CellType) -> int:
 def count_adjacent_mines(grid: List[List[CellType]], pos: Position, width: int, height: int) -> int:
     """Count mines adjacent to position (including diagonals)."""
     count = 0
-    for dy in [-1, 0, 1]:
-        for dx in [-1, 0, 1]:
-            if dx == 0 and dy == 0:
-                continue
-            adj_pos = Position(pos.x + dx, pos.y + dy)
-            if is_valid_position(adj_pos, width, height) and grid[adj_pos.y][adj_pos.x] == CellType.MINE:
+    x0, x1 = max(pos.x - 1, 0), min(pos.x + 2, width)
+    for y in range(max(pos.y - 1, 0), min(pos.y + 2, height)):
+        row = grid[y]
+        for x in range(x0, x1):
+            if row[x] == CellType.MINE and (x != pos.x or y != pos.y):
                 count += 1
     return count
 
@@ -51,10 +50,10 @@ def is_safe_player_position(grid: List[List[CellType]], pos: Position, width: in
         return False
     return not has_adjacent_mines(grid, pos, width, height)
 
-def get_random_interior_position(width: int, height: int) -> Position:
+def get_random_interior_position(width: int, height: int, rng: GameRng) -> Position:
     """Get random position inside grid borders."""
-    x = random.randint(1, width - 2)
-    y = random.randint(1, height - 2)
+    x = rng.randint(1, width - 2)
+    y = rng.randint(1, height - 2)
     return Position(x, y)
 
 def can_move_to_cell(grid: List[List[CellType]], pos: Position, width: int, height: int) -> bool:
@@ -1,19 +1,21 @@
+from itertools import compress
 from typing import List
-import random
 
 from mined_out.common import CellType, Position
+from mined_out.rng import GameRng
 
 def add_borders_to_grid(grid: List[List[CellType]], width: int, height: int) -> None:
     """Add borders to grid."""
-    for y in range(height):
-        for x in range(width):
-            if (x == 0 or x == width - 1 or y == 0 or y == height - 1) and grid[y][x] != CellType.WALL:
-                grid[y][x] = CellType.WALL
+    grid[0][:] = [CellType.WALL] * width
+    grid[height - 1][:] = [CellType.WALL] * width
+    for row in grid:
+        row[0] = row[width - 1] = CellType.WALL
 
-def add_walls_to_grid(grid: List[List[CellType]], level_num: int, width: int, height: int) -> None:
+def add_walls_to_grid(grid: List[List[CellType]], level_num: int, width: int, height: int, rng: GameRng) -> None:
     """Add walls to the grid based on the level number."""
     wall_chance = 0.1 + 0.2 * (level_num // 5)   # Increase chance with each fifth level
-    for y in range(height):
-        for x in range(width):
-            if random.random() < wall_chance and grid[y][x] == CellType.EMPTY:
-                grid[y][x] = CellType.WALL
+    hits = rng.bernoulli(width * height, wall_chance)
+    for index in compress(range(width * height), hits):
+        y, x = divmod(index, width)
+        if grid[y][x] == CellType.EMPTY:
+            grid[y][x] = CellType.WALL
@@ -0,0 +1,85 @@
+from collections import deque
+from dataclasses import dataclass, replace
+from operator import attrgetter
+from typing import Deque, List, Optional, Tuple
+
+from mined_out.common import CellType, Direction
+from mined_out.game_state import GameState, CellChange
+from mined_out.game_logic import LevelLoader, try_player_move
+from mined_out.level_generation import create_level_state
+
+HISTORY_LENGTH = 256
+
+# GameState fields restored on rewind; the grid is restored from deltas instead
+SCALAR_FIELDS = (
+    "player_pos", "items_collected", "total_items", "level", "exit_pos",
+    "mine_count_nearby", "game_over", "won", "explosion",
+    "revealing_mine_pos", "mine_reveal_timer",
+)
+_get_scalars = attrgetter(*SCALAR_FIELDS)
+_EXPLOSION_INDEX = SCALAR_FIELDS.index("explosion")
+
+@dataclass
+class HistoryStep:
+    scalars: Tuple
+    changes: List[CellChange]
+    previous_grid: Optional[List[List[CellType]]] = None
+
+class StateHistory:
+    """Bounded log of per-move cell deltas that can be rewound step by step.
+
+    Moves within a level store only the cells they changed. A move that
+    advances the level keeps a reference to the previous grid, which the
+    new level replaces rather than mutates, so no grid is ever copied.
+    """
+
+    def __init__(self, max_steps: int = HISTORY_LENGTH):
+        self.steps: Deque[HistoryStep] = deque(maxlen=max_steps)
+
+def snapshot_scalars(state: GameState) -> Tuple:
+    """Capture the non-grid part of the state."""
+    scalars = _get_scalars(state)
+    explosion = state.explosion
+    if explosion is not None:
+        scalars = scalars[:_EXPLOSION_INDEX] + (replace(explosion),) + scalars[_EXPLOSION_INDEX + 1:]
+    return scalars
+
+def restore_scalars(state: GameState, scalars: Tuple) -> None:
+    """Write captured non-grid fields back into the state."""
+    for name, value in zip(SCALAR_FIELDS, scalars):
+        setattr(state, name, value)
+
+def record_move(history: StateHistory, state: GameState, direction: Direction, width: int, height: int,
+                load_level: LevelLoader = create_level_state) -> bool:
+    """Attempt a player move, logging it if it changed the state."""
+    scalars = snapshot_scalars(state)
+    grid = state.grid
+    state.cell_changes = changes = []
+    try:
+        try_player_move(state, direction, width, height, load_level)
+    finally:
+        state.cell_changes = None
+
+    if not changes and state.grid is grid:
+        return False
+    previous_grid = grid if state.grid is not grid else None
+    history.steps.append(HistoryStep(scalars, changes, previous_grid))
+    return True
+
+def rewind(history: StateHistory, state: GameState, steps: int = 1) -> int:
+    """Undo up to the given number of moves and return how many were undone."""
+    undone = 0
+    while undone < steps and history.steps:
+        step = history.steps.pop()
+        if step.previous_grid is not None:
+            state.grid = step.previous_grid
+        grid = state.grid
+        for x, y, old_cell, _ in reversed(step.changes):
+            grid[y][x] = old_cell
+        restore_scalars(state, step.scalars)
+        undone += 1
+    return undone
+
+def clear_history(history: StateHistory) -> None:
+    """Forget all recorded moves."""
+    history.steps.clear()
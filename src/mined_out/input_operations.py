@@ -1,20 +1,88 @@
 import pyxel
-from typing import Optional
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
 
 from mined_out.common import Direction
+from mined_out.instrumentation import get_latency_tracker, increment_counter
+
+INPUT_QUEUE_CAPACITY = 16
+
+DIRECTION_KEYS = (
+    (Direction.UP, (pyxel.KEY_UP, pyxel.KEY_W)),
+    (Direction.DOWN, (pyxel.KEY_DOWN, pyxel.KEY_S)),
+    (Direction.LEFT, (pyxel.KEY_LEFT, pyxel.KEY_A)),
+    (Direction.RIGHT, (pyxel.KEY_RIGHT, pyxel.KEY_D)),
+)
+
+@dataclass(frozen=True)
+class InputEvent:
+    direction: Direction
+    timestamp: float
+
+class InputQueue:
+    """Bounded FIFO of direction presses waiting for a logic tick."""
+
+    def __init__(self, capacity: int = INPUT_QUEUE_CAPACITY):
+        self.capacity = capacity
+        self.events: Deque[InputEvent] = deque()
+        self.dropped = 0
+
+def any_pressed(keys: Tuple[int, ...]) -> bool:
+    """Check if any of the keys was pressed this frame, without a generator per call."""
+    for key in keys:
+        if pyxel.btnp(key):
+            return True
+    return False
 
 def get_direction_from_input() -> Optional[Direction]:
     """Get direction from current input state."""
-    if pyxel.btnp(pyxel.KEY_UP) or pyxel.btnp(pyxel.KEY_W):
-        return Direction.UP
-    elif pyxel.btnp(pyxel.KEY_DOWN) or pyxel.btnp(pyxel.KEY_S):
-        return Direction.DOWN
-    elif pyxel.btnp(pyxel.KEY_LEFT) or pyxel.btnp(pyxel.KEY_A):
-        return Direction.LEFT
-    elif pyxel.btnp(pyxel.KEY_RIGHT) or pyxel.btnp(pyxel.KEY_D):
-        return Direction.RIGHT
+    for direction, keys in DIRECTION_KEYS:
+        if any_pressed(keys):
+            return direction
     return None
 
+def push_direction(queue: InputQueue, direction: Direction, timestamp: float) -> bool:
+    """Queue a direction press, returning False if the queue is full."""
+    if len(queue.events) >= queue.capacity:
+        queue.dropped += 1
+        increment_counter("input_dropped")
+        return False
+    queue.events.append(InputEvent(direction, timestamp))
+    return True
+
+def poll_direction_events(queue: InputQueue) -> int:
+    """Record every direction pressed this frame and return how many were queued."""
+    queued = 0
+    now = time.perf_counter()
+    for direction, keys in DIRECTION_KEYS:
+        if any_pressed(keys):
+            queued += push_direction(queue, direction, now)
+    return queued
+
+def pop_direction_event(queue: InputQueue) -> Optional[InputEvent]:
+    """Take the oldest queued press, if any."""
+    return queue.events.popleft() if queue.events else None
+
+def clear_input_queue(queue: InputQueue) -> None:
+    """Discard all pending presses."""
+    queue.events.clear()
+
+def record_input_latency(event: InputEvent) -> float:
+    """Record time from key press to the state change it caused."""
+    latency = time.perf_counter() - event.timestamp
+    get_latency_tracker("input_latency").record(latency)
+    return latency
+
 def is_restart_pressed() -> bool:
     """Check if restart key is pressed."""
     return pyxel.btnp(pyxel.KEY_R)
+
+def is_undo_pressed() -> bool:
+    """Check if undo key is pressed."""
+    return pyxel.btnp(pyxel.KEY_U) or pyxel.btnp(pyxel.KEY_BACKSPACE)
+
+def is_hint_toggle_pressed() -> bool:
+    """Check if mine hint overlay key is pressed."""
+    return pyxel.btnp(pyxel.KEY_H)
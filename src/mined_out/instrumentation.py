@@ -0,0 +1,78 @@
+from collections import deque
+from typing import Deque, Dict
+
+LATENCY_SAMPLE_CAPACITY = 1024
+
+class LatencyTracker:
+    """Rolling window of latency samples (seconds) plus lifetime totals."""
+
+    def __init__(self, capacity: int = LATENCY_SAMPLE_CAPACITY):
+        self.samples: Deque[float] = deque(maxlen=capacity)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean(self) -> float:
+        """Mean latency over all recorded samples."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Latency at percentile p (0-100) over the rolling window."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+        return ordered[index]
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.samples.clear()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+_latency_trackers: Dict[str, LatencyTracker] = {}
+_counters: Dict[str, int] = {}
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """Get the named latency tracker, creating it on first use."""
+    tracker = _latency_trackers.get(name)
+    if tracker is None:
+        tracker = _latency_trackers[name] = LatencyTracker()
+    return tracker
+
+def increment_counter(name: str, amount: int = 1) -> None:
+    """Increase the named counter."""
+    _counters[name] = _counters.get(name, 0) + amount
+
+def get_counter(name: str) -> int:
+    """Get current value of the named counter."""
+    return _counters.get(name, 0)
+
+def metrics_snapshot() -> Dict[str, Dict[str, float]]:
+    """Summarize all trackers and counters as plain numbers."""
+    snapshot: Dict[str, Dict[str, float]] = {
+        name: {
+            "count": tracker.count,
+            "mean": tracker.mean(),
+            "p50": tracker.percentile(50),
+            "p99": tracker.percentile(99),
+            "max": tracker.max,
+        }
+        for name, tracker in _latency_trackers.items()
+    }
+    snapshot["counters"] = dict(_counters)
+    return snapshot
+
+def reset_metrics() -> None:
+    """Clear all trackers and counters."""
+    _latency_trackers.clear()
+    _counters.clear()
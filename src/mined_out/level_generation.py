@@ -1,45 +1,56 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from mined_out.common import CellType
 from mined_out.grid_builder import place_random_cells
 from mined_out.game_state import GameState
-from mined_out.grid_operations import create_empty_grid, find_cell_position, count_cells_of_type
+from mined_out.grid_operations import create_empty_grid, find_cell_position, count_cells_of_type, count_adjacent_mines
 from mined_out.grid_builder import calculate_mine_count, calculate_item_count
 from mined_out.grid_utils import add_borders_to_grid, add_walls_to_grid
-from mined_out.grid_builder import place_player_safely, place_exit_in_grid
+from mined_out.grid_builder import place_player_safely, place_exit_in_grid, collect_free_cells, PlacementError
+from mined_out.rng import GameRng, level_rng, new_seed
 
-def generate_level_grid(level_num: int, width: int, height: int) -> List[List[CellType]]:
-    """Generate complete grid for level."""
+LEVEL_TEMPLATE_CACHE_SIZE = 1024
+
+def generate_level_grid(level_num: int, width: int, height: int, rng: GameRng) -> List[List[CellType]]:
+    """Generate complete grid for level from the given random stream."""
     grid = create_empty_grid(width, height)
 
     add_borders_to_grid(grid, width, height)
-    add_walls_to_grid(grid, level_num, width, height)
+    add_walls_to_grid(grid, level_num, width, height, rng)
+
+    free_cells = collect_free_cells(grid, width, height)
 
     mine_count = calculate_mine_count(level_num)
-    place_random_cells(grid, CellType.MINE, mine_count, width, height)
+    place_random_cells(grid, CellType.MINE, mine_count, width, height, rng, free_cells)
 
     item_count = calculate_item_count(level_num)
-    place_random_cells(grid, CellType.ITEM, item_count, width, height)
+    place_random_cells(grid, CellType.ITEM, item_count, width, height, rng, free_cells)
 
-    place_player_safely(grid, width, height)
-    place_exit_in_grid(grid, width, height)
+    place_exit_in_grid(grid, width, height, rng, free_cells)
+    try:
+        place_player_safely(grid, width, height, rng, free_cells, require_safe=True)
+    except PlacementError:
+        place_player_safely(grid, width, height, rng, free_cells)
 
     return grid
 
-from mined_out.common import Position
-from mined_out.grid_operations import get_random_interior_position
-
-def create_level_state(level_num: int, width: int, height: int) -> GameState:
-    """Create complete game state for level."""
-    grid = generate_level_grid(level_num, width, height)
+def create_level_state(level_num: int, width: int, height: int, seed: Optional[int] = None) -> GameState:
+    """Create complete game state for level; the same seed always gives the same level."""
+    if seed is None:
+        seed = new_seed()
+    grid = [list(row) for row in level_template(level_num, width, height, seed)]
+    return build_level_state(level_num, grid, width, height, seed)
 
-    # Set player position to the center of the lowest row
-    player_pos = Position(x=width // 2, y=height - 1)
-    while grid[player_pos.y][player_pos.x] != CellType.EMPTY:
-        player_pos = get_random_interior_position(width, height)
+@lru_cache(maxsize=LEVEL_TEMPLATE_CACHE_SIZE)
+def level_template(level_num: int, width: int, height: int, seed: int) -> Tuple[Tuple[CellType, ...], ...]:
+    """Immutable grid of a seeded level, generated once and shared by every game playing it."""
+    grid = generate_level_grid(level_num, width, height, level_rng(seed, level_num))
+    return tuple(tuple(row) for row in grid)
 
-    # Place exit using place_exit_in_grid function without checking for emptiness
-    exit_pos = place_exit_in_grid(grid, width, height)
+def build_level_state(level_num: int, grid: List[List[CellType]], width: int, height: int, seed: int) -> GameState:
+    """Wrap a generated grid in a fresh game state."""
+    player_pos = find_cell_position(grid, CellType.PLAYER, width, height)
 
     return GameState(
         player_pos=player_pos,
@@ -47,5 +58,7 @@ def create_level_state(level_num: int, width: int, height: int) -> GameState:
         items_collected=0,
         total_items=count_cells_of_type(grid, CellType.ITEM),
         level=level_num,
-        exit_pos=exit_pos
+        exit_pos=find_cell_position(grid, CellType.EXIT, width, height),
+        mine_count_nearby=count_adjacent_mines(grid, player_pos, width, height),
+        seed=seed
     )
@@ -0,0 +1,218 @@
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from mined_out.common import CELL_CODES, CellType
+from mined_out.frame_encoding import grid_codes
+from mined_out.game_logic import LevelLoader
+from mined_out.game_state import GameState
+from mined_out.level_generation import build_level_state, generate_level_grid
+from mined_out.rng import GameRng, level_rng, new_seed
+
+MAX_CANDIDATES = 256
+SEARCH_BUDGET = 0.08  # seconds of wall-clock time per search
+SEARCH_CACHE_SIZE = 256
+MAX_DANGER = 8
+LANE_BITS = 8  # one byte per cell in bitboards
+TARGETS_ENV = "MINED_OUT_TARGETS"
+
+UNSAFE_CELLS = (CellType.WALL, CellType.MINE, CellType.REVEALED_MINE)
+
+# (low, high), both inclusive
+Range = Tuple[int, int]
+
+@dataclass(frozen=True)
+class LevelMetrics:
+    """How hard a level plays, measured on safe (mine-free) cells."""
+    path_length: int      # fewest steps from the player to the exit
+    max_danger: int       # highest mine count the best route is forced past
+    items_off_route: int  # items not on any shortest route to the exit
+
+@dataclass(frozen=True)
+class LevelTargets:
+    """Accepted ranges for each metric; the defaults accept any solvable level."""
+    path_length: Range = (0, 1000)
+    max_danger: Range = (0, MAX_DANGER)
+    items_off_route: Range = (0, 1000)
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Outcome of a level search: which candidate to build and how it measured."""
+    candidate: int
+    metrics: Optional[LevelMetrics]
+    matched: bool
+    searched: int
+
+def lane_table(*cell_types: CellType) -> bytes:
+    """Translation table mapping the codes of the given cell types to 1 and the rest to 0."""
+    codes = {CELL_CODES[cell_type] for cell_type in cell_types}
+    return bytes(int(code in codes) for code in range(256))
+
+SAFE_TABLE = lane_table(*(cell_type for cell_type in CellType if cell_type not in UNSAFE_CELLS))
+MINE_TABLE = lane_table(CellType.MINE)
+ITEM_TABLE = lane_table(CellType.ITEM)
+PLAYER_TABLE = lane_table(CellType.PLAYER)
+EXIT_TABLE = lane_table(CellType.EXIT)
+AT_MOST_TABLES = [bytes(int(count <= limit) for count in range(256)) for limit in range(MAX_DANGER + 1)]
+
+def lane_mask(lanes: bytes, table: bytes) -> int:
+    """Bitboard with bit 8 * i set where table maps lanes[i] to 1."""
+    return int.from_bytes(lanes.translate(table), "little")
+
+def neighbour_sum(mask: int, width: int) -> int:
+    """Per-lane count of set lanes among the eight neighbours (at most 8, so lanes never carry)."""
+    total = 0
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            shift = LANE_BITS * (dy * width + dx)
+            if shift > 0:
+                total += mask << shift
+            elif shift < 0:
+                total += mask >> -shift
+    return total
+
+def bfs_layers(start: int, passable: int, width: int) -> List[int]:
+    """Breadth-first layers from start as bitboards; layer k holds cells k steps away.
+
+    Each step expands the whole frontier at once with four shifts. Borders
+    are walls, so a sideways shift never wraps into the next row through a
+    passable cell.
+    """
+    row = LANE_BITS * width
+    layers = [start]
+    seen = frontier = start
+    while True:
+        grown = (frontier << LANE_BITS) | (frontier >> LANE_BITS) | (frontier << row) | (frontier >> row)
+        frontier = grown & passable & ~seen
+        if not frontier:
+            return layers
+        seen |= frontier
+        layers.append(frontier)
+
+def reaches(start: int, target: int, passable: int, width: int) -> bool:
+    """Check whether target can be reached from start through passable cells."""
+    row = LANE_BITS * width
+    seen = frontier = start
+    while frontier and not seen & target:
+        grown = (frontier << LANE_BITS) | (frontier >> LANE_BITS) | (frontier << row) | (frontier >> row)
+        frontier = grown & passable & ~seen
+        seen |= frontier
+    return bool(seen & target)
+
+def measure_level(grid: List[List[CellType]], width: int) -> Optional[LevelMetrics]:
+    """Measure a level, or None if the exit or an item cannot be reached safely.
+
+    The grid is packed into byte lanes once; every map after that (safe
+    cells, danger counts, BFS frontiers) is a big-integer bitboard, so each
+    step works on the whole grid at once.
+    """
+    lanes = grid_codes(grid)
+    safe = lane_mask(lanes, SAFE_TABLE)
+    player = lane_mask(lanes, PLAYER_TABLE)
+    exit_bit = lane_mask(lanes, EXIT_TABLE)
+    items = lane_mask(lanes, ITEM_TABLE)
+    if not player or not exit_bit:
+        return None
+
+    from_player = bfs_layers(player, safe, width)
+    reachable = 0
+    path_length = -1
+    for steps, layer in enumerate(from_player):
+        reachable |= layer
+        if path_length < 0 and layer & exit_bit:
+            path_length = steps
+    if path_length < 0 or items & ~reachable:
+        return None
+
+    from_exit = bfs_layers(exit_bit, safe, width)
+    route = 0
+    for steps in range(path_length + 1):
+        route |= from_player[steps] & from_exit[path_length - steps]
+
+    danger = neighbour_sum(lane_mask(lanes, MINE_TABLE), width)
+    danger_lanes = danger.to_bytes(len(lanes) + width + 1, "little")[:len(lanes)]
+    max_danger = MAX_DANGER
+    for limit in range(MAX_DANGER):
+        if reaches(player, exit_bit, (lane_mask(danger_lanes, AT_MOST_TABLES[limit]) & safe) | player, width):
+            max_danger = limit
+            break
+    return LevelMetrics(path_length, max_danger, (items & ~route).bit_count())
+
+def target_miss(metrics: LevelMetrics, targets: LevelTargets) -> int:
+    """How far metrics fall outside the target ranges; 0 is a match."""
+    miss = 0
+    for value, (low, high) in ((metrics.path_length, targets.path_length),
+                               (metrics.max_danger, targets.max_danger),
+                               (metrics.items_off_route, targets.items_off_route)):
+        miss += max(low - value, 0, value - high)
+    return miss
+
+def candidate_rng(seed: int, level_num: int, candidate: int) -> GameRng:
+    """Stream for one search candidate; candidate 0 is the level create_level_state builds."""
+    rng = level_rng(seed, level_num)
+    return rng if candidate == 0 else rng.split("candidate", candidate)
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def search_level(level_num: int, seed: int, targets: LevelTargets, width: int, height: int,
+                 max_candidates: int = MAX_CANDIDATES, budget: Optional[float] = SEARCH_BUDGET) -> SearchResult:
+    """Find the first candidate layout whose metrics hit the targets.
+
+    Falls back to the closest solvable candidate, or candidate 0 if none is
+    solvable. All 256 candidates of a 20x15 level take 75-120 ms depending
+    on the machine, so the search stops after budget seconds (None for no
+    limit); a search that runs out of time may settle on another candidate
+    on a slower machine. Only the candidate number is cached; the grid is
+    rebuilt from its stream so callers never share a mutable grid.
+    """
+    deadline = None if budget is None else time.perf_counter() + budget
+    best: Optional[Tuple[int, int, LevelMetrics]] = None
+    searched = 0
+    for candidate in range(max_candidates):
+        if searched and deadline is not None and time.perf_counter() > deadline:
+            break
+        searched += 1
+        grid = generate_level_grid(level_num, width, height, candidate_rng(seed, level_num, candidate))
+        metrics = measure_level(grid, width)
+        if metrics is None:
+            continue
+        miss = target_miss(metrics, targets)
+        if miss == 0:
+            return SearchResult(candidate, metrics, True, searched)
+        if best is None or miss < best[0]:
+            best = (miss, candidate, metrics)
+    if best is None:
+        return SearchResult(0, None, False, searched)
+    return SearchResult(best[1], best[2], False, searched)
+
+def create_targeted_level_state(level_num: int, width: int, height: int, targets: LevelTargets,
+                                seed: Optional[int] = None) -> GameState:
+    """Create a level whose difficulty metrics match the targets as closely as the search allows."""
+    if seed is None:
+        seed = new_seed()
+    result = search_level(level_num, seed, targets, width, height)
+    grid = generate_level_grid(level_num, width, height, candidate_rng(seed, level_num, result.candidate))
+    return build_level_state(level_num, grid, width, height, seed)
+
+def targeted_level_loader(targets: LevelTargets) -> LevelLoader:
+    """LevelLoader for try_player_move that searches every level of a game, not just the first."""
+    def load_level(level_num: int, width: int, height: int, seed: int) -> GameState:
+        return create_targeted_level_state(level_num, width, height, targets, seed)
+    return load_level
+
+def parse_targets(text: str) -> LevelTargets:
+    """Parse comma-separated 'metric=low-high' ranges, e.g. 'path_length=20-40,max_danger=1-1'."""
+    ranges = {}
+    for part in text.split(","):
+        name, _, bounds = part.strip().partition("=")
+        low, _, high = bounds.partition("-")
+        if name not in LevelTargets.__dataclass_fields__ or not low.isdigit() or not high.isdigit():
+            raise ValueError(f"bad level target {part.strip()!r}, expected 'metric=low-high'")
+        ranges[name] = (int(low), int(high))
+    return LevelTargets(**ranges)
+
+def targets_from_env() -> Optional[LevelTargets]:
+    """Read difficulty targets for every level of a game from the environment."""
+    value = os.environ.get(TARGETS_ENV)
+    return parse_targets(value) if value else None
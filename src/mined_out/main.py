@@ -1,20 +1,71 @@
+import atexit
+import os
+import time
 import pyxel
+from typing import Optional
 
 from mined_out.constants import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE
-from mined_out.audio_operations import setup_sounds
+from mined_out.audio_operations import flush_sounds, get_mixer, setup_sounds
+from mined_out.allocation_tracking import AllocationTracker, alloc_debug_from_env, start_tracing, track_frame
 from mined_out.level_generation import create_level_state
+from mined_out.level_search import targeted_level_loader, targets_from_env
 from mined_out.grid_operations import count_adjacent_mines
-from mined_out.rendering_operations import draw_grid, draw_mine_indicator, draw_explosion, draw_game_over_screen, draw_ui
-from mined_out.game_logic import try_player_move, update_game_timers, try_player_move
-from mined_out.input_operations import is_restart_pressed, get_direction_from_input
+from mined_out.rendering_operations import (
+    draw_grid, draw_mine_indicator, draw_mine_probabilities, draw_explosion, draw_explosion_sparks,
+    draw_game_over_screen, draw_ui, HudLayer, refresh_hud, draw_hud_layer
+)
+from mined_out.frame_pacing import PacingController, current_quality, hud_due, record_draw_time
+from mined_out.game_logic import update_game_timers
+from mined_out.history import StateHistory, record_move, rewind, clear_history
+from mined_out.input_operations import (
+    InputQueue, is_restart_pressed, is_undo_pressed, is_hint_toggle_pressed, poll_direction_events, pop_direction_event,
+    clear_input_queue, record_input_latency
+)
+from mined_out.spectator import SPECTATE_ENV, start_spectator_server
+from mined_out.stats_store import STATS_ENV, StatsStore, result_from_state
+from mined_out.mine_probability import MineHints
+from mined_out.rng import daily_seed, new_seed
+from mined_out.save_state import SaveFormatError, load_state_file, save_state_file
+from mined_out.particle_system import ParticlePool, spawn_explosion, update_particles, clear_particles
+
+SEED_ENV = "MINED_OUT_SEED"
+SAVE_ENV = "MINED_OUT_SAVE"
+
+def seed_from_env() -> Optional[int]:
+    """Read a fixed game seed, or 'daily' for today's challenge, from the environment."""
+    value = os.environ.get(SEED_ENV)
+    if not value:
+        return None
+    return daily_seed() if value == "daily" else int(value)
 
 class MinedOut:
     """Main game class - minimal state container for Pyxel integration."""
 
-    def __init__(self):
+    def __init__(self, spectate: Optional[str] = None, stats_path: Optional[str] = None,
+                 seed: Optional[int] = None, save_path: Optional[str] = None, alloc_debug: bool = False):
+        self.fixed_seed = seed if seed is not None else seed_from_env()
+        self.save_path = save_path or os.environ.get(SAVE_ENV)
+        targets = targets_from_env()
+        self.load_level = targeted_level_loader(targets) if targets else create_level_state
+        spectate = spectate or os.environ.get(SPECTATE_ENV)
+        self.spectator = start_spectator_server(spectate) if spectate else None
+        stats_path = stats_path or os.environ.get(STATS_ENV)
+        self.stats = StatsStore(stats_path) if stats_path else None
+        self.allocations = AllocationTracker() if alloc_debug or alloc_debug_from_env() else None
         self._initialize_display()
-        self._initialize_game()
+        self.particles = ParticlePool()
+        self.input_queue = InputQueue()
+        self.history = StateHistory()
+        self.hints = MineHints()
+        self.show_hints = False
+        self.pacing = PacingController()
+        self.hud = HudLayer(self.width, self.height)
+        self.hud_current = False  # whether the HUD layer holds a recent draw
+        self._initialize_game(resume=True)
+        atexit.register(self._shutdown)  # pyxel runs exit handlers when the window closes
         setup_sounds()
+        if self.allocations:
+            start_tracing()
         pyxel.run(self.update, self.draw)
 
     def _initialize_display(self) -> None:
@@ -24,49 +75,169 @@ class MinedOut:
         pyxel.init(self.width, self.height, title="Mined-Out!")
         pyxel.mouse(False)
 
-    def _initialize_game(self) -> None:
-        """Create initial game state."""
-        self.state = create_level_state(1, GRID_WIDTH, GRID_HEIGHT)
+    def _initialize_game(self, resume: bool = False) -> None:
+        """Create initial game state, or resume an unfinished autosaved game."""
+        self.run_moves = 0
+        self.run_started = time.perf_counter()
+        self.run_ended: Optional[float] = None
+        if resume and self._load_autosave():
+            return
+        seed = self.fixed_seed if self.fixed_seed is not None else new_seed()
+        self.state = self.load_level(1, GRID_WIDTH, GRID_HEIGHT, seed)
         self.state.mine_count_nearby = count_adjacent_mines(
             self.state.grid, self.state.player_pos, GRID_WIDTH, GRID_HEIGHT
         )
 
+    def _load_autosave(self) -> bool:
+        """Restore the autosaved game if there is one still in progress."""
+        if not self.save_path or not os.path.exists(self.save_path):
+            return False
+        try:
+            state = load_state_file(self.save_path)
+        except (OSError, SaveFormatError):
+            return False
+        if state.game_over:
+            return False
+        self.state = state
+        return True
+
+    def _spawn_explosion_particles(self) -> None:
+        """Emit sparks for an explosion that started this frame."""
+        explosion = self.state.explosion
+        if explosion and explosion.frame == 0:
+            spawn_explosion(self.particles, explosion.pos.x * CELL_SIZE + 4, explosion.pos.y * CELL_SIZE + 4)
+
+    def _record_run(self) -> None:
+        """Log the run to the stats store if it ended.
+
+        Called only when the run is left behind (restart or quit) rather
+        than when it ends, since undo can take back the final move; each
+        run is therefore logged once, as the player last left it.
+        """
+        if self.stats and self.run_ended is not None:
+            duration = self.run_ended - self.run_started
+            self.stats.record(result_from_state(self.state, self.state.seed, "human", self.run_moves, duration))
+
+    def _shutdown(self) -> None:
+        """Log the last run and flush the stats store on exit."""
+        if self.stats:
+            self._record_run()
+            self.stats.close()
+            self.stats = None
+
+    def _undo_move(self) -> bool:
+        """Rewind the last move, including a fatal one."""
+        if not rewind(self.history, self.state):
+            return False
+        clear_particles(self.particles)
+        clear_input_queue(self.input_queue)
+        self.run_moves -= 1
+        self.run_ended = None
+        if self.save_path:
+            save_state_file(self.save_path, self.state)
+        return True
+
     def _restart_game(self) -> None:
         """Restart game from level 1."""
+        self._record_run()
+        clear_particles(self.particles)
+        clear_input_queue(self.input_queue)
+        clear_history(self.history)
         self._initialize_game()
 
     def update(self) -> None:
-        """Main game update loop."""
+        """Main game update loop, measuring allocations in debug mode."""
+        if self.allocations:
+            with track_frame(self.allocations, "update"):
+                self._update()
+        else:
+            self._update()
+
+    def _update(self) -> None:
+        self._update_game()
+        flush_sounds(get_mixer())
+        if self.spectator:
+            self.spectator.publish_state(self.state, GRID_WIDTH, GRID_HEIGHT)
+
+    def _update_game(self) -> None:
+        """Advance timers, effects and player input by one tick."""
         update_game_timers(self.state)
+        self._spawn_explosion_particles()
+        update_particles(self.particles)
+
+        if is_hint_toggle_pressed():
+            self.show_hints = not self.show_hints
+
+        if is_undo_pressed() and self._undo_move():
+            return
 
         if self.state.game_over:
+            if self.run_ended is None:
+                self.run_ended = time.perf_counter()
+            clear_input_queue(self.input_queue)
             if is_restart_pressed():
                 self._restart_game()
             return
 
+        poll_direction_events(self.input_queue)
         if self.state.mine_reveal_timer > 0:
             return
 
-        direction = get_direction_from_input()
-        if direction:
-            try_player_move(self.state, direction, GRID_WIDTH, GRID_HEIGHT)
+        event = pop_direction_event(self.input_queue)
+        if event:
+            moved = record_move(self.history, self.state, event.direction, GRID_WIDTH, GRID_HEIGHT, self.load_level)
+            if moved:
+                self.run_moves += 1
+                record_input_latency(event)
+                if self.save_path:
+                    save_state_file(self.save_path, self.state)
 
     def draw(self) -> None:
-        """Render the current game state."""
+        """Render the current game state, measuring allocations in debug mode.
+
+        Draw time feeds the pacing controller, which scales effect quality
+        for the following frames.
+        """
+        started = time.perf_counter()
+        if self.allocations:
+            with track_frame(self.allocations, "draw"):
+                self._draw()
+        else:
+            self._draw()
+        record_draw_time(self.pacing, time.perf_counter() - started)
+
+    def _draw_ui(self) -> None:
+        """Draw the HUD directly, or from its layer when quality calls for fewer refreshes."""
+        state = self.state
+        if current_quality(self.pacing).hud_interval == 1:
+            draw_ui(state.level, state.items_collected, state.total_items, state.mine_count_nearby, self.height)
+            self.hud_current = False
+            return
+        if hud_due(self.pacing) or not self.hud_current:
+            refresh_hud(self.hud, state.level, state.items_collected, state.total_items, state.mine_count_nearby)
+            self.hud_current = True
+        draw_hud_layer(self.hud)
+
+    def _draw(self) -> None:
+        quality = current_quality(self.pacing)
         pyxel.cls(4)
         draw_grid(self.state.grid, GRID_WIDTH, GRID_HEIGHT, CELL_SIZE)
 
+        if self.show_hints and quality.overlays and not self.state.game_over:
+            probabilities = self.hints.update(self.state, GRID_WIDTH, GRID_HEIGHT)
+            draw_mine_probabilities(probabilities, GRID_WIDTH, CELL_SIZE, self.hints.approximate)
+
         if not self.state.game_over:
             draw_mine_indicator(self.state.player_pos, self.state.mine_count_nearby, CELL_SIZE, self.width, self.height)
 
         if self.state.explosion:
             draw_explosion(self.state.explosion, CELL_SIZE)
+        draw_explosion_sparks(self.particles, quality.spark_stride)
 
         if self.state.game_over:
             draw_game_over_screen(self.state.won, self.width, self.height)
         else:
-            draw_ui(self.state.level, self.state.items_collected, self.state.total_items,
-                   self.state.mine_count_nearby, self.height)
+            self._draw_ui()
 
 
 if __name__ == "__main__":
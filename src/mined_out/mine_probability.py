@@ -0,0 +1,255 @@
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Optional, Set, Tuple
+
+from mined_out.common import CellType
+from mined_out.game_state import GameState
+from mined_out.grid_builder import calculate_mine_count
+
+# Components still bigger than this after propagation are estimated rather than enumerated
+MAX_COMPONENT_CELLS = 48
+COMPONENT_CACHE_SIZE = 4096
+
+UNKNOWN_CELLS = (CellType.EMPTY, CellType.MINE)
+TRAIL_CELLS = (CellType.VISITED, CellType.PLAYER)
+
+# (mines still needed, flat indices of unknown neighbours)
+Constraint = Tuple[int, Tuple[int, ...]]
+# (mines in component, number of solutions, per-cell mine counts over those solutions)
+ComponentSolution = Tuple[Tuple[int, int, Tuple[int, ...]], ...]
+
+def neighbour_indices(x: int, y: int, width: int, height: int) -> List[int]:
+    """Flat indices of the up to eight cells around a position."""
+    return [ny * width + nx
+            for ny in range(max(y - 1, 0), min(y + 2, height))
+            for nx in range(max(x - 1, 0), min(x + 2, width))
+            if nx != x or ny != y]
+
+def collect_constraints(grid: List[List[CellType]], width: int, height: int) -> Tuple[List[Constraint], List[int], int]:
+    """Read what the player knows: trail-cell counts, unknown cells and revealed mines.
+
+    A trail cell showed the number of mines around it; mines already revealed
+    are known, so each constraint only asks for the mines still hidden among
+    its unknown neighbours.
+    """
+    unknown = [y * width + x for y in range(height) for x in range(width) if grid[y][x] in UNKNOWN_CELLS]
+    revealed = sum(row.count(CellType.REVEALED_MINE) for row in grid)
+    constraints = set()
+    for y in range(height):
+        for x in range(width):
+            if grid[y][x] not in TRAIL_CELLS:
+                continue
+            cells, needed = [], 0
+            for index in neighbour_indices(x, y, width, height):
+                cell = grid[index // width][index % width]
+                if cell in UNKNOWN_CELLS:
+                    cells.append(index)
+                    needed += cell == CellType.MINE
+            if cells:
+                constraints.add((needed, tuple(cells)))
+    return sorted(constraints, key=lambda c: c[1]), unknown, revealed
+
+def split_components(constraints: List[Constraint]) -> List[Tuple[Tuple[int, ...], Tuple[Constraint, ...]]]:
+    """Group constraints that share cells into independent components."""
+    parent: Dict[int, int] = {}
+
+    def find(cell: int) -> int:
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for _, cells in constraints:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        root = find(cells[0])
+        for cell in cells[1:]:
+            parent[find(cell)] = root
+
+    groups: Dict[int, List[Constraint]] = {}
+    for constraint in constraints:
+        groups.setdefault(find(constraint[1][0]), []).append(constraint)
+
+    components = []
+    for group in groups.values():
+        ordered: List[int] = []
+        for _, cells in group:
+            ordered.extend(cell for cell in cells if cell not in ordered)
+        components.append((tuple(ordered), tuple(group)))
+    return components
+
+@lru_cache(maxsize=COMPONENT_CACHE_SIZE)
+def solve_component(cells: Tuple[int, ...], constraints: Tuple[Constraint, ...]) -> ComponentSolution:
+    """Enumerate mine assignments of one component, grouped by mine count.
+
+    Cells are assigned in the order constraints mention them, so each
+    constraint is closed soon after it is opened and dead branches are cut
+    early. Results are cached: components away from the player rarely change
+    between moves.
+    """
+    n = len(cells)
+    position = {cell: i for i, cell in enumerate(cells)}
+    need = [needed for needed, _ in constraints]
+    left = [len(members) for _, members in constraints]
+    cell_constraints: List[List[int]] = [[] for _ in range(n)]
+    for c, (_, members) in enumerate(constraints):
+        for cell in members:
+            cell_constraints[position[cell]].append(c)
+
+    assignment = [0] * n
+    solutions: Dict[int, List] = {}
+
+    def search(i: int, mines: int) -> None:
+        if i == n:
+            entry = solutions.setdefault(mines, [0, [0] * n])
+            entry[0] += 1
+            counts = entry[1]
+            for j in range(n):
+                counts[j] += assignment[j]
+            return
+        for value in (0, 1):
+            if all(0 <= need[c] - value <= left[c] - 1 for c in cell_constraints[i]):
+                for c in cell_constraints[i]:
+                    need[c] -= value
+                    left[c] -= 1
+                assignment[i] = value
+                search(i + 1, mines + value)
+                for c in cell_constraints[i]:
+                    need[c] += value
+                    left[c] += 1
+        assignment[i] = 0
+
+    search(0, 0)
+    return tuple((mines, count, tuple(counts)) for mines, (count, counts) in sorted(solutions.items()))
+
+def convolve(a: Dict[int, int], b: Dict[int, int]) -> Dict[int, int]:
+    """Combine two mine-count distributions."""
+    result: Dict[int, int] = {}
+    for ka, wa in a.items():
+        for kb, wb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0) + wa * wb
+    return result
+
+def propagate_constraints(constraints: List[Constraint]) -> Tuple[List[Constraint], Dict[int, int]]:
+    """Settle cells that some constraint forces, returning what is left and the forced values.
+
+    A constraint that needs no more mines clears all its cells, and one
+    that needs as many mines as it has cells fills them; settled cells are
+    then taken out of every other constraint until nothing changes. Only
+    forced values are settled, so the remaining constraints have exactly
+    the same solutions, over fewer and smaller components.
+    """
+    known: Dict[int, int] = {}
+    pending = constraints
+    changed = True
+    while changed:
+        changed = False
+        remaining: Set[Constraint] = set()
+        for needed, cells in pending:
+            free = tuple(cell for cell in cells if cell not in known)
+            needed -= sum(known.get(cell, 0) for cell in cells)
+            if not free:
+                continue
+            if needed <= 0 or needed >= len(free):
+                value = 1 if needed > 0 else 0
+                for cell in free:
+                    known[cell] = value
+                changed = True
+            else:
+                remaining.add((needed, free))
+        pending = sorted(remaining, key=lambda c: c[1])
+    return pending, known
+
+def estimate_component(cells: Tuple[int, ...], constraints: Tuple[Constraint, ...]) -> Dict[int, float]:
+    """Per-cell mine estimate for a component too big to enumerate: the mean density of its constraints."""
+    shares: Dict[int, List[float]] = {cell: [] for cell in cells}
+    for needed, members in constraints:
+        for cell in members:
+            shares[cell].append(needed / len(members))
+    return {cell: sum(values) / len(values) for cell, values in shares.items()}
+
+def solve_probabilities(grid: List[List[CellType]], total_mines: int, width: int,
+                        height: int) -> Tuple[Dict[int, float], Set[int]]:
+    """Probability that each unknown cell (by flat index) holds a mine, and the cells that are only estimated.
+
+    Forced cells are settled by propagate_constraints; every component of
+    up to MAX_COMPONENT_CELLS cells is then enumerated, which makes the
+    result exact. A component still larger than that is estimated: its
+    cells get the mean density of the constraints on them and it counts
+    as holding the rounded sum of those estimates. Since that count also
+    weights every other cell, all cells but the forced ones are then
+    returned in the approximate set.
+    """
+    constraints, unknown, revealed = collect_constraints(grid, width, height)
+    constraints, known = propagate_constraints(constraints)
+    remaining = total_mines - revealed - sum(known.values())
+    probabilities: Dict[int, float] = {cell: float(value) for cell, value in known.items()}
+    approximate: Set[int] = set()
+
+    components = []
+    estimated: List[Dict[int, int]] = []
+    frontier_size = len(known)
+    for cells, group in split_components(constraints):
+        frontier_size += len(cells)
+        if len(cells) <= MAX_COMPONENT_CELLS:
+            components.append((cells, solve_component(cells, group)))
+        else:
+            estimate = estimate_component(cells, group)
+            probabilities.update(estimate)
+            approximate.update(cells)
+            estimated.append({round(sum(estimate.values())): 1})
+    others = len(unknown) - frontier_size
+
+    distributions = [{mines: count for mines, count, _ in solution} for _, solution in components] + estimated
+    everything: Dict[int, int] = {0: 1}
+    for distribution in distributions:
+        everything = convolve(everything, distribution)
+    total_weight = sum(weight * comb(others, remaining - k) for k, weight in everything.items() if k <= remaining)
+    if total_weight == 0:
+        return probabilities, approximate
+
+    for i, (cells, solution) in enumerate(components):
+        rest: Dict[int, int] = {0: 1}
+        for j, distribution in enumerate(distributions):
+            if j != i:
+                rest = convolve(rest, distribution)
+        mine_weight = [0] * len(cells)
+        for mines, _, counts in solution:
+            factor = sum(weight * comb(others, remaining - mines - k) for k, weight in rest.items()
+                         if mines + k <= remaining)
+            for c, count in enumerate(counts):
+                mine_weight[c] += count * factor
+        for cell, weight in zip(cells, mine_weight):
+            probabilities[cell] = weight / total_weight
+
+    if others:
+        other_weight = sum(weight * comb(others - 1, remaining - k - 1) for k, weight in everything.items()
+                           if k < remaining)
+        other_probability = other_weight / total_weight
+        for cell in unknown:
+            probabilities.setdefault(cell, other_probability)
+    if estimated:
+        # the estimate's mine count feeds every other cell's weighting; only forced cells stay exact
+        approximate.update(cell for cell in probabilities if cell not in known)
+    return probabilities, approximate
+
+def mine_probabilities(grid: List[List[CellType]], total_mines: int, width: int, height: int) -> Dict[int, float]:
+    """Probability that each unknown cell (by flat index) holds a mine; see solve_probabilities."""
+    return solve_probabilities(grid, total_mines, width, height)[0]
+
+class MineHints:
+    """Keeps the latest probability map and recomputes it only after the state changes."""
+
+    def __init__(self):
+        self.key: Optional[Tuple] = None
+        self.probabilities: Dict[int, float] = {}
+        self.approximate: Set[int] = set()
+
+    def update(self, state: GameState, width: int, height: int) -> Dict[int, float]:
+        """Get probabilities for the state, reusing the previous result if nothing moved."""
+        key = (id(state.grid), state.level, state.player_pos, state.mine_reveal_timer, state.game_over)
+        if key != self.key:
+            self.probabilities, self.approximate = solve_probabilities(
+                state.grid, calculate_mine_count(state.level), width, height)
+            self.key = key
+        return self.probabilities
@@ -0,0 +1,88 @@
+import math
+from array import array
+from typing import Tuple
+
+SPARK_COUNT = 8
+SPARK_LIFETIME = 24
+SPARK_SPEED = 0.28
+PARTICLE_CAPACITY = 512
+
+# Unit vectors for evenly spaced spark directions, computed once at import
+SPARK_DIRECTIONS: Tuple[Tuple[float, float], ...] = tuple(
+    (math.cos(2 * math.pi * i / SPARK_COUNT), math.sin(2 * math.pi * i / SPARK_COUNT))
+    for i in range(SPARK_COUNT)
+)
+
+class ParticlePool:
+    """Fixed-capacity particle storage kept in parallel arrays.
+
+    Live particles occupy indices [0, count); dead ones are swap-removed so
+    updates and draws only ever touch live slots.
+    """
+
+    def __init__(self, capacity: int = PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = array("f", bytes(4 * capacity))
+        self.y = array("f", bytes(4 * capacity))
+        self.vx = array("f", bytes(4 * capacity))
+        self.vy = array("f", bytes(4 * capacity))
+        self.age = array("H", bytes(2 * capacity))
+        self.life = array("H", bytes(2 * capacity))
+        self.phase = array("B", bytes(capacity))
+
+def spawn_particle(pool: ParticlePool, x: float, y: float, vx: float, vy: float, life: int, phase: int) -> bool:
+    """Add one particle to the pool, returning False when the pool is full."""
+    i = pool.count
+    if i >= pool.capacity:
+        return False
+    pool.x[i] = x
+    pool.y[i] = y
+    pool.vx[i] = vx
+    pool.vy[i] = vy
+    pool.age[i] = 0
+    pool.life[i] = life
+    pool.phase[i] = phase
+    pool.count = i + 1
+    return True
+
+def spawn_explosion(pool: ParticlePool, sx: float, sy: float,
+                    speed: float = SPARK_SPEED, life: int = SPARK_LIFETIME) -> int:
+    """Emit a ring of sparks from a screen point and return how many were spawned."""
+    spawned = 0
+    for i, (dx, dy) in enumerate(SPARK_DIRECTIONS):
+        if not spawn_particle(pool, sx, sy, dx * speed, dy * speed, life, i % 3):
+            break
+        spawned += 1
+    return spawned
+
+def remove_particle(pool: ParticlePool, i: int) -> None:
+    """Remove particle at index by moving the last live particle into its slot."""
+    last = pool.count - 1
+    if i != last:
+        pool.x[i] = pool.x[last]
+        pool.y[i] = pool.y[last]
+        pool.vx[i] = pool.vx[last]
+        pool.vy[i] = pool.vy[last]
+        pool.age[i] = pool.age[last]
+        pool.life[i] = pool.life[last]
+        pool.phase[i] = pool.phase[last]
+    pool.count = last
+
+def update_particles(pool: ParticlePool) -> None:
+    """Advance all live particles by one frame and retire expired ones."""
+    x, y, vx, vy, age, life = pool.x, pool.y, pool.vx, pool.vy, pool.age, pool.life
+    i = 0
+    while i < pool.count:
+        a = age[i] + 1
+        if a >= life[i]:
+            remove_particle(pool, i)
+            continue
+        age[i] = a
+        x[i] += vx[i]
+        y[i] += vy[i]
+        i += 1
+
+def clear_particles(pool: ParticlePool) -> None:
+    """Drop every live particle without releasing storage."""
+    pool.count = 0
@@ -0,0 +1,237 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from mined_out.common import CellType, Direction, Position
+from mined_out.game_state import CellChange
+
+DANGER_WEIGHT = 2.0
+RISK_WEIGHT = 30.0  # cost of entering a cell that is certainly a mine, were it allowed
+RISK_LEVELS = 16  # risks are rounded to 1/16 so small drifts do not re-expand the grid
+INFINITY = float("inf")
+
+BLOCKED_CELLS = (CellType.WALL, CellType.MINE, CellType.REVEALED_MINE)
+STEP_DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+
+Key = Tuple[float, float]
+
+class PathPlanner:
+    """D* Lite search over the grid, kept alive between ticks.
+
+    g and rhs hold the cost from each cell (flat index y * width + x) to the
+    nearest goal. Stepping into a cell costs 1 plus danger_weight per mine
+    around it plus risk_weight times its risk (see set_risk); walls and
+    mines cannot be entered. The planner sees every MINE cell in its grid,
+    so planning fairly means handing it the player's view, as PlannerAgent
+    does. After cells, risks or goals change, replan() only re-expands
+    cells whose cost-to-goal changed.
+    """
+
+    def __init__(self, grid: List[List[CellType]], width: int, height: int, start: Position,
+                 goals: Iterable[Position], danger_weight: float = DANGER_WEIGHT,
+                 risk_weight: float = RISK_WEIGHT):
+        self.grid = grid
+        self.width = width
+        self.height = height
+        self.danger_weight = danger_weight
+        self.risk_weight = risk_weight
+        size = width * height
+        self.blocked = bytearray(size)
+        self.mines = bytearray(size)
+        self.danger = bytearray(size)
+        self.risk: Dict[int, float] = {}
+        self.g = [INFINITY] * size
+        self.rhs = [INFINITY] * size
+        self.queue: List[Tuple[float, float, int]] = []
+        self.queued: Dict[int, Key] = {}
+        self.goals: Set[int] = set()
+        self.km = 0.0
+        self.start = start.y * width + start.x
+        self.last_start = self.start
+        self.neighbours = [step_neighbours(i, width, height) for i in range(size)]
+
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                if cell in BLOCKED_CELLS:
+                    self.blocked[y * width + x] = 1
+                if cell == CellType.MINE:
+                    self.mines[y * width + x] = 1
+                    for i in ring_indices(x, y, width, height):
+                        self.danger[i] += 1
+        set_goals(self, goals)
+
+def step_neighbours(index: int, width: int, height: int) -> Tuple[int, ...]:
+    """Flat indices of the cells one step up, down, left or right."""
+    y, x = divmod(index, width)
+    return tuple(ny * width + nx for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                 if 0 <= nx < width and 0 <= ny < height)
+
+def ring_indices(x: int, y: int, width: int, height: int) -> List[int]:
+    """Flat indices of the up to eight cells around a position."""
+    return [ny * width + nx
+            for ny in range(max(y - 1, 0), min(y + 2, height))
+            for nx in range(max(x - 1, 0), min(x + 2, width))
+            if nx != x or ny != y]
+
+def step_cost(planner: PathPlanner, index: int) -> float:
+    """Cost of stepping into a cell."""
+    if planner.blocked[index]:
+        return INFINITY
+    return 1.0 + planner.danger_weight * planner.danger[index] + planner.risk_weight * planner.risk.get(index, 0.0)
+
+def heuristic(planner: PathPlanner, a: int, b: int) -> float:
+    """Manhattan distance; every step costs at least 1, so it never overestimates."""
+    ay, ax = divmod(a, planner.width)
+    by, bx = divmod(b, planner.width)
+    return abs(ax - bx) + abs(ay - by)
+
+def calculate_key(planner: PathPlanner, index: int) -> Key:
+    """Queue priority of a cell."""
+    best = min(planner.g[index], planner.rhs[index])
+    return best + heuristic(planner, planner.start, index) + planner.km, best
+
+def update_vertex(planner: PathPlanner, index: int) -> None:
+    """Recompute a cell's one-step lookahead cost and requeue it if inconsistent."""
+    if index not in planner.goals:
+        g = planner.g
+        planner.rhs[index] = min((step_cost(planner, n) + g[n] for n in planner.neighbours[index]),
+                                 default=INFINITY)
+    planner.queued.pop(index, None)
+    if planner.g[index] != planner.rhs[index]:
+        key = calculate_key(planner, index)
+        planner.queued[index] = key
+        heapq.heappush(planner.queue, (key[0], key[1], index))
+
+def update_predecessors(planner: PathPlanner, index: int) -> None:
+    """Update every cell that can step into index."""
+    for n in planner.neighbours[index]:
+        update_vertex(planner, n)
+
+def set_goals(planner: PathPlanner, goals: Iterable[Position]) -> None:
+    """Replace the goal cells; the planner heads for whichever is cheapest to reach."""
+    new_goals = {pos.y * planner.width + pos.x for pos in goals}
+    changed = planner.goals ^ new_goals
+    planner.goals = new_goals
+    for index in changed:
+        if index in new_goals:
+            planner.rhs[index] = 0.0
+        update_vertex(planner, index)
+
+def move_start(planner: PathPlanner, pos: Position) -> None:
+    """Move the search start to the player, raising km so keys already queued stay comparable."""
+    planner.start = pos.y * planner.width + pos.x
+    planner.km += heuristic(planner, planner.last_start, planner.start)
+    planner.last_start = planner.start
+
+def update_cells(planner: PathPlanner, positions: Iterable[Position]) -> int:
+    """Re-read cells from the grid after they changed, returning how many step costs changed.
+
+    Trail and item pickups change no costs; a cell only matters when it
+    becomes or stops being blocked, or gains or loses a mine.
+    """
+    width, height = planner.width, planner.height
+    affected: Set[int] = set()
+    for pos in positions:
+        index = pos.y * width + pos.x
+        cell = planner.grid[pos.y][pos.x]
+        blocked = cell in BLOCKED_CELLS
+        if blocked != planner.blocked[index]:
+            planner.blocked[index] = blocked
+            affected.add(index)
+        mine = cell == CellType.MINE
+        if mine != planner.mines[index]:
+            planner.mines[index] = mine
+            ring = ring_indices(pos.x, pos.y, width, height)
+            for i in ring:
+                planner.danger[i] += 1 if mine else -1
+            affected.update(ring)
+    if affected:
+        for index in affected:
+            update_predecessors(planner, index)
+    return len(affected)
+
+def set_risk(planner: PathPlanner, risk: Dict[int, float]) -> int:
+    """Replace the per-cell risk (0..1, by flat index; missing means 0), returning how many cells changed.
+
+    Risks are rounded to 1/RISK_LEVELS: every move shifts the mine density
+    of all unexplored cells a little, and following each shift exactly
+    would re-expand most of the grid every tick.
+    """
+    old = planner.risk
+    new = {}
+    for index, value in risk.items():
+        level = round(value * RISK_LEVELS)
+        if level:
+            new[index] = level / RISK_LEVELS
+    changed = [index for index in old.keys() | new.keys() if old.get(index, 0.0) != new.get(index, 0.0)]
+    planner.risk = new
+    for index in changed:
+        update_predecessors(planner, index)
+    return len(changed)
+
+def apply_cell_changes(planner: PathPlanner, changes: Iterable[CellChange]) -> int:
+    """Feed a game-state change log (see set_cell) to the planner."""
+    return update_cells(planner, (Position(x, y) for x, y, _, _ in changes))
+
+def replan(planner: PathPlanner) -> int:
+    """Bring costs from the start up to date, returning how many cells were expanded."""
+    queue, queued, g, rhs = planner.queue, planner.queued, planner.g, planner.rhs
+    start = planner.start
+    expanded = 0
+    while queue:
+        k1, k2, index = queue[0]
+        if queued.get(index) != (k1, k2):
+            heapq.heappop(queue)  # stale entry, the cell was requeued or settled since
+            continue
+        if (k1, k2) >= calculate_key(planner, start) and rhs[start] == g[start]:
+            break
+        heapq.heappop(queue)
+        del queued[index]
+        expanded += 1
+        new_key = calculate_key(planner, index)
+        if (k1, k2) < new_key:
+            queued[index] = new_key
+            heapq.heappush(queue, (new_key[0], new_key[1], index))
+        elif g[index] > rhs[index]:
+            g[index] = rhs[index]
+            update_predecessors(planner, index)
+        else:
+            g[index] = INFINITY
+            update_vertex(planner, index)
+            update_predecessors(planner, index)
+    return expanded
+
+def best_step(planner: PathPlanner, index: int) -> Tuple[float, Optional[Direction], int]:
+    """Cheapest move out of a cell as (cost to goal, direction, next cell)."""
+    width = planner.width
+    y, x = divmod(index, width)
+    best: Tuple[float, Optional[Direction], int] = (INFINITY, None, index)
+    for direction in STEP_DIRECTIONS:
+        dx, dy = direction.value
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < planner.height:
+            n = ny * width + nx
+            cost = step_cost(planner, n) + planner.g[n]
+            if cost < best[0]:
+                best = (cost, direction, n)
+    return best
+
+def next_direction(planner: PathPlanner) -> Optional[Direction]:
+    """Direction of the next step towards the nearest goal, or None if at a goal or cut off."""
+    if planner.start in planner.goals:
+        return None
+    cost, direction, _ = best_step(planner, planner.start)
+    return direction if cost < INFINITY else None
+
+def planned_path(planner: PathPlanner) -> List[Position]:
+    """Cells of the current plan from the start to a goal, start excluded."""
+    path: List[Position] = []
+    index = planner.start
+    for _ in range(planner.width * planner.height):
+        if index in planner.goals:
+            break
+        cost, _, index = best_step(planner, index)
+        if cost == INFINITY:
+            return []
+        y, x = divmod(index, planner.width)
+        path.append(Position(x, y))
+    return path
@@ -1,7 +1,37 @@
 import pyxel
-from typing import List
+from functools import lru_cache
+from typing import AbstractSet, Dict, List
 
 from mined_out.common import CellType, Position, Explosion
+from mined_out.particle_system import ParticlePool
+
+# HUD text is cached so steady-state frames draw without building new strings
+TEXT_CACHE_SIZE = 256
+MINE_COUNT_TEXT = tuple(str(count) for count in range(9))
+HUD_TRANSPARENT = 0  # no HUD text is drawn in black
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def level_text(level: int) -> str:
+    """HUD line for the current level."""
+    return f"Level: {level}"
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def items_text(items_collected: int, total_items: int) -> str:
+    """HUD line for collected items."""
+    return f"Items: {items_collected}/{total_items}"
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def mines_nearby_text(mine_count: int) -> str:
+    """HUD line for the adjacent mine count."""
+    return f"Mines nearby: {mine_count}"
+
+def mine_count_text(mine_count: int) -> str:
+    """Digit shown next to the player."""
+    return MINE_COUNT_TEXT[mine_count] if 0 <= mine_count < len(MINE_COUNT_TEXT) else str(mine_count)
+
+def clamp(value: int, low: int, high: int) -> int:
+    """Limit value to [low, high]; unlike max/min it builds no argument tuple."""
+    return low if value < low else high if value > high else value
 
 def get_danger_color(mine_count: int) -> int:
     """Get color based on mine danger level."""
@@ -23,6 +53,19 @@ def get_explosion_color(progress: float) -> int:
     else:
         return 8  # Red
 
+def get_probability_color(probability: float) -> int:
+    """Get hint color for the chance that a cell holds a mine."""
+    if probability <= 0.0:
+        return pyxel.COLOR_GREEN
+    elif probability < 0.25:
+        return pyxel.COLOR_LIME
+    elif probability < 0.5:
+        return pyxel.COLOR_YELLOW
+    elif probability < 1.0:
+        return pyxel.COLOR_ORANGE
+    else:
+        return pyxel.COLOR_RED
+
 def draw_cell(x: int, y: int, cell_type: CellType, cell_size: int) -> None:
     """Draw single cell at grid position."""
     sx, sy = x * cell_size, y * cell_size
@@ -48,28 +91,38 @@ def draw_grid(grid: List[List[CellType]], grid_width: int, grid_height: int, cel
             if cell != CellType.EMPTY:
                 draw_cell(x, y, cell, cell_size)
 
+def draw_mine_probabilities(probabilities: Dict[int, float], grid_width: int, cell_size: int,
+                            approximate: AbstractSet[int] = frozenset()) -> None:
+    """Draw a hint dot on every unknown cell, colored by mine probability; estimated cells get a single pixel."""
+    for index, probability in probabilities.items():
+        y, x = divmod(index, grid_width)
+        if index in approximate:
+            pyxel.pset(x * cell_size + 3, y * cell_size + 3, get_probability_color(probability))
+        else:
+            pyxel.rect(x * cell_size + 3, y * cell_size + 3, 2, 2, get_probability_color(probability))
+
 def draw_mine_indicator(player_pos: Position, mine_count: int, cell_size: int, screen_width: int, screen_height: int) -> None:
     """Draw mine count indicator near player."""
     color = get_danger_color(mine_count)
     px = player_pos.x * cell_size
     py = player_pos.y * cell_size
 
-    tx = max(1, min(px - 6, screen_width - 8))
-    ty = max(1, min(py - 6, screen_height - 8))
+    tx = clamp(px - 6, 1, screen_width - 8)
+    ty = clamp(py - 6, 1, screen_height - 8)
 
     pyxel.circb(tx + 2, ty + 2, 3, 7)
-    pyxel.text(tx, ty, str(mine_count), color)
+    pyxel.text(tx, ty, mine_count_text(mine_count), color)
 
-def draw_explosion_sparks(sx: int, sy: int, radius: int, color: int, frame: int) -> None:
-    """Draw explosion sparks around center point."""
-    for i in range(8):
-        spark_x = sx + int(radius * 0.7 * pyxel.cos(i * 45))
-        spark_y = sy + int(radius * 0.7 * pyxel.sin(i * 45))
-        if frame % 3 == i % 3:
-            pyxel.pset(spark_x, spark_y, color)
+def draw_explosion_sparks(pool: ParticlePool, stride: int = 1) -> None:
+    """Draw live explosion sparks from the particle pool, only every stride-th one at reduced quality."""
+    x, y, age, phase = pool.x, pool.y, pool.age, pool.phase
+    for i in range(0, pool.count, stride):
+        a = age[i]
+        if (a - phase[i]) % 3 == 0:
+            pyxel.pset(int(x[i]), int(y[i]), get_explosion_color(a / 30))
 
 def draw_explosion(explosion: Explosion, cell_size: int) -> None:
-    """Draw explosion animation."""
+    """Draw explosion shock rings; sparks are drawn from the particle pool."""
     progress = explosion.frame / 30
     radius = int(12 * progress)
 
@@ -83,9 +136,6 @@ def draw_explosion(explosion: Explosion, cell_size: int) -> None:
         if radius > 2:
             pyxel.circb(sx, sy, radius - 2, color)
 
-    if progress < 0.8:
-        draw_explosion_sparks(sx, sy, radius, color, explosion.frame)
-
 def draw_game_over_screen(won: bool, screen_width: int, screen_height: int) -> None:
     """Draw game over overlay."""
     pyxel.rect(0, screen_height // 2 - 15, screen_width, 30, 0)
@@ -95,14 +145,32 @@ def draw_game_over_screen(won: bool, screen_width: int, screen_height: int) -> N
     pyxel.text(x, screen_height // 2 - 10, message, color)
     pyxel.text(x - 20, screen_height // 2, "Press R to restart", 7)
 
-def draw_ui(level: int, items_collected: int, total_items: int, mine_count: int, screen_height: int) -> None:
-    """Draw game UI elements."""
-    pyxel.text(2, 2, f"Level: {level}", 7)
-    pyxel.text(2, 10, f"Items: {items_collected}/{total_items}", 7)
-    pyxel.text(2, 18, f"Mines nearby: {mine_count}", get_danger_color(mine_count))
+def draw_ui(level: int, items_collected: int, total_items: int, mine_count: int, screen_height: int,
+            target=pyxel) -> None:
+    """Draw game UI elements onto the screen, or onto any target with pyxel's text()."""
+    target.text(2, 2, level_text(level), 7)
+    target.text(2, 10, items_text(items_collected, total_items), 7)
+    target.text(2, 18, mines_nearby_text(mine_count), get_danger_color(mine_count))
 
     if items_collected >= total_items:
-        pyxel.text(2, screen_height - 16, "Find the exit!", 11)
+        target.text(2, screen_height - 16, "Find the exit!", 11)
     else:
-        pyxel.text(2, screen_height - 16, "Collect all items!", 7)
-    pyxel.text(2, screen_height - 8, "Mines are hidden!", 8)
+        target.text(2, screen_height - 16, "Collect all items!", 7)
+    target.text(2, screen_height - 8, "Mines are hidden!", 8)
+
+class HudLayer:
+    """Off-screen copy of the HUD, so it can be redrawn less often than the frame."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.image = pyxel.Image(width, height)
+
+def refresh_hud(layer: HudLayer, level: int, items_collected: int, total_items: int, mine_count: int) -> None:
+    """Redraw the HUD into its layer; color 0 is left as the transparent background."""
+    layer.image.cls(HUD_TRANSPARENT)
+    draw_ui(level, items_collected, total_items, mine_count, layer.height, layer.image)
+
+def draw_hud_layer(layer: HudLayer) -> None:
+    """Copy the last refreshed HUD onto the screen."""
+    pyxel.blt(0, 0, layer.image, 0, 0, layer.width, layer.height, HUD_TRANSPARENT)
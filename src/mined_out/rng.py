@@ -0,0 +1,125 @@
+import datetime
+import os
+import random
+from typing import List, Optional, Union
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+LANE_BITS = 16
+LANE_MASK = (1 << LANE_BITS) - 1
+LANE_SHIFTS = range(0, 64, LANE_BITS)
+LANES_PER_WORD = len(LANE_SHIFTS)
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+Label = Union[int, str]
+
+def mix64(z: int) -> int:
+    """SplitMix64 finalizer: scramble a 64-bit integer."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def label_key(label: Label) -> int:
+    """Stable 64-bit key for a stream label (str hashing is not stable across processes)."""
+    if isinstance(label, int):
+        return label & MASK64
+    h = FNV_OFFSET
+    for byte in label.encode():
+        h = ((h ^ byte) * FNV_PRIME) & MASK64
+    return h
+
+class GameRng(random.Random):
+    """Counter-based generator: output n depends only on the stream key and n.
+
+    Streams never share state, so a level or entity draws the same numbers
+    whatever else ran before it, in this process or another. split() derives
+    independent child streams from labels. Inherits the usual helpers
+    (randrange, choice, shuffle, ...) from random.Random.
+    """
+
+    def __init__(self, seed: int = 0, *, key: Optional[int] = None):
+        self.key = mix64(label_key(seed)) if key is None else key
+        self.counter = 0
+        super().__init__()
+
+    def seed(self, *args, **kwargs) -> None:
+        """Streams are fixed by their key; reseeding only rewinds the counter."""
+        self.counter = 0
+
+    def getstate(self):
+        return self.key, self.counter
+
+    def setstate(self, state) -> None:
+        self.key, self.counter = state
+
+    def next_u64(self) -> int:
+        """Next raw 64-bit output."""
+        self.counter += 1
+        return mix64((self.key + self.counter * GOLDEN_GAMMA) & MASK64)
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)."""
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        """Integer with k random bits."""
+        if k <= 64:
+            return self.next_u64() >> (64 - k) if k else 0
+        result, bits = 0, 0
+        while bits < k:
+            result = (result << 64) | self.next_u64()
+            bits += 64
+        return result >> (bits - k)
+
+    def _randbelow(self, n: int) -> int:
+        """Integer in [0, n) for randrange and friends, by rejection like random.Random.
+
+        Same draws as the inherited version, with the 64-bit step inlined for
+        the small ranges level generation asks for.
+        """
+        k = n.bit_length()
+        if k > 64:
+            r = self.getrandbits(k)
+            while r >= n:
+                r = self.getrandbits(k)
+            return r
+        key, shift = self.key, 64 - k
+        while True:
+            self.counter += 1
+            r = mix64((key + self.counter * GOLDEN_GAMMA) & MASK64) >> shift
+            if r < n:
+                return r
+
+    def bernoulli(self, count: int, probability: float) -> List[bool]:
+        """count draws that are True with the given probability.
+
+        Each 64-bit output feeds four 16-bit lanes, which is plenty of
+        resolution for spawn chances and a quarter of the hashing.
+        """
+        threshold = int(probability * (1 << LANE_BITS))
+        first = self.counter + 1
+        self.counter += -(-count // LANES_PER_WORD)
+        key = self.key
+        words = [mix64((key + n * GOLDEN_GAMMA) & MASK64) for n in range(first, self.counter + 1)]
+        return [(word >> shift) & LANE_MASK < threshold for word in words for shift in LANE_SHIFTS][:count]
+
+    def split(self, *labels: Label) -> "GameRng":
+        """Derive an independent child stream, e.g. split("level", 3)."""
+        key = self.key
+        for label in labels:
+            key = mix64(key ^ mix64((label_key(label) + GOLDEN_GAMMA) & MASK64))
+        return GameRng(key=key)
+
+def level_rng(seed: int, level_num: int) -> GameRng:
+    """Stream used to generate one level of a seeded game."""
+    return GameRng(seed).split("level", level_num)
+
+def new_seed() -> int:
+    """Fresh random game seed."""
+    return int.from_bytes(os.urandom(8), "little") >> 1
+
+def daily_seed(day: Optional[datetime.date] = None) -> int:
+    """Seed shared by everyone playing the daily challenge."""
+    day = day or datetime.date.today()
+    return label_key(f"daily-{day.isoformat()}") >> 1
@@ -0,0 +1,145 @@
+import os
+import struct
+from functools import lru_cache
+from typing import Tuple
+
+from mined_out.common import CELL_TYPES, Explosion, Position
+from mined_out.frame_encoding import FLAG_EXPLODING, FLAG_GAME_OVER, FLAG_REVEALING, FLAG_WON, grid_codes
+from mined_out.game_state import GameState
+from mined_out.rng import MASK64
+
+SAVE_MAGIC = b"MOSV"
+SAVE_VERSION = 1
+CELL_BITS = 3
+CELLS_PER_GROUP = 8  # eight 3-bit cells fill three bytes
+GROUP_BYTES = 3
+
+# magic, version, width, height, level, player x, player y, exit x, exit y, items collected,
+# total items, mines nearby, flags, explosion x, explosion y, explosion frame,
+# revealing x, revealing y, mine reveal timer, seed (followed by the packed grid)
+SAVE_HEADER = struct.Struct("<4sBBBBBBBBBBBBBBHBBHQ")
+
+assert len(CELL_TYPES) <= 1 << CELL_BITS, "cell codes no longer fit in the save format"
+
+class SaveFormatError(ValueError):
+    """Raised when bytes are not a save state this version can read."""
+
+def repeat_mask(pattern: int, groups: int) -> int:
+    """Repeat a 64-bit pattern once per group of eight cells."""
+    return int.from_bytes(pattern.to_bytes(8, "little") * groups, "little")
+
+@lru_cache(maxsize=64)
+def pack_masks(groups: int) -> Tuple[int, ...]:
+    """Masks for folding byte lanes into 3-bit lanes, one set per grid size."""
+    return (repeat_mask(0x0007000700070007, groups), repeat_mask(0x0700070007000700, groups),
+            repeat_mask(0x0000003F0000003F, groups), repeat_mask(0x003F0000003F0000, groups),
+            repeat_mask(0x0000000000000FFF, groups), repeat_mask(0x00000FFF00000000, groups))
+
+def pack_codes(codes: bytes) -> bytes:
+    """Pack one-byte cell codes into 3 bits each.
+
+    The codes are read as one big integer and folded in three shift-and-mask
+    rounds (8 to 16, 16 to 32, 32 to 64 bits per pair of lanes), which leaves
+    24 packed bits at the bottom of every 64-bit group. Slicing then keeps
+    those three bytes, so no step loops over cells in Python.
+    """
+    groups = -(-len(codes) // CELLS_PER_GROUP)
+    low2, high2, low4, high4, low8, high8 = pack_masks(groups)
+    x = int.from_bytes(codes, "little")
+    x = (x & low2) | ((x & high2) >> 5)
+    x = (x & low4) | ((x & high4) >> 10)
+    x = (x & low8) | ((x & high8) >> 20)
+    lanes = x.to_bytes(groups * CELLS_PER_GROUP, "little")
+    packed = bytearray(groups * GROUP_BYTES)
+    for offset in range(GROUP_BYTES):
+        packed[offset::GROUP_BYTES] = lanes[offset::CELLS_PER_GROUP]
+    return bytes(packed)
+
+def unpack_codes(packed: bytes, count: int) -> bytes:
+    """Inverse of pack_codes: spread 3-bit codes back into one byte per cell."""
+    groups = -(-count // CELLS_PER_GROUP)
+    low2, high2, low4, high4, low8, high8 = pack_masks(groups)
+    lanes = bytearray(groups * CELLS_PER_GROUP)
+    for offset in range(GROUP_BYTES):
+        lanes[offset::CELLS_PER_GROUP] = packed[offset::GROUP_BYTES]
+    x = int.from_bytes(lanes, "little")
+    x = (x & low8) | ((x << 20) & high8)
+    x = (x & low4) | ((x << 10) & high4)
+    x = (x & low2) | ((x << 5) & high2)
+    return x.to_bytes(groups * CELLS_PER_GROUP, "little")[:count]
+
+def packed_size(width: int, height: int) -> int:
+    """Bytes taken by a save state of a grid this size."""
+    return SAVE_HEADER.size + -(-width * height // CELLS_PER_GROUP) * GROUP_BYTES
+
+def pack_state(state: GameState) -> bytes:
+    """Serialize a game state to the compact binary save format.
+
+    The change log is not saved; attach a fresh one after loading if needed.
+    """
+    grid = state.grid
+    flags = 0
+    if state.game_over:
+        flags |= FLAG_GAME_OVER
+    if state.won:
+        flags |= FLAG_WON
+    explosion = state.explosion
+    if explosion is not None:
+        flags |= FLAG_EXPLODING
+    revealing = state.revealing_mine_pos
+    if revealing is not None:
+        flags |= FLAG_REVEALING
+    header = SAVE_HEADER.pack(
+        SAVE_MAGIC, SAVE_VERSION, len(grid[0]), len(grid), state.level,
+        state.player_pos.x, state.player_pos.y, state.exit_pos.x, state.exit_pos.y,
+        state.items_collected, state.total_items, state.mine_count_nearby, flags,
+        explosion.pos.x if explosion else 0, explosion.pos.y if explosion else 0,
+        explosion.frame if explosion else 0,
+        revealing.x if revealing else 0, revealing.y if revealing else 0,
+        state.mine_reveal_timer, state.seed & MASK64,
+    )
+    return header + pack_codes(grid_codes(grid))
+
+def unpack_state(data: bytes) -> GameState:
+    """Rebuild a game state from pack_state output."""
+    if len(data) < SAVE_HEADER.size:
+        raise SaveFormatError("save state is truncated")
+    (magic, version, width, height, level, px, py, ex, ey, items, total, mines, flags,
+     bx, by, frame, rx, ry, timer, seed) = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise SaveFormatError("not a save state")
+    if version != SAVE_VERSION:
+        raise SaveFormatError(f"unsupported save state version {version}")
+    if len(data) != packed_size(width, height):
+        raise SaveFormatError("save state grid size does not match its header")
+
+    codes = unpack_codes(memoryview(data)[SAVE_HEADER.size:], width * height)
+    cells = [CELL_TYPES[code] for code in codes]
+    grid = [cells[y * width:(y + 1) * width] for y in range(height)]
+    return GameState(
+        player_pos=Position(px, py),
+        grid=grid,
+        items_collected=items,
+        total_items=total,
+        level=level,
+        exit_pos=Position(ex, ey),
+        mine_count_nearby=mines,
+        game_over=bool(flags & FLAG_GAME_OVER),
+        won=bool(flags & FLAG_WON),
+        explosion=Explosion(Position(bx, by), frame) if flags & FLAG_EXPLODING else None,
+        revealing_mine_pos=Position(rx, ry) if flags & FLAG_REVEALING else None,
+        mine_reveal_timer=timer,
+        seed=seed,
+    )
+
+def save_state_file(path: str, state: GameState) -> None:
+    """Write a save state, replacing the file atomically so a crash never leaves half a save."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(pack_state(state))
+    os.replace(temp_path, path)
+
+def load_state_file(path: str) -> GameState:
+    """Read a save state written by save_state_file."""
+    with open(path, "rb") as f:
+        return unpack_state(f.read())
@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import json
+import struct
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from mined_out.common import CellType, Direction
+from mined_out.constants import GRID_WIDTH, GRID_HEIGHT
+from mined_out.game_state import GameState
+from mined_out.audio_operations import NullAudioBackend, set_audio_backend
+from mined_out.frame_encoding import FrameEncoder, encode_changes, encode_frame
+from mined_out.game_logic import try_player_move, update_game_timers
+from mined_out.instrumentation import get_counter, get_latency_tracker, increment_counter, metrics_snapshot
+from mined_out.level_generation import create_level_state
+from mined_out.rng import new_seed
+from mined_out.spectator import parse_address
+
+TICK_RATE = 60
+MOVES_PER_TICK = 4
+INBOX_SIZE = 32
+OUTBOX_SIZE = 64
+LISTEN_BACKLOG = 1024  # hundreds of clients may connect at once
+
+# Client commands: one byte each, SEED is followed by a little-endian u64
+COMMAND_DIRECTIONS = {b"U": Direction.UP, b"D": Direction.DOWN, b"L": Direction.LEFT, b"R": Direction.RIGHT}
+NEW_GAME = b"N"
+SEED = b"S"
+SEED_VALUE = struct.Struct("<Q")
+
+# (command, direction or seed, time received)
+Command = Tuple[bytes, Optional[object], float]
+
+class Session:
+    """One connected client's game; slotted, since a host keeps hundreds of them.
+
+    The state keeps a set_cell change log attached, so frames are encoded
+    from the cells that changed rather than from a rescan of the grid.
+    """
+
+    __slots__ = ("session_id", "state", "encoder", "inbox", "outbox", "resync", "grid", "moves")
+
+    def __init__(self, session_id: int, state: GameState):
+        self.session_id = session_id
+        self.state = state
+        self.encoder = FrameEncoder()
+        self.inbox: asyncio.Queue = asyncio.Queue(INBOX_SIZE)
+        self.outbox: asyncio.Queue = asyncio.Queue(OUTBOX_SIZE)
+        self.resync = True
+        self.grid: Optional[List[List[CellType]]] = None  # grid the last frame was encoded from
+        self.moves = 0
+
+class SessionHost:
+    """Runs many headless games in one event loop.
+
+    Each connection owns a session. A reader task queues commands and stops
+    reading while the inbox is full, which pushes back on the client. The
+    tick loop lets every session run at most moves_per_tick commands per
+    tick, so a flooding client cannot starve the others. Each command is
+    answered with a frame from frame_encoding, and timer-driven changes
+    (mine reveals) send frames of their own. A session whose client reads
+    too slowly drops its queued frames and gets a keyframe instead.
+    """
+
+    def __init__(self, address: str, metrics_address: Optional[str] = None, seed: Optional[int] = None,
+                 width: int = GRID_WIDTH, height: int = GRID_HEIGHT, tick_rate: int = TICK_RATE,
+                 moves_per_tick: int = MOVES_PER_TICK):
+        self.address = address
+        self.metrics_address = metrics_address
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.tick_interval = 1 / tick_rate if tick_rate > 0 else 0.0
+        self.moves_per_tick = moves_per_tick
+        self.sessions: Dict[int, Session] = {}
+        self.next_session_id = 1
+        self.started = time.perf_counter()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._clients: Set[asyncio.Task] = set()
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._tick_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start listening and ticking."""
+        set_audio_backend(NullAudioBackend())
+        self.started = time.perf_counter()
+        self._servers.append(await start_listener(self.address, self._handle_client))
+        if self.metrics_address:
+            self._servers.append(await start_listener(self.metrics_address, self._handle_metrics))
+        self._tick_task = asyncio.create_task(self._run_ticks())
+
+    async def stop(self) -> None:
+        """Stop listening, disconnect clients and stop ticking."""
+        for server in self._servers:
+            server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        if self._tick_task:
+            self._tick_task.cancel()
+            await asyncio.gather(self._tick_task, return_exceptions=True)
+
+    def new_state(self, seed: Optional[int] = None) -> GameState:
+        """Fresh game; sessions sharing a seed share its cached level templates."""
+        if seed is None:
+            seed = self.seed if self.seed is not None else new_seed()
+        state = create_level_state(1, self.width, self.height, seed)
+        state.cell_changes = []
+        return state
+
+    def metrics(self) -> Dict[str, object]:
+        """Host figures plus everything recorded through instrumentation."""
+        uptime = time.perf_counter() - self.started
+        return {
+            "sessions": len(self.sessions),
+            "uptime": uptime,
+            "moves_per_second": get_counter("host_moves") / uptime if uptime > 0 else 0.0,
+            **metrics_snapshot(),
+        }
+
+    def tick(self) -> int:
+        """Advance every session once, returning how many commands ran."""
+        handled = 0
+        for session in self.sessions.values():
+            handled += tick_session(self, session)
+        return handled
+
+    async def _run_ticks(self) -> None:
+        tracker = get_latency_tracker("host_tick")
+        next_tick = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            self.tick()
+            tracker.record(time.perf_counter() - started)
+            next_tick += self.tick_interval
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                next_tick = time.perf_counter()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = Session(self.next_session_id, self.new_state())
+        self.next_session_id += 1
+        self.sessions[session.session_id] = session
+        self._clients.add(asyncio.current_task())
+        self._writers.add(writer)
+        send_frame(session, encode_session(self, session))
+        sender = asyncio.create_task(write_frames(session, writer))
+        try:
+            while True:
+                command = await reader.readexactly(1)
+                if command in COMMAND_DIRECTIONS:
+                    await session.inbox.put((command, COMMAND_DIRECTIONS[command], time.perf_counter()))
+                elif command == NEW_GAME:
+                    await session.inbox.put((command, None, time.perf_counter()))
+                elif command == SEED:
+                    (seed,) = SEED_VALUE.unpack(await reader.readexactly(SEED_VALUE.size))
+                    await session.inbox.put((command, seed, time.perf_counter()))
+                else:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            del self.sessions[session.session_id]
+            self._clients.discard(asyncio.current_task())
+            self._writers.discard(writer)
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+            writer.close()
+
+    async def _handle_metrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await asyncio.wait_for(reader.readline(), 1.0)  # request line, if it is an HTTP client
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        body = json.dumps(self.metrics()).encode()
+        writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+def start_listener(address: str, handler):
+    """Listen on a Unix socket path or host:port."""
+    path, host, port = parse_address(address)
+    if path is not None:
+        return asyncio.start_unix_server(handler, path=path, backlog=LISTEN_BACKLOG)
+    return asyncio.start_server(handler, host, port, backlog=LISTEN_BACKLOG)
+
+def send_frame(session: Session, frame: Optional[bytes]) -> None:
+    """Queue a frame for the client; on overflow drop the backlog and resync with a keyframe."""
+    if frame is None:
+        return
+    try:
+        session.outbox.put_nowait(frame)
+        increment_counter("host_frames")
+    except asyncio.QueueFull:
+        while not session.outbox.empty():
+            session.outbox.get_nowait()
+            increment_counter("host_frames_dropped")
+        session.resync = True
+
+def encode_session(host: SessionHost, session: Session, always: bool = False) -> Optional[bytes]:
+    """Encode the session's changes since its last frame; a keyframe after a restart, new level or resync."""
+    state = session.state
+    if session.resync or state.grid is not session.grid:
+        frame = encode_frame(session.encoder, state, host.width, host.height, force_keyframe=True)
+        session.grid = state.grid
+        session.resync = False
+    else:
+        frame = encode_changes(session.encoder, state, state.cell_changes, host.width, host.height, always)
+    state.cell_changes.clear()
+    return frame
+
+def run_command(host: SessionHost, session: Session, command: Command) -> None:
+    """Apply one client command to its session."""
+    kind, argument, _ = command
+    if kind == NEW_GAME or kind == SEED:
+        session.state = host.new_state(argument if kind == SEED else None)
+        session.resync = True
+    elif not session.state.game_over:
+        try_player_move(session.state, argument, host.width, host.height)
+        session.moves += 1
+        increment_counter("host_moves")
+
+def tick_session(host: SessionHost, session: Session) -> int:
+    """Run timers and up to the per-tick budget of commands for one session."""
+    state = session.state
+    if state.explosion is not None or state.mine_reveal_timer > 0:
+        update_game_timers(state)
+        if state.mine_reveal_timer > 0:
+            return 0  # moves wait for the reveal to finish, as in the game
+    handled = 0
+    latency = get_latency_tracker("host_move_latency")
+    while handled < host.moves_per_tick and not session.inbox.empty():
+        command = session.inbox.get_nowait()
+        run_command(host, session, command)
+        handled += 1
+        send_frame(session, encode_session(host, session, always=True))
+        latency.record(time.perf_counter() - command[2])
+    if not handled:
+        send_frame(session, encode_session(host, session))
+    return handled
+
+async def write_frames(session: Session, writer: asyncio.StreamWriter) -> None:
+    """Send queued frames, waiting on drain() so a slow client fills its outbox instead of memory."""
+    try:
+        while True:
+            writer.write(await session.outbox.get())
+            await writer.drain()
+    except ConnectionError:
+        pass
+
+async def open_session(address: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a session host."""
+    path, host, port = parse_address(address)
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+def direction_command(direction: Direction) -> bytes:
+    """Command bytes for a move."""
+    return direction.name[0].encode()
+
+def seed_command(seed: int) -> bytes:
+    """Command bytes that start a new game on the given seed."""
+    return SEED + SEED_VALUE.pack(seed)
+
+async def serve(host: SessionHost) -> None:
+    """Run a host until cancelled."""
+    await host.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await host.stop()
+
+def main() -> None:
+    """Command line entry point for the session host."""
+    parser = argparse.ArgumentParser(description="Host many headless Mined-Out games.")
+    parser.add_argument("address", help="Unix socket path or host:port for game clients")
+    parser.add_argument("--metrics", default=None, help="Address serving JSON metrics")
+    parser.add_argument("--seed", type=int, default=None, help="Seed shared by every session")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="Ticks per second, 0 for unlimited")
+    parser.add_argument("--moves-per-tick", type=int, default=MOVES_PER_TICK, help="Command budget per session per tick")
+    args = parser.parse_args()
+    host = SessionHost(args.address, args.metrics, args.seed, tick_rate=args.tick_rate,
+                       moves_per_tick=args.moves_per_tick)
+    try:
+        asyncio.run(serve(host))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
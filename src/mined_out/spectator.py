@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import sys
+import threading
+from typing import List, Optional, Set, Tuple
+
+from mined_out.common import CELL_TYPES
+from mined_out.game_state import GameState
+from mined_out.frame_encoding import (
+    FrameEncoder, SpectatorView, FRAME_LENGTH, KEYFRAME, FLAG_GAME_OVER, FLAG_WON,
+    encode_frame, apply_frame, frame_kind
+)
+from mined_out.text_rendering import cell_char
+
+VIEWER_QUEUE_SIZE = 256
+SPECTATE_ENV = "MINED_OUT_SPECTATE"
+
+def parse_address(address: str) -> Tuple[Optional[str], str, int]:
+    """Split 'host:port' or ':port' into TCP parts; anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return None, host or "127.0.0.1", int(port)
+    return address, "", 0
+
+class SpectatorServer:
+    """Publishes encoded game frames to any number of local viewers.
+
+    The asyncio loop runs in a background thread so the game loop only pays
+    for encoding. Late joiners and viewers that fall behind are resynced
+    with the latest keyframe plus the deltas sent since.
+    """
+
+    def __init__(self, address: str, queue_size: int = VIEWER_QUEUE_SIZE):
+        self.address = address
+        self.queue_size = queue_size
+        self.encoder = FrameEncoder()
+        self.keyframe: Optional[bytes] = None
+        self.backlog: List[bytes] = []
+        self.viewers: Set[asyncio.Queue] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        """Start listening in a background thread."""
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        """Close the server and wait for its thread."""
+        if self.loop and self._thread:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+
+    def publish_state(self, state: GameState, width: int, height: int) -> None:
+        """Encode state and send it to viewers; cheap no-op when nothing changed."""
+        frame = encode_frame(self.encoder, state, width, height)
+        if frame is not None and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._broadcast, frame)
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._server = self.loop.run_until_complete(self._listen())
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.run_until_complete(self._server.wait_closed())
+            self.loop.close()
+
+    async def _listen(self) -> asyncio.AbstractServer:
+        path, host, port = parse_address(self.address)
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle_viewer, path=path)
+        return await asyncio.start_server(self._handle_viewer, host, port)
+
+    def _sync_frames(self) -> List[bytes]:
+        return [self.keyframe] + self.backlog if self.keyframe else []
+
+    def _broadcast(self, frame: bytes) -> None:
+        if frame_kind(frame) == KEYFRAME:
+            self.keyframe = frame
+            self.backlog = []
+        else:
+            self.backlog.append(frame)
+
+        for queue in self.viewers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                for sync_frame in self._sync_frames():
+                    queue.put_nowait(sync_frame)
+
+    async def _handle_viewer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        for frame in self._sync_frames():
+            queue.put_nowait(frame)
+        self.viewers.add(queue)
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.viewers.discard(queue)
+            writer.close()
+
+def start_spectator_server(address: str) -> SpectatorServer:
+    """Create and start a spectator server on the given address."""
+    server = SpectatorServer(address)
+    server.start()
+    return server
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one frame body from a spectator stream."""
+    (length,) = FRAME_LENGTH.unpack(await reader.readexactly(FRAME_LENGTH.size))
+    return await reader.readexactly(length)
+
+async def open_spectator_stream(address: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a spectator server."""
+    path, host, port = parse_address(address)
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+def render_view(view: SpectatorView, reveal_mines: bool = False) -> str:
+    """Render decoded view as text with a status line."""
+    lines = [
+        "".join(cell_char(CELL_TYPES[code], reveal_mines)
+                for code in view.codes[y * view.width:(y + 1) * view.width])
+        for y in range(view.height)
+    ]
+    status = f"Level {view.level}  Items {view.items_collected}/{view.total_items}  Mines nearby {view.mine_count_nearby}"
+    if view.flags & FLAG_GAME_OVER:
+        status += "  YOU WON!" if view.flags & FLAG_WON else "  GAME OVER"
+    return "\n".join(lines + [status])
+
+async def watch(address: str, reveal_mines: bool = False, out=sys.stdout) -> None:
+    """Print every frame received from a spectator server."""
+    reader, writer = await open_spectator_stream(address)
+    view = SpectatorView()
+    try:
+        while True:
+            if apply_frame(view, await read_frame(reader)):
+                out.write("\x1b[H\x1b[2J" + render_view(view, reveal_mines) + "\n")
+                out.flush()
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+def main() -> None:
+    """Command line viewer for a running game."""
+    parser = argparse.ArgumentParser(description="Watch a Mined-Out game from another process.")
+    parser.add_argument("address", help="Unix socket path or host:port of the spectator server")
+    parser.add_argument("--reveal-mines", action="store_true", help="Show hidden mines")
+    args = parser.parse_args()
+    try:
+        asyncio.run(watch(args.address, args.reveal_mines))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from mined_out.game_state import GameState
+
+STATS_ENV = "MINED_OUT_STATS"
+WRITE_BATCH_SIZE = 2000
+FLUSH_INTERVAL = 0.5
+BUSY_TIMEOUT_MS = 10000
+
+MINE_DEATH = "mine"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    seed INTEGER,
+    agent TEXT NOT NULL,
+    level_reached INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    won INTEGER NOT NULL,
+    cause_of_death TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_level ON runs (level_reached, won, moves);
+"""
+
+INSERT_RUN = """
+INSERT INTO runs (seed, agent, level_reached, moves, duration, won, cause_of_death, recorded_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+@dataclass(frozen=True)
+class RunResult:
+    seed: Optional[int]
+    agent: str
+    level_reached: int
+    moves: int
+    duration: float
+    won: bool
+    cause_of_death: Optional[str] = None
+
+@dataclass(frozen=True)
+class LevelDifficulty:
+    level: int
+    runs_reached: int
+    deaths: int
+    death_rate: float
+    avg_moves: float
+    avg_duration: float
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the stats database in WAL mode and make sure the schema exists."""
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+def cause_of_death(state: GameState) -> Optional[str]:
+    """Why a run was lost, or None if it was won or is still going."""
+    if not state.game_over or state.won:
+        return None
+    return MINE_DEATH  # explode_mine is the only way a game is lost
+
+def result_from_state(state: GameState, seed: Optional[int], agent: str, moves: int, duration: float) -> RunResult:
+    """Describe a finished run from its final state."""
+    return RunResult(
+        seed=seed,
+        agent=agent,
+        level_reached=state.level,
+        moves=moves,
+        duration=duration,
+        won=state.won,
+        cause_of_death=cause_of_death(state),
+    )
+
+def run_row(result: RunResult) -> tuple:
+    """Row values for INSERT_RUN."""
+    return (result.seed, result.agent, result.level_reached, result.moves,
+            result.duration, result.won, result.cause_of_death, time.time())
+
+class StatsStore:
+    """Collects run results and writes them in batches from a background thread.
+
+    record() only enqueues, so game loops and worker processes never wait on
+    disk. Each process should open its own store; WAL mode lets them write
+    to the same file. A batch that fails to write is reported on stderr and
+    counted in dropped rather than stopping the writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, batch_size: int = WRITE_BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending: queue.SimpleQueue = queue.SimpleQueue()
+        self.written = 0
+        self.dropped = 0
+        self.error: Optional[sqlite3.Error] = None
+        connect(path).close()
+        self._thread = threading.Thread(target=self._write_loop, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, result: RunResult) -> None:
+        """Queue one run result for writing."""
+        self.pending.put(result)
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer."""
+        self.pending.put(self._STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "StatsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_loop(self) -> None:
+        connection = connect(self.path)
+        try:
+            stopping = False
+            while not stopping:
+                try:
+                    item = self.pending.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = []
+                while True:
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    batch.append(run_row(item))
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self.pending.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write_batch(connection, batch)
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[tuple]) -> None:
+        """Insert one batch; a failed batch is counted and reported, and the writer keeps going."""
+        try:
+            with connection:
+                connection.executemany(INSERT_RUN, batch)
+        except sqlite3.Error as e:
+            self.dropped += len(batch)
+            self.error = e
+            print(f"stats: dropped {len(batch)} runs, could not write {self.path}: {e}", file=sys.stderr)
+        else:
+            self.written += len(batch)
+
+def best_runs_per_level(path: str, limit: int = 10) -> List[RunResult]:
+    """Get the fewest-move runs for every level reached, wins first."""
+    connection = connect(path)
+    try:
+        rows = connection.execute("""
+            SELECT seed, agent, level_reached, moves, duration, won, cause_of_death FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY level_reached ORDER BY won DESC, moves, duration
+                ) AS rank FROM runs
+            ) WHERE rank <= ? ORDER BY level_reached, rank
+        """, (limit,)).fetchall()
+    finally:
+        connection.close()
+    return [RunResult(seed, agent, level, moves, duration, bool(won), cause)
+            for seed, agent, level, moves, duration, won, cause in rows]
+
+def difficulty_stats(path: str, agent: Optional[str] = None) -> List[LevelDifficulty]:
+    """Get per-level death rates: deaths on a level over runs that reached it.
+
+    Only mine deaths count; runs that stalled or were left unfinished still
+    count as having reached their level.
+    """
+    connection = connect(path)
+    try:
+        rows = connection.execute("""
+            SELECT level_reached, COUNT(*), SUM(cause_of_death IS ?), AVG(moves), AVG(duration)
+            FROM runs WHERE ? IS NULL OR agent = ?
+            GROUP BY level_reached ORDER BY level_reached DESC
+        """, (MINE_DEATH, agent, agent)).fetchall()
+    finally:
+        connection.close()
+
+    stats, reached = [], 0
+    for level, runs, deaths, avg_moves, avg_duration in rows:
+        reached += runs
+        stats.append(LevelDifficulty(level, reached, deaths, deaths / reached, avg_moves, avg_duration))
+    return stats[::-1]
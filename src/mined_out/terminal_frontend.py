@@ -0,0 +1,167 @@
+import argparse
+import curses
+import time
+from typing import List, Optional, Tuple
+
+from mined_out.common import Direction
+from mined_out.constants import GRID_WIDTH, GRID_HEIGHT
+from mined_out.game_state import GameState
+from mined_out.agents import Agent, PlannerAgent, RandomAgent
+from mined_out.audio_operations import NullAudioBackend, set_audio_backend
+from mined_out.game_logic import update_game_timers
+from mined_out.grid_operations import count_adjacent_mines
+from mined_out.history import StateHistory, record_move, rewind, clear_history
+from mined_out.input_operations import (
+    InputQueue, push_direction, pop_direction_event, clear_input_queue, record_input_latency
+)
+from mined_out.level_generation import create_level_state
+from mined_out.rng import daily_seed
+from mined_out.text_rendering import render_grid_lines
+
+TERMINAL_FPS = 30
+HUD_WIDTH = 40
+
+KEY_DIRECTIONS = {
+    curses.KEY_UP: Direction.UP, ord("w"): Direction.UP,
+    curses.KEY_DOWN: Direction.DOWN, ord("s"): Direction.DOWN,
+    curses.KEY_LEFT: Direction.LEFT, ord("a"): Direction.LEFT,
+    curses.KEY_RIGHT: Direction.RIGHT, ord("d"): Direction.RIGHT,
+}
+KEY_QUIT = ord("q")
+KEY_RESTART = ord("r")
+KEY_UNDO = ord("u")
+
+def compose_frame(state: GameState) -> List[str]:
+    """Render state as equally wide text lines: grid first, HUD below."""
+    lines = render_grid_lines(state.grid)
+    lines.append(f"Level: {state.level}  Items: {state.items_collected}/{state.total_items}  "
+                 f"Mines nearby: {state.mine_count_nearby}")
+    if state.game_over:
+        lines.append("YOU WON! Press R to restart" if state.won else "GAME OVER - Press R to restart")
+    elif state.items_collected >= state.total_items:
+        lines.append("Find the exit!")
+    else:
+        lines.append("Collect all items!")
+    frame_width = max(HUD_WIDTH, max(len(line) for line in lines))
+    return [line.ljust(frame_width) for line in lines]
+
+def diff_frame(previous: Optional[List[str]], current: List[str]) -> List[Tuple[int, int, str]]:
+    """Get changed spans between frames as (row, column, text)."""
+    if previous is None or len(previous) != len(current) or len(previous[0]) != len(current[0]):
+        return [(y, 0, line) for y, line in enumerate(current)]
+
+    spans = []
+    for y, (old, new) in enumerate(zip(previous, current)):
+        if old == new:
+            continue
+        start = 0
+        while old[start] == new[start]:
+            start += 1
+        end = len(new)
+        while old[end - 1] == new[end - 1]:
+            end -= 1
+        spans.append((y, start, new[start:end]))
+    return spans
+
+class TerminalScreen:
+    """Curses window that only writes characters that changed since last frame."""
+
+    def __init__(self, window):
+        self.window = window
+        self.previous: Optional[List[str]] = None
+
+    def present(self, frame: List[str]) -> int:
+        """Write changed spans and refresh, returning how many spans were written."""
+        spans = diff_frame(self.previous, frame)
+        for y, x, text in spans:
+            try:
+                self.window.addstr(y, x, text)
+            except curses.error:
+                pass  # terminal smaller than the frame, or writing the last cell
+        self.previous = frame
+        if spans:
+            self.window.noutrefresh()
+            curses.doupdate()
+        return len(spans)
+
+def new_game_state(seed: Optional[int] = None) -> GameState:
+    """Create level 1 state the same way MinedOut does."""
+    state = create_level_state(1, GRID_WIDTH, GRID_HEIGHT, seed)
+    state.mine_count_nearby = count_adjacent_mines(state.grid, state.player_pos, GRID_WIDTH, GRID_HEIGHT)
+    return state
+
+def run_terminal(window, agent: Optional[Agent] = None, fps: int = TERMINAL_FPS, seed: Optional[int] = None) -> None:
+    """Play in a curses window, driven by the keyboard or by an agent."""
+    curses.curs_set(0)
+    window.nodelay(True)
+    window.keypad(True)
+    set_audio_backend(NullAudioBackend())
+
+    screen = TerminalScreen(window)
+    queue = InputQueue()
+    history = StateHistory()
+    state = new_game_state(seed)
+    tick_time = 1 / fps if fps > 0 else 0.0
+    next_tick = time.perf_counter()
+
+    while True:
+        key = window.getch()
+        while key != -1:
+            if key == KEY_QUIT:
+                return
+            if key == KEY_RESTART:
+                state = new_game_state(seed)
+                clear_input_queue(queue)
+                clear_history(history)
+            elif key == KEY_UNDO:
+                rewind(history, state)
+            elif key in KEY_DIRECTIONS:
+                push_direction(queue, KEY_DIRECTIONS[key], time.perf_counter())
+            key = window.getch()
+
+        update_game_timers(state)
+        if state.game_over:
+            clear_input_queue(queue)
+            if agent and state.explosion is None:
+                state = new_game_state(seed)
+                clear_history(history)
+        elif state.mine_reveal_timer == 0:
+            if agent:
+                direction = agent(state, GRID_WIDTH, GRID_HEIGHT)
+                if direction:
+                    record_move(history, state, direction, GRID_WIDTH, GRID_HEIGHT)
+            else:
+                event = pop_direction_event(queue)
+                if event:
+                    record_move(history, state, event.direction, GRID_WIDTH, GRID_HEIGHT)
+                    record_input_latency(event)
+
+        screen.present(compose_frame(state))
+
+        if tick_time:
+            next_tick += tick_time
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+def main() -> None:
+    """Command line entry point for the terminal front end."""
+    parser = argparse.ArgumentParser(description="Play Mined-Out in a terminal.")
+    parser.add_argument("--fps", type=int, default=TERMINAL_FPS, help="Ticks per second, 0 for unlimited")
+    parser.add_argument("--bot", action="store_true", help="Let a random agent play")
+    parser.add_argument("--autopilot", action="store_true", help="Let the path-planning agent play")
+    parser.add_argument("--seed", type=int, default=None, help="Game seed (levels and bot)")
+    parser.add_argument("--daily", action="store_true", help="Play today's daily challenge")
+    args = parser.parse_args()
+    seed = daily_seed() if args.daily else args.seed
+    agent = PlannerAgent() if args.autopilot else RandomAgent(seed) if args.bot else None
+    try:
+        curses.wrapper(run_terminal, agent, args.fps, seed)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from typing import Dict, List
+
+from mined_out.common import CellType
+
+CELL_CHARS: Dict[CellType, str] = {
+    CellType.EMPTY: ".",
+    CellType.WALL: "#",
+    CellType.MINE: ".",
+    CellType.PLAYER: "@",
+    CellType.ITEM: "$",
+    CellType.EXIT: "E",
+    CellType.REVEALED_MINE: "*",
+    CellType.VISITED: ",",
+}
+
+def cell_char(cell_type: CellType, reveal_mines: bool = False) -> str:
+    """Get terminal character for a cell, hiding mines unless asked not to."""
+    if reveal_mines and cell_type == CellType.MINE:
+        return "*"
+    return CELL_CHARS[cell_type]
+
+def render_grid_lines(grid: List[List[CellType]], reveal_mines: bool = False) -> List[str]:
+    """Render grid as one string per row."""
+    return ["".join(cell_char(cell, reveal_mines) for cell in row) for row in grid]
@@ -0,0 +1,265 @@
+import argparse
+import importlib
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from mined_out.common import MAX_LEVEL
+from mined_out.constants import GRID_WIDTH, GRID_HEIGHT
+from mined_out.game_state import GameState
+from mined_out.agents import Agent, PlannerAgent, RandomAgent
+from mined_out.audio_operations import NullAudioBackend, set_audio_backend
+from mined_out.fuzzing import settle_timers
+from mined_out.game_logic import try_player_move
+from mined_out.grid_operations import count_adjacent_mines
+from mined_out.level_generation import create_level_state
+from mined_out.save_state import pack_state, packed_size, unpack_state
+from mined_out.stats_store import RunResult, result_from_state
+
+MAX_MOVES = 2000
+SEEDS_PER_BATCH = 32
+Z_95 = 1.96
+
+PACK_MAGIC = b"MOLP"
+PACK_VERSION = 1
+# magic, version, width, height, levels per seed, seed count (followed by the seeds, then the records)
+PACK_HEADER = struct.Struct("<4sBBBBI")
+PACK_SEED = struct.Struct("<Q")
+
+# Builds a fresh agent for one game from the game's seed
+AgentFactory = Callable[[int], Agent]
+
+class LevelPack:
+    """Memory-mapped file of pre-generated levels in the save-state format.
+
+    Every worker maps the same file, so levels are generated once per
+    tournament and read in place; records all have the same size, so a
+    level is found by arithmetic rather than an index.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.levels, count = PACK_HEADER.unpack_from(self.buffer)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} level pack")
+        seeds_end = PACK_HEADER.size + count * PACK_SEED.size
+        self.seeds = [seed for (seed,) in PACK_SEED.iter_unpack(self.buffer[PACK_HEADER.size:seeds_end])]
+        self.seed_index = {seed: i for i, seed in enumerate(self.seeds)}
+        self.record_size = packed_size(self.width, self.height)
+        self.records_offset = seeds_end
+
+@dataclass(frozen=True)
+class AgentSummary:
+    """Tournament standings for one agent, with 95% confidence intervals."""
+    agent: str
+    games: int
+    wins: int
+    win_low: float
+    win_high: float
+    mean_level: float
+    level_margin: float
+    moves_per_second: float
+
+def write_level_pack(path: str, seeds: List[int], width: int = GRID_WIDTH, height: int = GRID_HEIGHT,
+                     levels: int = MAX_LEVEL) -> None:
+    """Generate every level of every seed into a pack file."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, width, height, levels, len(seeds)))
+        f.write(b"".join(PACK_SEED.pack(seed) for seed in seeds))
+        for seed in seeds:
+            for level in range(1, levels + 1):
+                f.write(pack_state(create_level_state(level, width, height, seed)))
+    os.replace(temp_path, path)
+
+def load_level(pack: LevelPack, level: int, width: int, height: int, seed: int) -> GameState:
+    """Fresh state for a level from the pack; a LevelLoader for try_player_move."""
+    offset = pack.records_offset + (pack.seed_index[seed] * pack.levels + level - 1) * pack.record_size
+    with memoryview(pack.buffer)[offset:offset + pack.record_size] as record:
+        return unpack_state(record)
+
+def random_agent(seed: int) -> Agent:
+    """Random walker seeded from the game."""
+    return RandomAgent(seed)
+
+def planner_agent(seed: int) -> Agent:
+    """Danger-weighted path planner; it ignores the seed."""
+    return PlannerAgent()
+
+BUILTIN_AGENTS: Dict[str, AgentFactory] = {"random": random_agent, "planner": planner_agent}
+
+def resolve_agent(spec: str) -> AgentFactory:
+    """Look up a built-in agent name or import a 'module:callable' factory."""
+    if spec in BUILTIN_AGENTS:
+        return BUILTIN_AGENTS[spec]
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"agent {spec!r} is neither built in nor 'module:callable'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+def play_game(agent_name: str, agent: Agent, pack: LevelPack, seed: int, max_moves: int = MAX_MOVES) -> RunResult:
+    """Play one seed to the end, a stall, or the move limit."""
+    width, height = pack.width, pack.height
+    state = load_level(pack, 1, width, height, seed)
+    state.mine_count_nearby = count_adjacent_mines(state.grid, state.player_pos, width, height)
+
+    def next_level(level: int, level_width: int, level_height: int, level_seed: int) -> GameState:
+        return load_level(pack, level, level_width, level_height, level_seed)
+
+    moves = 0
+    started = time.perf_counter()
+    while not state.game_over and moves < max_moves:
+        direction = agent(state, width, height)
+        if direction is None:
+            break
+        try_player_move(state, direction, width, height, next_level)
+        settle_timers(state)
+        moves += 1
+    result = result_from_state(state, seed, agent_name, moves, time.perf_counter() - started)
+    return result if state.game_over else replace(result, cause_of_death="stalled")
+
+_worker_pack: Optional[LevelPack] = None
+
+def open_worker_pack(path: str) -> None:
+    """Process pool initializer: map the pack once per worker."""
+    global _worker_pack
+    set_audio_backend(NullAudioBackend())
+    _worker_pack = LevelPack(path)
+
+def run_batch(agent_spec: str, seeds: List[int], max_moves: int) -> List[RunResult]:
+    """Play one agent on a batch of seeds in a worker."""
+    factory = resolve_agent(agent_spec)
+    return [play_game(agent_spec, factory(seed), _worker_pack, seed, max_moves) for seed in seeds]
+
+def load_checkpoint(path: str) -> List[RunResult]:
+    """Read results saved by an earlier run.
+
+    Reading stops at the first torn line, and the file is cut back to the
+    end of the last good one, so rows appended on resume start on a line
+    of their own instead of being glued to the fragment.
+    """
+    if not os.path.exists(path):
+        return []
+    results = []
+    with open(path, "r+b") as f:
+        end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                results.append(RunResult(**json.loads(line)))
+            except (ValueError, TypeError):
+                break
+            end += len(line)
+        f.truncate(end)
+    return results
+
+def pending_batches(agents: List[str], seeds: List[int], done: Set[Tuple[str, int]],
+                    batch_size: int = SEEDS_PER_BATCH) -> Iterator[Tuple[str, List[int]]]:
+    """(agent, seeds) batches of games not yet in the checkpoint."""
+    for agent in agents:
+        todo = [seed for seed in seeds if (agent, seed) not in done]
+        for start in range(0, len(todo), batch_size):
+            yield agent, todo[start:start + batch_size]
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> Tuple[float, float]:
+    """Wilson score interval for a success rate; stays inside [0, 1] even at 0 or n wins."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+def summarize(agent: str, results: List[RunResult]) -> AgentSummary:
+    """Win rate, mean level reached and speed for one agent's results."""
+    games = len(results)
+    wins = sum(result.won for result in results)
+    win_low, win_high = wilson_interval(wins, games)
+    levels = [result.level_reached for result in results]
+    mean_level = sum(levels) / games if games else 0.0
+    variance = sum((level - mean_level) ** 2 for level in levels) / (games - 1) if games > 1 else 0.0
+    duration = sum(result.duration for result in results)
+    moves = sum(result.moves for result in results)
+    return AgentSummary(agent, games, wins, win_low, win_high, mean_level,
+                        Z_95 * math.sqrt(variance / games) if games else 0.0,
+                        moves / duration if duration > 0 else 0.0)
+
+def run_tournament(agents: List[str], pack_path: str, checkpoint_path: Optional[str] = None,
+                   workers: Optional[int] = None, max_moves: int = MAX_MOVES) -> List[AgentSummary]:
+    """Play every agent on every seed in the pack and rank them.
+
+    Results are appended to the checkpoint as each batch finishes, so an
+    interrupted tournament picks up where it stopped.
+    """
+    seeds = LevelPack(pack_path).seeds
+    results = load_checkpoint(checkpoint_path) if checkpoint_path else []
+    done = {(result.agent, result.seed) for result in results}
+    batches = list(pending_batches(agents, seeds, done))
+    checkpoint = open(checkpoint_path, "a") if checkpoint_path else None
+    try:
+        def record(batch: List[RunResult]) -> None:
+            results.extend(batch)
+            if checkpoint:
+                checkpoint.write("".join(json.dumps(asdict(result)) + "\n" for result in batch))
+                checkpoint.flush()
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            open_worker_pack(pack_path)
+            for agent, batch_seeds in batches:
+                record(run_batch(agent, batch_seeds, max_moves))
+        else:
+            with ProcessPoolExecutor(workers, initializer=open_worker_pack, initargs=(pack_path,)) as pool:
+                futures = [pool.submit(run_batch, agent, batch_seeds, max_moves) for agent, batch_seeds in batches]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    seed_set = set(seeds)
+    return [summarize(agent, [r for r in results if r.agent == agent and r.seed in seed_set]) for agent in agents]
+
+def format_summary(summary: AgentSummary) -> str:
+    """One report line for an agent."""
+    return (f"{summary.agent:<24} {summary.games:>6} games  "
+            f"win {summary.wins / max(summary.games, 1):6.1%} [{summary.win_low:.1%}, {summary.win_high:.1%}]  "
+            f"level {summary.mean_level:.2f} ± {summary.level_margin:.2f}  "
+            f"{summary.moves_per_second:,.0f} moves/s")
+
+def main() -> None:
+    """Command line entry point for agent tournaments."""
+    parser = argparse.ArgumentParser(description="Play Mined-Out agents against each other on the same levels.")
+    parser.add_argument("agents", nargs="+", help="Built-in agent (random, planner) or 'module:callable' factory")
+    parser.add_argument("--seeds", type=int, default=1000, help="Number of seeds to play")
+    parser.add_argument("--first-seed", type=int, default=0, help="First seed")
+    parser.add_argument("--pack", default="tournament.pack", help="Level pack file, built if missing")
+    parser.add_argument("--checkpoint", default=None, help="JSONL file to resume from and append results to")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--max-moves", type=int, default=MAX_MOVES, help="Moves before a game counts as stalled")
+    args = parser.parse_args()
+
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    if not os.path.exists(args.pack) or LevelPack(args.pack).seeds != seeds:
+        write_level_pack(args.pack, seeds)
+    for agent in args.agents:
+        resolve_agent(agent)  # fail before starting workers
+
+    started = time.perf_counter()
+    summaries = run_tournament(args.agents, args.pack, args.checkpoint, args.workers, args.max_moves)
+    print(f"{len(args.agents)} agents x {len(seeds)} seeds in {time.perf_counter() - started:.1f}s")
+    for summary in sorted(summaries, key=lambda s: (s.wins / max(s.games, 1), s.mean_level), reverse=True):
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import zipfile
+from array import array
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from mined_out.common import CELL_CODES, CellType, Direction
+from mined_out.constants import GRID_WIDTH, GRID_HEIGHT
+from mined_out.game_state import GameState
+from mined_out.agents import Agent
+from mined_out.audio_operations import NullAudioBackend, set_audio_backend
+from mined_out.frame_encoding import grid_codes
+from mined_out.fuzzing import settle_timers
+from mined_out.game_logic import try_player_move
+from mined_out.grid_operations import count_adjacent_mines
+from mined_out.level_generation import create_level_state
+from mined_out.tournament import MAX_MOVES, resolve_agent
+
+WINDOW_RADIUS = 2  # 5x5 neighbourhood around the player
+CHUNK_TRANSITIONS = 65536
+QUEUE_CHUNKS = 8  # chunks in flight between producers and the writer
+
+ACTION_CODES = {direction: code for code, direction in enumerate(Direction)}
+
+STEP_REWARD = -0.01
+ITEM_REWARD = 1.0
+LEVEL_REWARD = 10.0
+DEATH_REWARD = -10.0
+
+# Hidden mines must not leak into observations; cells off the field read as walls
+HIDE_MINES = bytes.maketrans(bytes([CELL_CODES[CellType.MINE]]), bytes([CELL_CODES[CellType.EMPTY]]))
+WALL_CODE = bytes([CELL_CODES[CellType.WALL]])
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_ALIGNMENT = 64
+
+@dataclass(frozen=True)
+class Transition:
+    """One step: what the agent saw, what it did and what followed."""
+    window: bytes     # cell codes around the player, row by row, mines hidden
+    mine_count: int   # mine_count_nearby before the action
+    action: int       # Direction code, see ACTION_CODES
+    reward: float
+    done: bool
+    truncated: bool = False  # last step of an episode cut off before it ended
+
+@dataclass(frozen=True)
+class ProducerFailure:
+    """Sent in place of the sentinel when a producer crashes, so the writer can fail too."""
+    traceback: str
+
+class TransitionChunk:
+    """Column buffers for a run of transitions, written out as one .npz file."""
+
+    def __init__(self, radius: int = WINDOW_RADIUS):
+        self.radius = radius
+        self.count = 0
+        self.windows = bytearray()
+        self.mine_counts = bytearray()
+        self.actions = bytearray()
+        self.rewards = array("f")
+        self.dones = bytearray()
+        self.truncateds = bytearray()
+
+def append_transition(chunk: TransitionChunk, transition: Transition) -> None:
+    """Add one transition to the chunk's columns."""
+    chunk.windows += transition.window
+    chunk.mine_counts.append(transition.mine_count)
+    chunk.actions.append(transition.action)
+    chunk.rewards.append(transition.reward)
+    chunk.dones.append(transition.done)
+    chunk.truncateds.append(transition.truncated)
+    chunk.count += 1
+
+def observe(state: GameState, width: int, height: int, radius: int = WINDOW_RADIUS) -> bytes:
+    """Cell codes in the square around the player, with hidden mines shown as empty cells."""
+    codes = grid_codes(state.grid).translate(HIDE_MINES)
+    px, py = state.player_pos.x, state.player_pos.y
+    x0, x1 = px - radius, px + radius + 1
+    left, right = max(-x0, 0), max(x1 - width, 0)
+    wall_row = WALL_CODE * (2 * radius + 1)
+    rows = []
+    for y in range(py - radius, py + radius + 1):
+        if 0 <= y < height:
+            start = y * width
+            rows.append(WALL_CODE * left + codes[start + max(x0, 0):start + min(x1, width)] + WALL_CODE * right)
+        else:
+            rows.append(wall_row)
+    return b"".join(rows)
+
+def step_reward(before: Tuple[int, int], state: GameState) -> float:
+    """Reward for the step that turned (items, level) before into state."""
+    items, level = before
+    if state.game_over:
+        return LEVEL_REWARD if state.won else DEATH_REWARD
+    if state.level != level:
+        return LEVEL_REWARD
+    return STEP_REWARD + ITEM_REWARD * (state.items_collected - items)
+
+def play_transitions(agent: Agent, seed: int, width: int = GRID_WIDTH, height: int = GRID_HEIGHT,
+                     radius: int = WINDOW_RADIUS, max_moves: int = MAX_MOVES) -> Iterator[Transition]:
+    """Play one seed and yield its transitions, one step behind the game.
+
+    The last transition is done if the game ended, or truncated if the move
+    limit or a stalled agent cut the episode short; holding each transition
+    back a step is what lets a stall mark the one before it.
+    """
+    state = create_level_state(1, width, height, seed)
+    state.mine_count_nearby = count_adjacent_mines(state.grid, state.player_pos, width, height)
+    pending: Optional[Transition] = None
+    for _ in range(max_moves):
+        direction = agent(state, width, height)
+        if direction is None:
+            break
+        window, mine_count = observe(state, width, height, radius), state.mine_count_nearby
+        before = (state.items_collected, state.level)
+        try_player_move(state, direction, width, height)
+        settle_timers(state)
+        if pending:
+            yield pending
+        pending = Transition(window, mine_count, ACTION_CODES[direction], step_reward(before, state), state.game_over)
+        if state.game_over:
+            break
+    if pending:
+        yield pending if pending.done else replace(pending, truncated=True)
+
+def transition_chunks(agent_spec: str, seeds: Iterable[int], width: int = GRID_WIDTH, height: int = GRID_HEIGHT,
+                      radius: int = WINDOW_RADIUS, chunk_size: int = CHUNK_TRANSITIONS,
+                      max_moves: int = MAX_MOVES) -> Iterator[TransitionChunk]:
+    """Play every seed with a fresh agent and yield full chunks; only one chunk is held at a time."""
+    factory = resolve_agent(agent_spec)
+    chunk = TransitionChunk(radius)
+    for seed in seeds:
+        for transition in play_transitions(factory(seed), seed, width, height, radius, max_moves):
+            append_transition(chunk, transition)
+            if chunk.count >= chunk_size:
+                yield chunk
+                chunk = TransitionChunk(radius)
+    if chunk.count:
+        yield chunk
+
+def npy_header(descr: str, shape: Tuple[int, ...]) -> bytes:
+    """Version 1.0 .npy header for a C-ordered array."""
+    shape_text = f"({shape[0]},)" if len(shape) == 1 else f"({', '.join(map(str, shape))})"
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape_text}, }}"
+    padding = -(len(NPY_MAGIC) + 2 + len(header) + 1) % NPY_ALIGNMENT
+    header = header + " " * padding + "\n"
+    return NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+def chunk_arrays(chunk: TransitionChunk) -> List[Tuple[str, str, Tuple[int, ...], bytes]]:
+    """(name, dtype, shape, data) for every column of a chunk."""
+    side = 2 * chunk.radius + 1
+    rewards = chunk.rewards
+    if sys.byteorder == "big":
+        rewards = array("f", rewards)
+        rewards.byteswap()
+    return [
+        ("window", "|u1", (chunk.count, side, side), bytes(chunk.windows)),
+        ("mine_count", "|u1", (chunk.count,), bytes(chunk.mine_counts)),
+        ("action", "|u1", (chunk.count,), bytes(chunk.actions)),
+        ("reward", "<f4", (chunk.count,), rewards.tobytes()),
+        ("done", "|b1", (chunk.count,), bytes(chunk.dones)),
+        ("truncated", "|b1", (chunk.count,), bytes(chunk.truncateds)),
+    ]
+
+def write_npz(path: str, chunk: TransitionChunk, compress: bool = False) -> None:
+    """Write a chunk as an .npz file that numpy.load reads, using only the standard library."""
+    temp_path = path + ".tmp"
+    with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED) as archive:
+        for name, descr, shape, data in chunk_arrays(chunk):
+            with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                member.write(npy_header(descr, shape))
+                member.write(data)
+    os.replace(temp_path, path)
+
+def write_chunks(chunks: Iterable[TransitionChunk], out_dir: str, compress: bool = False) -> Tuple[int, int]:
+    """Write chunks to numbered files in arrival order, returning (files, transitions)."""
+    os.makedirs(out_dir, exist_ok=True)
+    files = transitions = 0
+    for chunk in chunks:
+        write_npz(os.path.join(out_dir, f"chunk-{files:06d}.npz"), chunk, compress)
+        files += 1
+        transitions += chunk.count
+    return files, transitions
+
+def produce_chunks(agent_spec: str, seeds: List[int], width: int, height: int, radius: int, chunk_size: int,
+                   max_moves: int, queue) -> None:
+    """Producer process: play seeds and hand full chunks to the writer, then a None sentinel.
+
+    A crash sends a ProducerFailure instead of the sentinel, so a partial
+    export is never reported as complete.
+    """
+    set_audio_backend(NullAudioBackend())
+    try:
+        for chunk in transition_chunks(agent_spec, seeds, width, height, radius, chunk_size, max_moves):
+            queue.put(chunk)
+    except Exception:
+        queue.put(ProducerFailure(traceback.format_exc()))
+        return
+    queue.put(None)
+
+def queued_chunks(queue, producers: int) -> Iterator[TransitionChunk]:
+    """Chunks from the queue until every producer has sent its sentinel; re-raises producer crashes."""
+    remaining = producers
+    while remaining:
+        chunk = queue.get()
+        if chunk is None:
+            remaining -= 1
+        elif isinstance(chunk, ProducerFailure):
+            raise RuntimeError(f"trajectory producer failed:\n{chunk.traceback}")
+        else:
+            yield chunk
+
+def export_trajectories(agent_spec: str, seeds: List[int], out_dir: str, workers: Optional[int] = None,
+                        width: int = GRID_WIDTH, height: int = GRID_HEIGHT, radius: int = WINDOW_RADIUS,
+                        chunk_size: int = CHUNK_TRANSITIONS, max_moves: int = MAX_MOVES,
+                        compress: bool = False) -> Tuple[int, int]:
+    """Export transitions for every seed, returning (files, transitions).
+
+    Producer processes each play a share of the seeds; the calling process
+    is the only writer. The queue holds at most QUEUE_CHUNKS chunks, so a
+    slow disk makes producers wait instead of filling memory. If a producer
+    crashes or a write fails, the remaining producers are terminated and
+    the error is raised.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        set_audio_backend(NullAudioBackend())
+        return write_chunks(transition_chunks(agent_spec, seeds, width, height, radius, chunk_size, max_moves),
+                            out_dir, compress)
+
+    queue = multiprocessing.Queue(QUEUE_CHUNKS)
+    producers = [multiprocessing.Process(target=produce_chunks, daemon=True,
+                                         args=(agent_spec, seeds[i::workers], width, height, radius,
+                                               chunk_size, max_moves, queue))
+                 for i in range(workers)]
+    for producer in producers:
+        producer.start()
+    try:
+        result = write_chunks(queued_chunks(queue, len(producers)), out_dir, compress)
+    except BaseException:
+        # Nobody drains the queue any more, so producers blocked in put() would never exit
+        for producer in producers:
+            producer.terminate()
+        for producer in producers:
+            producer.join()
+        raise
+    for producer in producers:
+        producer.join()
+    return result
+
+def main() -> None:
+    """Command line entry point for trajectory export."""
+    parser = argparse.ArgumentParser(description="Export Mined-Out play trajectories as chunked .npz files.")
+    parser.add_argument("out_dir", help="Directory for chunk files")
+    parser.add_argument("--agent", default="planner", help="Built-in agent (random, planner) or 'module:callable' factory")
+    parser.add_argument("--seeds", type=int, default=1000, help="Number of seeds to play")
+    parser.add_argument("--first-seed", type=int, default=0, help="First seed")
+    parser.add_argument("--workers", type=int, default=None, help="Producer processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_TRANSITIONS, help="Transitions per file")
+    parser.add_argument("--radius", type=int, default=WINDOW_RADIUS, help="Observation window radius")
+    parser.add_argument("--max-moves", type=int, default=MAX_MOVES, help="Moves before an episode is cut off")
+    parser.add_argument("--compress", action="store_true", help="Deflate arrays inside each file")
+    args = parser.parse_args()
+
+    resolve_agent(args.agent)  # fail before starting producers
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    started = time.perf_counter()
+    files, transitions = export_trajectories(args.agent, seeds, args.out_dir, args.workers,
+                                             radius=args.radius, chunk_size=args.chunk_size,
+                                             max_moves=args.max_moves, compress=args.compress)
+    elapsed = time.perf_counter() - started
+    print(f"{transitions} transitions in {files} files, {elapsed:.1f}s ({transitions / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
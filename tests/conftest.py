@@ -0,0 +1,40 @@
+from typing import Iterable, Tuple
+
+import pytest
+
+from mined_out.common import CellType, Position
+from mined_out.game_state import GameState
+from mined_out.grid_operations import count_adjacent_mines, create_empty_grid
+from mined_out.grid_utils import add_borders_to_grid
+
+Cell = Tuple[int, int]
+
+
+def build_state(width: int = 6, height: int = 6, player: Cell = (2, 3), exit: Cell = (4, 1),
+                items: Iterable[Cell] = ((2, 2),), mines: Iterable[Cell] = ()) -> GameState:
+    """Small bordered level whose state fields agree with its grid."""
+    grid = create_empty_grid(width, height)
+    add_borders_to_grid(grid, width, height)
+    items = list(items)
+    for x, y in mines:
+        grid[y][x] = CellType.MINE
+    for x, y in items:
+        grid[y][x] = CellType.ITEM
+    grid[exit[1]][exit[0]] = CellType.EXIT
+    grid[player[1]][player[0]] = CellType.PLAYER
+    player_pos = Position(*player)
+    return GameState(
+        player_pos=player_pos,
+        grid=grid,
+        items_collected=0,
+        total_items=len(items),
+        level=1,
+        exit_pos=Position(*exit),
+        mine_count_nearby=count_adjacent_mines(grid, player_pos, width, height)
+    )
+
+
+@pytest.fixture
+def make_state():
+    """Factory for hand-built levels; see build_state for the layout arguments."""
+    return build_state
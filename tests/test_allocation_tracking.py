@@ -0,0 +1,96 @@
+import pyxel
+import pytest
+
+from mined_out.allocation_tracking import (
+    AllocationTracker, assert_max_allocations, format_report, measure_allocations, track_frame
+)
+from mined_out.common import Position
+from mined_out.game_logic import update_game_timers
+from mined_out.grid_operations import count_adjacent_mines
+from mined_out.input_operations import InputQueue, poll_direction_events
+from mined_out.level_generation import create_level_state
+from mined_out.rendering_operations import draw_mine_indicator, draw_ui, mine_count_text
+
+
+def paired_key_loops(pairs=((0, (0, 0)),)):
+    for _, keys in pairs:
+        for _ in keys:
+            pass
+
+
+def nested_range_loops():
+    for _ in range(1):
+        for _ in range(1):
+            pass
+
+
+def loop_peak(loops):
+    """Peak bytes of a function doing nothing but the given loops: the cost of their iterators."""
+    loops()
+    return measure_allocations(loops).peak
+
+
+@pytest.fixture
+def headless_pyxel(monkeypatch):
+    for name in ("text", "circb", "rect", "rectb", "pset"):
+        monkeypatch.setattr(f"pyxel.{name}", lambda *args: None)
+    monkeypatch.setattr("pyxel.btnp", lambda *args: False)
+
+
+class TestMeasurement:
+    """Test allocation measurement helpers."""
+
+    def test_retained_allocations_are_counted(self):
+        kept = []
+        allocations = measure_allocations(lambda: kept.extend([object() for _ in range(50)]))
+        assert allocations.blocks >= 50
+        assert any("test_allocation_tracking.py" in line for line, _, _ in allocations.top)
+
+    def test_budget_failure_names_lines(self):
+        kept = []
+        with pytest.raises(AssertionError, match="budget 10"):
+            assert_max_allocations(lambda: kept.append([object() for _ in range(50)]), 10, warmup=0)
+
+    def test_temporaries_count_against_the_budget(self, headless_pyxel):
+        def formatted_hud(level):
+            pyxel.text(2, 2, f"Level: {level}", 7)
+
+        with pytest.raises(AssertionError, match="temporaries"):
+            assert_max_allocations(formatted_hud, 0, 2)
+        with pytest.raises(AssertionError, match="temporaries"):
+            assert_max_allocations(lambda: Position(1, 2), 0)
+
+    def test_call_that_allocates_nothing_measures_zero(self):
+        assert measure_allocations(lambda: None).peak == 0
+
+    def test_tracker_reports_per_label(self):
+        tracker = AllocationTracker(report_interval=0)
+        kept = []
+        for _ in range(3):
+            with track_frame(tracker, "update"):
+                kept.append(object())
+        assert tracker.frames["update"] == 3
+        assert format_report(tracker, "update").startswith("update:")
+
+
+class TestSteadyStateBudget:
+    """Steady-state frames must not allocate, beyond the iterators of their own loops."""
+
+    def test_draw_ui(self, headless_pyxel):
+        assert_max_allocations(draw_ui, 0, 2, 1, 3, 4, 120)
+
+    def test_draw_mine_indicator(self, headless_pyxel):
+        assert_max_allocations(draw_mine_indicator, 0, Position(5, 5), 3, 8, 160, 120)
+
+    def test_poll_input(self, headless_pyxel):
+        assert_max_allocations(poll_direction_events, 0, InputQueue(), max_peak=loop_peak(paired_key_loops))
+
+    def test_game_tick(self):
+        state = create_level_state(1, 20, 15, 4)
+        assert_max_allocations(update_game_timers, 0, state)
+        assert_max_allocations(count_adjacent_mines, 0, state.grid, state.player_pos, 20, 15,
+                               max_peak=loop_peak(nested_range_loops))
+
+    def test_mine_count_text(self):
+        assert mine_count_text(3) == "3"
+        assert mine_count_text(12) == "12"
@@ -0,0 +1,76 @@
+from mined_out.audio_operations import (
+    EXPLOSION, ITEM_COLLECT, SOUNDS, AudioMixer, NullAudioBackend, flush_sounds, queue_sound
+)
+
+
+class RecordingBackend:
+    """Backend that records plays; channels stay busy until finish() is called."""
+
+    silent = False
+
+    def __init__(self):
+        self.played = []
+        self.busy = set()
+        self.compiled = 0
+
+    def compile(self, sounds):
+        self.compiled += 1
+
+    def play(self, channel, sound):
+        self.played.append((channel, sound.slot))
+        self.busy.add(channel)
+
+    def is_playing(self, channel):
+        return channel in self.busy
+
+
+class TestAudioMixer:
+    """Test queuing, dedup and channel assignment."""
+
+    def test_duplicates_in_a_tick_play_once(self):
+        backend = RecordingBackend()
+        mixer = AudioMixer(backend)
+        for _ in range(5):
+            queue_sound(mixer, ITEM_COLLECT)
+        assert flush_sounds(mixer) == 1
+        assert backend.played == [(0, SOUNDS[ITEM_COLLECT].slot)]
+
+    def test_sounds_get_separate_channels(self):
+        backend = RecordingBackend()
+        mixer = AudioMixer(backend)
+        queue_sound(mixer, ITEM_COLLECT)
+        queue_sound(mixer, EXPLOSION)
+        flush_sounds(mixer)
+        assert backend.played == [(0, SOUNDS[EXPLOSION].slot), (1, SOUNDS[ITEM_COLLECT].slot)]
+
+    def test_higher_priority_preempts_when_channels_are_full(self):
+        backend = RecordingBackend()
+        mixer = AudioMixer(backend, channel_count=1)
+        queue_sound(mixer, ITEM_COLLECT)
+        flush_sounds(mixer)
+        queue_sound(mixer, EXPLOSION)
+        assert flush_sounds(mixer) == 1
+        assert backend.played[-1] == (0, SOUNDS[EXPLOSION].slot)
+
+    def test_lower_priority_is_dropped_when_channels_are_full(self):
+        backend = RecordingBackend()
+        mixer = AudioMixer(backend, channel_count=1)
+        queue_sound(mixer, EXPLOSION)
+        flush_sounds(mixer)
+        queue_sound(mixer, ITEM_COLLECT)
+        assert flush_sounds(mixer) == 0
+
+    def test_finished_channel_is_reused(self):
+        backend = RecordingBackend()
+        mixer = AudioMixer(backend, channel_count=1)
+        queue_sound(mixer, EXPLOSION)
+        flush_sounds(mixer)
+        backend.busy.clear()
+        queue_sound(mixer, ITEM_COLLECT)
+        assert flush_sounds(mixer) == 1
+
+    def test_null_backend_queues_nothing(self):
+        mixer = AudioMixer(NullAudioBackend())
+        queue_sound(mixer, EXPLOSION)
+        assert mixer.pending == []
+        assert flush_sounds(mixer) == 0
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from mined_out.common import Position
+from mined_out.entities import (
+    EntityKind, EntityStore, entities_at, entities_in_viewport, entities_near, entity_kind,
+    entity_position, is_alive, move_entity, remove_entity, spawn_entity
+)
+
+
+def brute_force_rect(store, entities, x0, y0, x1, y1):
+    return {e for e in entities
+            if x0 <= entity_position(store, e).x <= x1 and y0 <= entity_position(store, e).y <= y1}
+
+
+class TestEntityStore:
+    """Test spawning, moving and removing entities."""
+
+    def test_spawn_and_query(self):
+        store = EntityStore()
+        bug = spawn_entity(store, EntityKind.BUG, 5, 6)
+        assert entity_position(store, bug) == Position(5, 6)
+        assert entity_kind(store, bug) == EntityKind.BUG
+        assert entities_at(store, 5, 6) == [bug]
+        assert entities_at(store, 6, 6) == []
+
+    def test_move_across_chunks(self):
+        store = EntityStore()
+        bug = spawn_entity(store, EntityKind.BUG, 7, 7)
+        move_entity(store, bug, 8, 7)
+        assert entities_at(store, 7, 7) == []
+        assert entities_at(store, 8, 7) == [bug]
+        assert len(store.chunks) == 1
+
+    def test_remove_keeps_other_ids_valid(self):
+        store = EntityStore()
+        first = spawn_entity(store, EntityKind.SPREADER, 1, 1)
+        second = spawn_entity(store, EntityKind.BUG, 2, 2)
+        remove_entity(store, first)
+        assert not is_alive(store, first)
+        assert is_alive(store, second)
+        assert entity_position(store, second) == Position(2, 2)
+        assert store.count == 1
+        assert store.chunks[0] == {second}
+
+    def test_double_remove_raises_and_keeps_store_intact(self):
+        store = EntityStore()
+        first = spawn_entity(store, EntityKind.BUG, 1, 1)
+        second = spawn_entity(store, EntityKind.BUG, 2, 2)
+        remove_entity(store, first)
+        with pytest.raises(KeyError):
+            remove_entity(store, first)
+        assert store.count == 1
+        assert is_alive(store, second)
+        assert len({spawn_entity(store, EntityKind.BUG, 3, 3), spawn_entity(store, EntityKind.BUG, 4, 4), second}) == 3
+
+    def test_moving_dead_entity_raises(self):
+        store = EntityStore()
+        bug = spawn_entity(store, EntityKind.BUG, 1, 1)
+        other = spawn_entity(store, EntityKind.BUG, 5, 5)
+        remove_entity(store, bug)
+        with pytest.raises(KeyError):
+            move_entity(store, bug, 2, 2)
+        assert entity_position(store, other) == Position(5, 5)
+        with pytest.raises(KeyError):
+            entity_position(store, bug)
+
+    def test_full_store_refuses_spawn(self):
+        store = EntityStore(capacity=2)
+        spawn_entity(store, EntityKind.BUG, 0, 0)
+        spawn_entity(store, EntityKind.BUG, 0, 0)
+        assert spawn_entity(store, EntityKind.BUG, 0, 0) is None
+
+
+class TestSpatialQueries:
+    """Test neighbourhood and viewport queries against a brute-force scan."""
+
+    def test_queries_match_brute_force(self):
+        rng = random.Random(3)
+        store = EntityStore()
+        entities = [spawn_entity(store, EntityKind.BUG, rng.randrange(100), rng.randrange(80)) for _ in range(300)]
+        for _ in range(500):
+            entity = rng.choice(entities)
+            pos = entity_position(store, entity)
+            move_entity(store, entity, min(max(pos.x + rng.randint(-1, 1), 0), 99),
+                        min(max(pos.y + rng.randint(-1, 1), 0), 79))
+        for entity in entities[:50]:
+            remove_entity(store, entity)
+        live = entities[50:]
+
+        for x, y in [(0, 0), (50, 40), (99, 79), (8, 8)]:
+            assert set(entities_near(store, x, y, 2)) == brute_force_rect(store, live, x - 2, y - 2, x + 2, y + 2)
+        assert set(entities_in_viewport(store, 20, 10, 40, 30)) == brute_force_rect(store, live, 20, 10, 59, 39)
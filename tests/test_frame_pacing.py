@@ -0,0 +1,81 @@
+import pyxel
+
+from mined_out.frame_pacing import (
+    QUALITY_LEVELS, PacingController, current_quality, hud_due, record_draw_time
+)
+from mined_out.particle_system import ParticlePool, spawn_explosion
+from mined_out.rendering_operations import HudLayer, draw_explosion_sparks, refresh_hud
+
+BUDGET = 0.01
+
+
+def run_frames(controller, seconds, frames):
+    for _ in range(frames):
+        record_draw_time(controller, seconds)
+    return controller.level
+
+
+class TestPacingController:
+    """Test quality scaling with hysteresis."""
+
+    def test_starts_at_best_quality(self):
+        assert current_quality(PacingController(BUDGET)) == QUALITY_LEVELS[0]
+
+    def test_sustained_overrun_drops_one_level_at_a_time(self):
+        controller = PacingController(BUDGET, downgrade_frames=5)
+        assert run_frames(controller, BUDGET * 2, 5) == 1
+        assert run_frames(controller, BUDGET * 2, 5) == 2
+
+    def test_never_drops_below_lowest_level(self):
+        controller = PacingController(BUDGET, downgrade_frames=2)
+        assert run_frames(controller, BUDGET * 5, 100) == len(QUALITY_LEVELS) - 1
+
+    def test_single_spike_does_not_drop(self):
+        controller = PacingController(BUDGET, downgrade_frames=5)
+        run_frames(controller, BUDGET * 0.5, 20)
+        record_draw_time(controller, BUDGET * 3)
+        assert run_frames(controller, BUDGET * 0.5, 20) == 0
+
+    def test_cost_between_thresholds_holds_level(self):
+        controller = PacingController(BUDGET, downgrade_frames=5, upgrade_frames=5)
+        run_frames(controller, BUDGET * 2, 5)
+        assert run_frames(controller, BUDGET * 0.8, 200) == 1
+
+    def test_headroom_restores_quality(self):
+        controller = PacingController(BUDGET, downgrade_frames=5, upgrade_frames=20)
+        run_frames(controller, BUDGET * 2, 10)
+        assert controller.level == 2
+        assert run_frames(controller, BUDGET * 0.1, 60) == 0
+
+    def test_hud_interval(self):
+        controller = PacingController(BUDGET)
+        controller.level = 2
+        due = []
+        for _ in range(8):
+            record_draw_time(controller, 0.0)
+            due.append(hud_due(controller))
+        assert due.count(True) == 8 // QUALITY_LEVELS[2].hud_interval
+
+
+class TestScaledDrawing:
+    """Test drawing at reduced quality."""
+
+    def test_spark_stride_draws_fewer_sparks(self, monkeypatch):
+        drawn = []
+        monkeypatch.setattr("pyxel.pset", lambda x, y, color: drawn.append((x, y)))
+        pool = ParticlePool()
+        spawn_explosion(pool, 40, 40)
+        spawn_explosion(pool, 80, 40)
+        for i in range(pool.count):
+            pool.phase[i] = 0  # every spark visible this frame
+        draw_explosion_sparks(pool)
+        full = len(drawn)
+        drawn.clear()
+        draw_explosion_sparks(pool, 4)
+        assert len(drawn) == full // 4
+
+    def test_hud_layer_keeps_background_transparent(self):
+        layer = HudLayer(160, 120)
+        refresh_hud(layer, 1, 0, 3, 0)
+        assert layer.image.pget(2, 2) == 7
+        assert layer.image.pget(150, 60) == 0
@@ -0,0 +1,62 @@
+from mined_out.common import CellType, Position
+from mined_out.fuzzing import (
+    FuzzFailure, check_invariants, fuzz_batch, random_moves, replay, run_fuzz, shrink_moves
+)
+
+
+class TestInvariants:
+    """Test game-rule invariant checks."""
+
+    def test_valid_state_passes(self, make_state):
+        assert check_invariants(make_state(), 6, 6) is None
+
+    def test_second_player_cell_is_caught(self, make_state):
+        state = make_state()
+        state.grid[2][2] = CellType.PLAYER
+        assert "PLAYER" in check_invariants(state, 6, 6)
+
+    def test_escape_is_caught(self, make_state):
+        state = make_state()
+        state.player_pos = Position(0, 3)
+        assert "escaped" in check_invariants(state, 6, 6)
+
+    def test_too_many_items_is_caught(self, make_state):
+        state = make_state()
+        state.items_collected = 2
+        assert "items_collected" in check_invariants(state, 6, 6)
+
+    def test_stale_mine_count_is_caught(self, make_state):
+        state = make_state()
+        state.grid[2][3] = CellType.MINE
+        assert "mine_count_nearby" in check_invariants(state, 6, 6)
+
+    def test_erased_exit_is_caught(self, make_state):
+        state = make_state()
+        state.grid[1][4] = CellType.VISITED
+        assert "exit" in check_invariants(state, 6, 6)
+
+
+class TestFuzzHarness:
+    """Test fuzz runs, shrinking and replays."""
+
+    def test_random_moves_are_deterministic(self):
+        assert random_moves(7, 50) == random_moves(7, 50)
+        assert set(random_moves(7, 50)) <= set("UDLR")
+
+    def test_batch_finds_no_rule_violations(self):
+        steps, failures = fuzz_batch(0, 200, 200)
+        assert steps > 0
+        assert failures == []
+
+    def test_parallel_run_matches_serial(self):
+        assert run_fuzz(40, 100, workers=2) == run_fuzz(40, 100, workers=1)
+
+    def test_shrink_keeps_minimal_failing_sequence(self):
+        shrunk = shrink_moves("UUDLRRLUDDRU", lambda moves: "L" in moves and "D" in moves)
+        assert sorted(shrunk) == ["D", "L"]
+
+    def test_replay_of_passing_sequence(self):
+        assert replay("3:UDLR") is None
+
+    def test_failure_replay_string(self):
+        assert FuzzFailure(5, "UL", 2, "boom").replay() == "5:UL"
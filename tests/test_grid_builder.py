@@ -3,6 +3,7 @@ from typing import List
 from mined_out.common import CellType, Position
 from mined_out.grid_operations import is_valid_position, find_cell_position, count_cells_of_type, count_adjacent_mines, has_adjacent_mines, is_safe_player_position, get_random_interior_position, can_move_to_cell
 from mined_out.grid_utils import add_borders_to_grid
+from mined_out.rng import GameRng
 
 class TestGridBuilder():
     def test_add_borders_to_grid(self):
@@ -37,7 +38,7 @@ class TestGridBuilder():
         width, height = 5, 5
         grid = [[CellType.EMPTY for _ in range(width)] for _ in range(height)]
         level_num = 2
-        add_walls_to_grid(grid, level_num, width, height)
+        add_walls_to_grid(grid, level_num, width, height, GameRng(0))
         wall_cells = sum(row.count(CellType.WALL) for row in grid)
         self.assertGreater(wall_cells, 0)
 
@@ -2,6 +2,7 @@ import unittest
 from typing import List
 
 from mined_out.common import CellType, Position
+from mined_out.rng import GameRng
 from src.mined_out.grid_operations import (
     create_empty_grid,
     is_valid_position,
@@ -104,7 +105,7 @@ class TestGridOperations(unittest.TestCase):
 
     def test_get_random_interior_position(self):
         width, height = 5, 5
-        pos = get_random_interior_position(width, height)
+        pos = get_random_interior_position(width, height, GameRng(0))
         self.assertTrue(1 <= pos.x < width - 1)
         self.assertTrue(1 <= pos.y < height - 1)
 
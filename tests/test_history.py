@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from mined_out.common import CellType, Direction, Position
+from mined_out.game_state import GameState
+from mined_out.grid_operations import create_empty_grid
+from mined_out.grid_utils import add_borders_to_grid
+from mined_out.game_logic import update_game_timers
+from mined_out.history import StateHistory, record_move, rewind
+
+
+LAYOUT = dict(mines=[(3, 3)])
+
+
+@patch('pyxel.play')
+class TestStateHistory:
+    """Test delta-log undo."""
+
+    def test_move_records_only_changed_cells(self, mock_play, make_state):
+        state, history = make_state(**LAYOUT), StateHistory()
+
+        assert record_move(history, state, Direction.UP, 6, 6)
+
+        step = history.steps[-1]
+        assert len(step.changes) == 2
+        assert step.previous_grid is None
+
+    def test_blocked_move_is_not_recorded(self, mock_play, make_state):
+        state, history = make_state(**LAYOUT), StateHistory()
+        state.grid[3][1] = CellType.WALL
+
+        assert not record_move(history, state, Direction.LEFT, 6, 6)
+        assert not history.steps
+
+    def test_rewind_restores_grid_and_counters(self, mock_play, make_state):
+        state, history = make_state(**LAYOUT), StateHistory()
+        before = [row[:] for row in state.grid]
+
+        record_move(history, state, Direction.UP, 6, 6)
+        record_move(history, state, Direction.RIGHT, 6, 6)
+
+        assert rewind(history, state, 2) == 2
+        assert state.grid == before
+        assert state.player_pos == Position(2, 3)
+        assert state.items_collected == 0
+
+    def test_rewind_undoes_fatal_move(self, mock_play, make_state):
+        state, history = make_state(**LAYOUT), StateHistory()
+
+        record_move(history, state, Direction.RIGHT, 6, 6)
+        for _ in range(10):
+            update_game_timers(state)
+        assert state.game_over
+
+        rewind(history, state)
+
+        assert not state.game_over
+        assert state.explosion is None
+        assert state.mine_reveal_timer == 0
+        assert state.grid[3][3] == CellType.MINE
+
+    def test_history_length_is_bounded(self, mock_play, make_state):
+        state, history = make_state(**LAYOUT), StateHistory(max_steps=2)
+        for direction in (Direction.UP, Direction.DOWN, Direction.UP):
+            record_move(history, state, direction, 6, 6)
+
+        assert len(history.steps) == 2
+        assert rewind(history, state, 5) == 2
+
+    def test_rewind_across_level_advance(self, mock_play):
+        grid = create_empty_grid(20, 15)
+        add_borders_to_grid(grid, 20, 15)
+        grid[5][5] = CellType.PLAYER
+        grid[5][6] = CellType.EXIT
+        state = GameState(
+            player_pos=Position(5, 5),
+            grid=grid,
+            items_collected=0,
+            total_items=0,
+            level=1,
+            exit_pos=Position(6, 5)
+        )
+        history = StateHistory()
+
+        record_move(history, state, Direction.RIGHT, 20, 15)
+        assert state.level == 2
+        assert state.grid is not grid
+
+        rewind(history, state)
+
+        assert state.level == 1
+        assert state.grid is grid
+        assert state.grid[5][5] == CellType.PLAYER
+        assert state.grid[5][6] == CellType.EXIT
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pyxel
+
+from mined_out.common import Direction
+from mined_out.input_operations import (
+    InputQueue, push_direction, pop_direction_event, poll_direction_events,
+    clear_input_queue, record_input_latency
+)
+from mined_out.instrumentation import metrics_snapshot, reset_metrics, get_latency_tracker
+
+
+class TestInputQueue:
+    """Test buffered direction input."""
+
+    def setup_method(self):
+        reset_metrics()
+
+    def test_events_are_consumed_in_order(self):
+        queue = InputQueue()
+        push_direction(queue, Direction.UP, 1.0)
+        push_direction(queue, Direction.LEFT, 1.1)
+
+        assert pop_direction_event(queue).direction == Direction.UP
+        assert pop_direction_event(queue).direction == Direction.LEFT
+        assert pop_direction_event(queue) is None
+
+    def test_full_queue_rejects_and_counts_drops(self):
+        queue = InputQueue(capacity=2)
+        assert push_direction(queue, Direction.UP, 0.0)
+        assert push_direction(queue, Direction.UP, 0.0)
+        assert not push_direction(queue, Direction.DOWN, 0.0)
+
+        assert queue.dropped == 1
+        assert metrics_snapshot()["counters"]["input_dropped"] == 1
+        assert len(queue.events) == 2
+
+    def test_poll_records_every_pressed_direction(self):
+        queue = InputQueue()
+        pressed = {pyxel.KEY_UP, pyxel.KEY_D}
+        with patch('mined_out.input_operations.pyxel.btnp', side_effect=lambda key: key in pressed):
+            assert poll_direction_events(queue) == 2
+
+        assert [e.direction for e in queue.events] == [Direction.UP, Direction.RIGHT]
+
+    def test_clear_input_queue(self):
+        queue = InputQueue()
+        push_direction(queue, Direction.UP, 0.0)
+        clear_input_queue(queue)
+        assert pop_direction_event(queue) is None
+
+    def test_latency_is_exposed_through_metrics(self):
+        queue = InputQueue()
+        with patch('mined_out.input_operations.pyxel.btnp', side_effect=lambda key: key == pyxel.KEY_S):
+            poll_direction_events(queue)
+
+        latency = record_input_latency(pop_direction_event(queue))
+
+        assert latency >= 0
+        assert get_latency_tracker("input_latency").count == 1
+        assert metrics_snapshot()["input_latency"]["max"] == latency
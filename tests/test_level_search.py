@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from mined_out.common import CellType, Direction, Position
+from mined_out.game_logic import try_player_move
+from mined_out.grid_operations import create_empty_grid
+from mined_out.grid_utils import add_borders_to_grid
+from mined_out.level_generation import create_level_state
+from mined_out.level_search import (
+    SEARCH_BUDGET, LevelMetrics, LevelTargets, create_targeted_level_state, measure_level, parse_targets,
+    search_level, target_miss, targeted_level_loader
+)
+
+
+def corridor_grid():
+    grid = create_empty_grid(7, 5)
+    add_borders_to_grid(grid, 7, 5)
+    grid[2][1] = CellType.PLAYER
+    grid[2][5] = CellType.EXIT
+    grid[1][3] = CellType.MINE
+    grid[2][2] = CellType.ITEM
+    grid[3][3] = CellType.ITEM
+    return grid
+
+
+class TestMeasureLevel:
+    """Test path metrics on hand-built grids."""
+
+    def test_metrics_of_corridor(self):
+        metrics = measure_level(corridor_grid(), 7)
+        # the straight route passes the mine, the detour along the bottom row does not
+        assert metrics == LevelMetrics(path_length=4, max_danger=0, items_off_route=1)
+
+    def test_forced_danger_when_detour_is_blocked(self):
+        grid = corridor_grid()
+        grid[3][2] = CellType.WALL
+        assert measure_level(grid, 7).max_danger == 1
+
+    def test_unreachable_exit_is_unsolvable(self):
+        grid = corridor_grid()
+        for y in (2, 3):
+            grid[y][4] = CellType.WALL
+        grid[1][4] = CellType.MINE
+        assert measure_level(grid, 7) is None
+
+    def test_unreachable_item_is_unsolvable(self):
+        grid = corridor_grid()
+        grid[1][3] = CellType.EMPTY
+        grid[2][3] = CellType.WALL
+        grid[3][2] = CellType.MINE
+        grid[3][4] = CellType.MINE
+        assert measure_level(grid, 7) is None
+
+    def test_target_miss_measures_distance_outside_ranges(self):
+        metrics = LevelMetrics(path_length=10, max_danger=3, items_off_route=2)
+        assert target_miss(metrics, LevelTargets()) == 0
+        assert target_miss(metrics, LevelTargets(path_length=(12, 20), max_danger=(0, 1))) == 4
+
+
+class TestSearchLevel:
+    """Test searching candidate layouts for target metrics."""
+
+    def test_search_hits_targets(self):
+        targets = LevelTargets(path_length=(20, 40), max_danger=(1, 1))
+        result = search_level(3, 11, targets, 20, 15)
+        assert result.matched
+        assert target_miss(result.metrics, targets) == 0
+
+    def test_targeted_level_measures_as_searched(self):
+        targets = LevelTargets(path_length=(20, 40), max_danger=(1, 1))
+        state = create_targeted_level_state(3, 20, 15, targets, seed=11)
+        assert measure_level(state.grid, 20) == search_level(3, 11, targets, 20, 15).metrics
+        assert state.seed == 11
+
+    def test_search_results_are_cached(self):
+        search_level.cache_clear()
+        targets = LevelTargets(max_danger=(0, 0))
+        first = search_level(2, 5, targets, 20, 15)
+        assert search_level(2, 5, targets, 20, 15) is first
+        assert search_level.cache_info().hits == 1
+
+    def test_first_candidate_is_the_plain_level(self):
+        result = search_level(1, 3, LevelTargets(), 20, 15)
+        if measure_level(create_level_state(1, 20, 15, 3).grid, 20) is not None:
+            assert result.candidate == 0
+
+    def test_impossible_targets_fall_back_to_closest(self):
+        result = search_level(1, 3, LevelTargets(path_length=(500, 600)), 20, 15, max_candidates=16, budget=None)
+        assert not result.matched
+        assert result.searched == 16
+        assert result.metrics is not None
+
+    def test_search_stops_at_time_budget(self):
+        result = search_level(1, 3, LevelTargets(path_length=(500, 600)), 20, 15, budget=0.0)
+        assert not result.matched
+        assert result.searched == 1
+        assert result.candidate == 0
+
+    def test_worst_case_search_fits_budget(self):
+        search_level.cache_clear()
+        start = time.perf_counter()
+        result = search_level(5, 7, LevelTargets(path_length=(500, 600)), 20, 15)
+        assert time.perf_counter() - start < SEARCH_BUDGET + 0.05
+        assert not result.matched
+
+    def test_loader_targets_later_levels(self):
+        targets = LevelTargets(path_length=(20, 40), max_danger=(1, 1))
+        state = create_targeted_level_state(1, 20, 15, targets, seed=11)
+        exit_pos = state.exit_pos
+        state.grid[state.player_pos.y][state.player_pos.x] = CellType.EMPTY
+        state.player_pos = Position(exit_pos.x - 1, exit_pos.y)
+        state.grid[exit_pos.y][exit_pos.x - 1] = CellType.PLAYER
+        state.items_collected = state.total_items
+
+        try_player_move(state, Direction.RIGHT, 20, 15, targeted_level_loader(targets))
+
+        assert state.level == 2
+        assert measure_level(state.grid, 20) == search_level(2, 11, targets, 20, 15).metrics
+
+
+class TestParseTargets:
+    """Test reading level targets from text."""
+
+    def test_parses_ranges(self):
+        targets = parse_targets("path_length=20-40, max_danger=1-2")
+        assert targets == LevelTargets(path_length=(20, 40), max_danger=(1, 2))
+
+    @pytest.mark.parametrize("text", ["path_length=20", "speed=1-2", "max_danger=a-b"])
+    def test_rejects_bad_ranges(self, text):
+        with pytest.raises(ValueError):
+            parse_targets(text)
@@ -0,0 +1,153 @@
+import pytest
+
+from mined_out.common import CellType, Position
+from mined_out.game_state import GameState
+from mined_out.grid_operations import create_empty_grid
+from mined_out.grid_utils import add_borders_to_grid
+from mined_out.mine_probability import (
+    MAX_COMPONENT_CELLS, MineHints, collect_constraints, mine_probabilities, propagate_constraints,
+    solve_component, solve_probabilities, split_components
+)
+
+
+def make_grid(width=7, height=5):
+    grid = create_empty_grid(width, height)
+    add_borders_to_grid(grid, width, height)
+    return grid
+
+
+class TestConstraints:
+    """Test reading player knowledge from the grid."""
+
+    def test_only_trail_cells_give_constraints(self):
+        grid = make_grid()
+        grid[2][1] = CellType.PLAYER
+        grid[1][2] = CellType.MINE
+
+        constraints, unknown, revealed = collect_constraints(grid, 7, 5)
+
+        assert constraints == [(1, (8, 9, 16, 22, 23))]
+        assert len(unknown) == 14
+        assert revealed == 0
+
+    def test_constraints_sharing_cells_form_one_component(self):
+        constraints = [(1, (1, 2)), (1, (2, 3)), (0, (7, 8))]
+        components = split_components(constraints)
+        assert sorted(cells for cells, _ in components) == [(1, 2, 3), (7, 8)]
+
+
+class TestMineProbabilities:
+    """Test exact per-cell probabilities."""
+
+    def test_zero_count_clears_neighbours(self):
+        grid = make_grid()
+        grid[2][1] = CellType.PLAYER
+        grid[3][5] = CellType.MINE
+
+        probabilities = mine_probabilities(grid, 1, 7, 5)
+
+        for index in (8, 9, 16, 22, 23):
+            assert probabilities[index] == 0.0
+
+    def test_single_candidate_is_certain_mine(self):
+        grid = make_grid()
+        grid[2][1] = CellType.PLAYER
+        grid[1][1] = CellType.VISITED
+        grid[3][1] = CellType.VISITED
+        grid[1][2] = CellType.WALL
+        grid[2][2] = CellType.WALL
+        grid[3][2] = CellType.MINE
+
+        probabilities = mine_probabilities(grid, 1, 7, 5)
+
+        assert probabilities[3 * 7 + 2] == 1.0
+        assert all(p == 0.0 for index, p in probabilities.items() if index != 3 * 7 + 2)
+
+    def test_unconstrained_cells_share_remaining_mines(self):
+        grid = make_grid()
+        grid[1][1] = CellType.PLAYER
+
+        probabilities = mine_probabilities(grid, 3, 7, 5)
+
+        for index in (9, 15, 16):
+            assert probabilities[index] == 0.0
+        others = [p for index, p in probabilities.items() if index not in (9, 15, 16)]
+        assert others == pytest.approx([3 / 11] * 11)
+
+    def test_probabilities_sum_to_mine_total(self):
+        grid = make_grid(9, 7)
+        grid[5][1] = CellType.VISITED
+        grid[4][1] = CellType.VISITED
+        grid[4][2] = CellType.PLAYER
+        for x, y in ((3, 3), (1, 2), (6, 5), (7, 1)):
+            grid[y][x] = CellType.MINE
+
+        probabilities = mine_probabilities(grid, 4, 9, 7)
+
+        assert sum(probabilities.values()) == pytest.approx(4)
+
+    def test_component_solutions_are_cached(self):
+        solve_component.cache_clear()
+        grid = make_grid()
+        grid[2][1] = CellType.PLAYER
+        grid[1][2] = CellType.MINE
+
+        mine_probabilities(grid, 1, 7, 5)
+        mine_probabilities(grid, 1, 7, 5)
+
+        assert solve_component.cache_info().hits == 1
+
+    def test_forced_cells_are_settled_before_enumeration(self):
+        constraints = [(0, (1, 2)), (1, (2, 3)), (2, (4, 5)), (1, (5, 6, 7))]
+        remaining, known = propagate_constraints(constraints)
+        assert known == {1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 0, 7: 0}
+        assert remaining == []
+
+    def test_component_over_cap_is_estimated_and_marked(self):
+        width, height = 62, 5
+        grid = make_grid(width, height)
+        for x in range(1, width - 1):
+            grid[2][x] = CellType.VISITED
+        grid[2][1] = CellType.PLAYER
+        for x in range(2, 48, 3):
+            grid[1][x] = CellType.MINE
+        mines = sum(row.count(CellType.MINE) for row in grid)
+
+        constraints, _, _ = collect_constraints(grid, width, height)
+        remaining, known = propagate_constraints(constraints)
+        assert max(len(cells) for cells, _ in split_components(remaining)) > MAX_COMPONENT_CELLS
+
+        probabilities, approximate = solve_probabilities(grid, mines, width, height)
+
+        cleared = [y * width + x for y in (1, 3) for x in range(50, width - 1)]
+        for index in cleared:
+            assert probabilities[index] == 0.0
+            assert index not in approximate
+        assert approximate
+        assert all(0.0 <= p <= 1.0 for p in probabilities.values())
+        assert all(probabilities[index] == known[index] for index in known)
+
+
+class TestMineHints:
+    """Test recomputation only after state changes."""
+
+    def test_update_reuses_result_until_player_moves(self):
+        grid = make_grid()
+        grid[2][1] = CellType.PLAYER
+        state = GameState(
+            player_pos=Position(1, 2),
+            grid=grid,
+            items_collected=0,
+            total_items=0,
+            level=1,
+            exit_pos=Position(5, 1)
+        )
+        hints = MineHints()
+
+        first = hints.update(state, 7, 5)
+        assert hints.update(state, 7, 5) is first
+
+        grid[2][1] = CellType.VISITED
+        grid[2][2] = CellType.PLAYER
+        state.player_pos = Position(2, 2)
+        assert hints.update(state, 7, 5) is not first
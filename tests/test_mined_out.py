@@ -8,11 +8,12 @@ from mined_out.grid_operations import (
 )
 from mined_out.grid_builder import (
     calculate_mine_count, calculate_item_count,
-    place_random_cells
+    place_random_cells, place_player_safely, collect_free_cells, PlacementError
 )
 from mined_out.grid_utils import add_borders_to_grid
 
 from mined_out.level_generation import create_level_state
+from mined_out.rng import GameRng
 from mined_out.game_logic import (
     can_exit_level, should_advance_level, should_win_game,
     move_position
@@ -196,16 +197,58 @@ class TestGridBuilder:
         grid = create_empty_grid(5, 5)
         add_borders_to_grid(grid, 5, 5)
 
-        # Mock random to always return valid interior positions
-        with patch('mined_out.grid_builder.random.randint') as mock_randint:
-            mock_randint.side_effect = [2, 2, 1, 1, 3, 3]  # x, y pairs
-
-            placed = place_random_cells(grid, CellType.MINE, 3, 5, 5)
+        placed = place_random_cells(grid, CellType.MINE, 3, 5, 5, GameRng(0))
 
         assert placed == 3
-        assert grid[2][2] == CellType.MINE
-        assert grid[1][1] == CellType.MINE
-        assert grid[3][3] == CellType.MINE
+        assert count_cells_of_type(grid, CellType.MINE) == 3
+        assert all(grid[0][x] == CellType.WALL for x in range(5))
+
+    def test_place_random_cells_fills_interior_exactly(self):
+        grid = create_empty_grid(5, 5)
+        add_borders_to_grid(grid, 5, 5)
+
+        place_random_cells(grid, CellType.ITEM, 9, 5, 5, GameRng(0))
+
+        assert count_cells_of_type(grid, CellType.ITEM) == 9
+
+    def test_place_random_cells_too_many_raises(self):
+        grid = create_empty_grid(5, 5)
+        add_borders_to_grid(grid, 5, 5)
+
+        with pytest.raises(PlacementError):
+            place_random_cells(grid, CellType.MINE, 10, 5, 5, GameRng(0))
+
+    def test_shared_free_cell_pool_never_overlaps(self):
+        grid = create_empty_grid(6, 6)
+        add_borders_to_grid(grid, 6, 6)
+        free_cells = collect_free_cells(grid, 6, 6)
+        rng = GameRng(0)
+
+        place_random_cells(grid, CellType.MINE, 8, 6, 6, rng, free_cells)
+        place_random_cells(grid, CellType.ITEM, 7, 6, 6, rng, free_cells)
+        place_player_safely(grid, 6, 6, rng, free_cells)
+
+        assert count_cells_of_type(grid, CellType.MINE) == 8
+        assert count_cells_of_type(grid, CellType.ITEM) == 7
+        assert count_cells_of_type(grid, CellType.EMPTY) == 0
+
+    def test_place_player_safely_honours_safety(self):
+        grid = create_empty_grid(7, 5)
+        add_borders_to_grid(grid, 7, 5)
+        grid[2][2] = CellType.MINE
+
+        pos = place_player_safely(grid, 7, 5, GameRng(0), require_safe=True)
+
+        assert pos.x >= 4
+        assert not has_adjacent_mines(grid, pos, 7, 5)
+
+    def test_place_player_safely_without_safe_cell_raises(self):
+        grid = create_empty_grid(5, 5)
+        add_borders_to_grid(grid, 5, 5)
+        grid[2][2] = CellType.MINE
+
+        with pytest.raises(PlacementError):
+            place_player_safely(grid, 5, 5, GameRng(0), require_safe=True)
 
 
 class TestGameLogic:
@@ -0,0 +1,62 @@
+import pytest
+
+from mined_out.particle_system import (
+    ParticlePool, SPARK_COUNT, SPARK_DIRECTIONS, SPARK_LIFETIME,
+    spawn_explosion, spawn_particle, update_particles, clear_particles
+)
+
+
+class TestParticlePool:
+    """Test pooled particle storage."""
+
+    def test_spark_directions_are_unit_vectors(self):
+        assert len(SPARK_DIRECTIONS) == SPARK_COUNT
+        for dx, dy in SPARK_DIRECTIONS:
+            assert dx * dx + dy * dy == pytest.approx(1.0)
+
+    def test_spawn_explosion_fills_pool(self):
+        pool = ParticlePool(64)
+        assert spawn_explosion(pool, 10, 10) == SPARK_COUNT
+        assert pool.count == SPARK_COUNT
+
+    def test_many_simultaneous_explosions(self):
+        pool = ParticlePool(64)
+        for i in range(5):
+            spawn_explosion(pool, i * 8, 20)
+        assert pool.count == 5 * SPARK_COUNT
+
+    def test_spawn_stops_when_pool_full(self):
+        pool = ParticlePool(10)
+        assert spawn_explosion(pool, 0, 0) == SPARK_COUNT
+        assert spawn_explosion(pool, 0, 0) == 2
+        assert not spawn_particle(pool, 0, 0, 0, 0, 5, 0)
+        assert pool.count == 10
+
+    def test_update_moves_particles(self):
+        pool = ParticlePool(4)
+        spawn_particle(pool, 1.0, 2.0, 0.5, -0.5, 10, 0)
+        update_particles(pool)
+        assert pool.x[0] == pytest.approx(1.5)
+        assert pool.y[0] == pytest.approx(1.5)
+        assert pool.age[0] == 1
+
+    def test_expired_particles_are_swap_removed(self):
+        pool = ParticlePool(4)
+        spawn_particle(pool, 0, 0, 0, 0, 1, 0)
+        spawn_particle(pool, 5, 5, 0, 0, 10, 0)
+        update_particles(pool)
+        assert pool.count == 1
+        assert pool.x[0] == pytest.approx(5.0)
+
+    def test_explosion_burns_out_after_lifetime(self):
+        pool = ParticlePool(64)
+        spawn_explosion(pool, 10, 10)
+        for _ in range(SPARK_LIFETIME):
+            update_particles(pool)
+        assert pool.count == 0
+
+    def test_clear_particles(self):
+        pool = ParticlePool(16)
+        spawn_explosion(pool, 0, 0)
+        clear_particles(pool)
+        assert pool.count == 0
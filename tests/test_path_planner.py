@@ -0,0 +1,204 @@
+from unittest.mock import patch
+
+from mined_out.agents import PlannerAgent
+from mined_out.common import CellType, Direction, Position
+from mined_out.game_logic import try_player_move
+from mined_out.game_state import GameState
+from mined_out.grid_operations import create_empty_grid
+from mined_out.grid_utils import add_borders_to_grid
+from mined_out.level_generation import create_level_state
+from mined_out.path_planner import (
+    PathPlanner, apply_cell_changes, next_direction, planned_path, replan, set_goals, set_risk, update_cells,
+    move_start
+)
+from mined_out.rng import GameRng
+
+
+def make_grid(width=9, height=7):
+    grid = create_empty_grid(width, height)
+    add_borders_to_grid(grid, width, height)
+    return grid
+
+
+def plan_cost(planner):
+    replan(planner)
+    return planner.g[planner.start]
+
+
+class TestPlanning:
+    """Test danger-weighted shortest paths."""
+
+    def test_open_grid_path_is_manhattan(self):
+        planner = PathPlanner(make_grid(), 9, 7, Position(1, 1), [Position(7, 5)])
+        replan(planner)
+        path = planned_path(planner)
+        assert len(path) == 10
+        assert path[-1] == Position(7, 5)
+
+    def test_danger_weight_trades_distance_for_safety(self):
+        grid = make_grid(9, 5)
+        grid[1][4] = CellType.MINE
+        start, goal = Position(1, 2), Position(7, 2)
+
+        careless = PathPlanner(grid, 9, 5, start, [goal], danger_weight=0.0)
+        replan(careless)
+        assert all(pos.y == 2 for pos in planned_path(careless))
+
+        careful = PathPlanner(grid, 9, 5, start, [goal], danger_weight=5.0)
+        replan(careful)
+        assert any(pos.y == 3 for pos in planned_path(careful))
+
+    def test_heads_for_nearest_goal(self):
+        planner = PathPlanner(make_grid(), 9, 7, Position(2, 3), [Position(7, 3), Position(1, 3)])
+        replan(planner)
+        assert next_direction(planner) == Direction.LEFT
+
+    def test_cut_off_goal_has_no_direction(self):
+        grid = make_grid()
+        for y in range(1, 6):
+            grid[y][4] = CellType.WALL
+        planner = PathPlanner(grid, 9, 7, Position(1, 1), [Position(7, 5)])
+        replan(planner)
+        assert next_direction(planner) is None
+        assert planned_path(planner) == []
+
+
+class TestReplanning:
+    """Test incremental updates against planning from scratch."""
+
+    def test_incremental_costs_match_fresh_search(self):
+        width, height = 20, 15
+        grid = make_grid(width, height)
+        goals = [Position(18, 13), Position(10, 2)]
+        planner = PathPlanner(grid, width, height, Position(1, 1), goals)
+        replan(planner)
+        rng = GameRng(5)
+        for _ in range(40):
+            pos = Position(rng.randrange(2, width - 1), rng.randrange(2, height - 1))
+            if pos in goals:
+                continue
+            grid[pos.y][pos.x] = CellType.MINE if grid[pos.y][pos.x] == CellType.EMPTY else CellType.EMPTY
+            update_cells(planner, [pos])
+            step = planned_path(planner)[:1] if plan_cost(planner) < float("inf") else []
+            if step:
+                move_start(planner, step[0])
+            fresh = PathPlanner(grid, width, height, Position(planner.start % width, planner.start // width), goals)
+            assert plan_cost(planner) == plan_cost(fresh)
+
+    def test_local_change_expands_few_cells(self):
+        width, height = 40, 30
+        grid = make_grid(width, height)
+        planner = PathPlanner(grid, width, height, Position(1, 1), [Position(38, 28)])
+        initial = replan(planner)
+
+        grid[2][30] = CellType.MINE
+        update_cells(planner, [Position(30, 2)])
+        assert replan(planner) < initial / 4
+
+    def test_trail_changes_cost_nothing(self):
+        grid = make_grid()
+        planner = PathPlanner(grid, 9, 7, Position(1, 1), [Position(7, 5)])
+        replan(planner)
+        grid[1][2] = CellType.VISITED
+        assert apply_cell_changes(planner, [(2, 1, CellType.EMPTY, CellType.VISITED)]) == 0
+
+    def test_move_then_retarget_matches_fresh_planner(self):
+        grid = make_grid(12, 9)
+        for x, y in ((3, 2), (5, 5), (8, 3), (6, 7)):
+            grid[y][x] = CellType.MINE
+        planner = PathPlanner(grid, 12, 9, Position(1, 1), [Position(10, 7)])
+        replan(planner)
+        for start, goals in (((4, 1), [(1, 7)]), ((4, 4), [(10, 1), (2, 6)]), ((9, 6), [(1, 1)])):
+            move_start(planner, Position(*start))
+            set_goals(planner, [Position(*goal) for goal in goals])
+            fresh = PathPlanner(grid, 12, 9, Position(*start), [Position(*goal) for goal in goals])
+            assert plan_cost(planner) == plan_cost(fresh)
+
+    def test_retargeting_goals(self):
+        planner = PathPlanner(make_grid(), 9, 7, Position(4, 3), [Position(7, 3)])
+        replan(planner)
+        assert next_direction(planner) == Direction.RIGHT
+        set_goals(planner, [Position(1, 3)])
+        replan(planner)
+        assert next_direction(planner) == Direction.LEFT
+
+
+class TestPlannerAgent:
+    """Test the autopilot agent."""
+
+    @patch('pyxel.play')
+    def test_collects_item_then_reaches_exit(self, mock_play):
+        grid = make_grid()
+        grid[3][1] = CellType.PLAYER
+        grid[1][5] = CellType.ITEM
+        grid[5][7] = CellType.EXIT
+        grid[2][3] = CellType.MINE
+        state = GameState(
+            player_pos=Position(1, 3),
+            grid=grid,
+            items_collected=0,
+            total_items=1,
+            level=5,
+            exit_pos=Position(7, 5)
+        )
+        agent = PlannerAgent()
+        for _ in range(30):
+            if state.game_over:
+                break
+            try_player_move(state, agent(state, 9, 7), 9, 7)
+        assert state.won
+
+    @patch('pyxel.play')
+    def test_persistent_plan_matches_fresh_plan(self, mock_play):
+        for seed in range(4):
+            state = create_level_state(1, 20, 15, seed)
+            agent = PlannerAgent()
+            for _ in range(200):
+                if state.game_over:
+                    break
+                direction = agent(state, 20, 15)
+                planner = agent.planner
+                fresh = PathPlanner(planner.grid, 20, 15, state.player_pos,
+                                    [Position(i % 20, i // 20) for i in planner.goals])
+                set_risk(fresh, planner.risk)
+                assert planner.g[planner.start] == plan_cost(fresh)
+                if direction is None:
+                    break
+                try_player_move(state, direction, 20, 15)
+
+    def test_plans_without_hidden_mines(self):
+        grid = make_grid()
+        grid[3][1] = CellType.PLAYER
+        grid[3][4] = CellType.MINE
+        grid[3][7] = CellType.EXIT
+        state = GameState(
+            player_pos=Position(1, 3),
+            grid=grid,
+            items_collected=0,
+            total_items=0,
+            level=1,
+            exit_pos=Position(7, 3)
+        )
+        agent = PlannerAgent()
+        assert agent(state, 9, 7) == Direction.RIGHT
+        assert agent.view[3][4] == CellType.EMPTY
+        assert not agent.planner.mines.count(1)
+
+    def test_waits_when_only_known_mines_lead_on(self):
+        grid = make_grid()
+        for y in range(1, 6):
+            grid[y][2] = CellType.WALL
+        grid[3][1] = CellType.PLAYER
+        grid[2][1] = CellType.REVEALED_MINE
+        grid[4][1] = CellType.REVEALED_MINE
+        grid[3][2] = CellType.REVEALED_MINE
+        grid[3][7] = CellType.EXIT
+        state = GameState(
+            player_pos=Position(1, 3),
+            grid=grid,
+            items_collected=0,
+            total_items=0,
+            level=1,
+            exit_pos=Position(7, 3)
+        )
+        assert PlannerAgent()(state, 9, 7) is None
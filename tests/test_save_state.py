@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from mined_out.common import CELL_TYPES, Explosion, Position
+from mined_out.level_generation import create_level_state
+from mined_out.save_state import (
+    SaveFormatError, load_state_file, pack_codes, pack_state, packed_size, save_state_file,
+    unpack_codes, unpack_state
+)
+
+
+class TestPackCodes:
+    """Test 3-bit grid packing."""
+
+    @pytest.mark.parametrize("count", [1, 7, 8, 9, 300, 301])
+    def test_round_trip(self, count):
+        rng = random.Random(count)
+        codes = bytes(rng.randrange(len(CELL_TYPES)) for _ in range(count))
+        packed = pack_codes(codes)
+        assert len(packed) == -(-count // 8) * 3
+        assert unpack_codes(packed, count) == codes
+
+
+class TestSaveState:
+    """Test full game state save and load."""
+
+    def test_round_trip_fresh_level(self):
+        state = create_level_state(2, 20, 15, 1234)
+        data = pack_state(state)
+        assert len(data) == packed_size(20, 15)
+        assert unpack_state(data) == state
+
+    def test_round_trip_timers_and_explosion(self):
+        state = create_level_state(1, 20, 15, 5)
+        state.explosion = Explosion(Position(3, 4), 7)
+        state.revealing_mine_pos = Position(5, 6)
+        state.mine_reveal_timer = 42
+        state.game_over = True
+        state.items_collected = 2
+        state.mine_count_nearby = 3
+        restored = unpack_state(pack_state(state))
+        assert restored == state
+        assert restored.seed == 5
+
+    def test_bad_magic_is_rejected(self):
+        data = bytearray(pack_state(create_level_state(1, 20, 15, 1)))
+        data[0:4] = b"XXXX"
+        with pytest.raises(SaveFormatError):
+            unpack_state(bytes(data))
+
+    def test_unknown_version_is_rejected(self):
+        data = bytearray(pack_state(create_level_state(1, 20, 15, 1)))
+        data[4] = 99
+        with pytest.raises(SaveFormatError):
+            unpack_state(bytes(data))
+
+    def test_truncated_data_is_rejected(self):
+        data = pack_state(create_level_state(1, 20, 15, 1))
+        with pytest.raises(SaveFormatError):
+            unpack_state(data[:-1])
+
+    def test_file_round_trip(self, tmp_path):
+        state = create_level_state(3, 20, 15, 9)
+        path = str(tmp_path / "autosave.bin")
+        save_state_file(path, state)
+        assert load_state_file(path) == state
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+from mined_out.common import CellType, Direction, move_position
+from mined_out.frame_encoding import KEYFRAME, SpectatorView, apply_frame
+from mined_out.instrumentation import get_counter, reset_metrics
+from mined_out.level_generation import level_template
+from mined_out.session_host import (
+    OUTBOX_SIZE, Session, SessionHost, direction_command, open_session, seed_command,
+    send_frame, tick_session
+)
+from mined_out.spectator import read_frame
+
+
+def open_direction(state):
+    """A direction the player can step in without hitting a wall or mine."""
+    for direction in Direction:
+        pos = move_position(state.player_pos, direction)
+        if state.grid[pos.y][pos.x] in (CellType.EMPTY, CellType.ITEM):
+            return direction
+    return Direction.UP
+
+
+class TestSessionTicks:
+    """Test per-session budgets and backpressure without sockets."""
+
+    def test_commands_beyond_budget_wait_for_next_tick(self):
+        async def scenario():
+            host = SessionHost("unused", seed=3, moves_per_tick=4)
+            session = Session(1, host.new_state())
+            for _ in range(10):
+                session.inbox.put_nowait((b"U", Direction.UP, 0.0))
+            return tick_session(host, session), session.inbox.qsize(), session.outbox.qsize()
+
+        handled, waiting, replies = asyncio.run(scenario())
+        assert (handled, waiting, replies) == (4, 6, 4)
+
+    def test_full_outbox_drops_backlog_and_resyncs(self):
+        async def scenario():
+            reset_metrics()
+            host = SessionHost("unused", seed=3)
+            session = Session(1, host.new_state())
+            session.resync = False
+            for _ in range(OUTBOX_SIZE + 1):
+                send_frame(session, b"frame")
+            return session
+
+        session = asyncio.run(scenario())
+        assert session.resync
+        assert session.outbox.empty()
+        assert get_counter("host_frames_dropped") == OUTBOX_SIZE
+
+    def test_sessions_on_one_seed_share_level_template(self):
+        host = SessionHost("unused", seed=77)
+        level_template.cache_clear()
+        first, second = host.new_state(), host.new_state()
+        assert level_template.cache_info().hits == 1
+        assert first.grid == second.grid
+        assert first.grid is not second.grid
+
+
+class TestSessionHost:
+    """Test clients talking to a running host."""
+
+    def test_clients_get_one_frame_per_command(self, tmp_path):
+        address = str(tmp_path / "host.sock")
+
+        async def scenario():
+            host = SessionHost(address, seed=5, tick_rate=0)
+            await host.start()
+            try:
+                clients = [await open_session(address) for _ in range(3)]
+                views = []
+                for reader, writer in clients:
+                    view = SpectatorView()
+                    frame = await asyncio.wait_for(read_frame(reader), 2)
+                    assert frame[0] == KEYFRAME
+                    apply_frame(view, frame)
+                    views.append(view)
+
+                session = next(iter(host.sessions.values()))
+                direction = open_direction(session.state)
+                for (reader, writer), view in zip(clients, views):
+                    writer.write(direction_command(direction) * 3)
+                    await writer.drain()
+                    for _ in range(3):
+                        apply_frame(view, await asyncio.wait_for(read_frame(reader), 2))
+                states = [session.state for session in host.sessions.values()]
+                for reader, writer in clients:
+                    writer.close()
+                return views, states
+            finally:
+                await host.stop()
+
+        views, states = asyncio.run(scenario())
+        for view, state in zip(views, states):
+            assert view.player_pos == state.player_pos
+            assert view.seq == 4
+
+    def test_seed_command_restarts_with_keyframe(self, tmp_path):
+        address = str(tmp_path / "host.sock")
+
+        async def scenario():
+            host = SessionHost(address, tick_rate=0)
+            await host.start()
+            try:
+                reader, writer = await open_session(address)
+                await read_frame(reader)
+                writer.write(seed_command(1234))
+                await writer.drain()
+                frame = await asyncio.wait_for(read_frame(reader), 2)
+                seed = next(iter(host.sessions.values())).state.seed
+                writer.close()
+                return frame, seed
+            finally:
+                await host.stop()
+
+        frame, seed = asyncio.run(scenario())
+        assert frame[0] == KEYFRAME
+        assert seed == 1234
+
+    def test_metrics_endpoint_reports_json(self, tmp_path):
+        address = str(tmp_path / "host.sock")
+        metrics_address = str(tmp_path / "metrics.sock")
+
+        async def scenario():
+            reset_metrics()
+            host = SessionHost(address, metrics_address, seed=5, tick_rate=0)
+            await host.start()
+            try:
+                reader, writer = await open_session(address)
+                await read_frame(reader)
+                writer.write(b"U")
+                await writer.drain()
+                await asyncio.wait_for(read_frame(reader), 2)
+
+                metrics_reader, metrics_writer = await open_session(metrics_address)
+                metrics_writer.write(b"GET / HTTP/1.0\r\n\r\n")
+                response = await asyncio.wait_for(metrics_reader.read(), 2)
+                writer.close()
+                return response
+            finally:
+                await host.stop()
+
+        response = asyncio.run(scenario())
+        headers, body = response.split(b"\r\n\r\n", 1)
+        metrics = json.loads(body)
+        assert headers.startswith(b"HTTP/1.0 200")
+        assert metrics["sessions"] == 1
+        assert metrics["counters"]["host_moves"] == 1
+        assert metrics["host_move_latency"]["count"] == 1
@@ -0,0 +1,119 @@
+import asyncio
+
+from mined_out.common import CellType, Position
+from mined_out.game_state import GameState
+from mined_out.frame_encoding import (
+    FrameEncoder, SpectatorView, FRAME_LENGTH, KEYFRAME, DELTA,
+    encode_changes, encode_frame, apply_frame, frame_kind, view_cell
+)
+from mined_out.game_logic import try_player_move
+from mined_out.common import Direction
+from mined_out.spectator import SpectatorServer, parse_address, open_spectator_stream, read_frame
+
+
+LAYOUT = dict(width=8, height=6, player=(3, 4), exit=(6, 1), items=[(5, 2)])
+
+
+def step_up(state: GameState) -> None:
+    x, y = state.player_pos.x, state.player_pos.y
+    state.grid[y][x] = CellType.VISITED
+    state.grid[y - 1][x] = CellType.PLAYER
+    state.player_pos = Position(x, y - 1)
+
+
+class TestFrameEncoding:
+    """Test keyframe and delta encoding."""
+
+    def test_first_frame_is_keyframe(self, make_state):
+        frame = encode_frame(FrameEncoder(), make_state(**LAYOUT), 8, 6)
+        assert frame_kind(frame) == KEYFRAME
+
+    def test_unchanged_state_produces_no_frame(self, make_state):
+        encoder, state = FrameEncoder(), make_state(**LAYOUT)
+        encode_frame(encoder, state, 8, 6)
+        assert encode_frame(encoder, state, 8, 6) is None
+
+    def test_move_delta_is_a_few_bytes(self, make_state):
+        encoder, state = FrameEncoder(), make_state(**LAYOUT)
+        keyframe = encode_frame(encoder, state, 8, 6)
+        step_up(state)
+        delta = encode_frame(encoder, state, 8, 6)
+
+        assert frame_kind(delta) == DELTA
+        assert len(delta) <= 24
+        assert len(delta) < len(keyframe)
+
+    def test_keyframes_repeat_periodically(self, make_state):
+        encoder, state = FrameEncoder(keyframe_interval=2), make_state(**LAYOUT)
+        kinds = []
+        for _ in range(4):
+            kinds.append(frame_kind(encode_frame(encoder, state, 8, 6)))
+            state.items_collected += 1
+        assert kinds == [KEYFRAME, DELTA, DELTA, KEYFRAME]
+
+    def test_decoded_view_matches_state(self, make_state):
+        encoder, state, view = FrameEncoder(), make_state(**LAYOUT), SpectatorView()
+        apply_frame(view, encode_frame(encoder, state, 8, 6)[FRAME_LENGTH.size:])
+        step_up(state)
+        state.items_collected = 1
+        apply_frame(view, encode_frame(encoder, state, 8, 6)[FRAME_LENGTH.size:])
+
+        assert view.player_pos == Position(3, 3)
+        assert view.items_collected == 1
+        for y in range(6):
+            for x in range(8):
+                assert view_cell(view, x, y) == state.grid[y][x]
+
+    def test_change_log_delta_matches_grid_scan(self, make_state):
+        state = make_state(**LAYOUT)
+        state.cell_changes = []
+        logged, scanned = FrameEncoder(), FrameEncoder()
+        encode_changes(logged, state, state.cell_changes, 8, 6)
+        encode_frame(scanned, state, 8, 6)
+
+        try_player_move(state, Direction.RIGHT, 8, 6)
+        assert len(state.cell_changes) == 2
+        assert encode_changes(logged, state, state.cell_changes, 8, 6) == encode_frame(scanned, state, 8, 6)
+        state.cell_changes.clear()
+        assert encode_changes(logged, state, state.cell_changes, 8, 6) is None
+
+    def test_delta_before_keyframe_is_rejected(self, make_state):
+        encoder, state = FrameEncoder(), make_state(**LAYOUT)
+        encode_frame(encoder, state, 8, 6)
+        step_up(state)
+        delta = encode_frame(encoder, state, 8, 6)
+        assert not apply_frame(SpectatorView(), delta[FRAME_LENGTH.size:])
+
+
+class TestSpectatorServer:
+    """Test live streaming to viewers."""
+
+    def test_parse_address(self):
+        assert parse_address("127.0.0.1:9000") == (None, "127.0.0.1", 9000)
+        assert parse_address(":9000") == (None, "127.0.0.1", 9000)
+        assert parse_address("/tmp/game.sock") == ("/tmp/game.sock", "", 0)
+
+    def test_late_joiner_syncs_from_keyframe_and_backlog(self, tmp_path, make_state):
+        address = str(tmp_path / "spectate.sock")
+        server = SpectatorServer(address)
+        server.start()
+        state = make_state(**LAYOUT)
+        try:
+            server.publish_state(state, 8, 6)
+            step_up(state)
+            server.publish_state(state, 8, 6)
+
+            async def join_and_read(count):
+                reader, writer = await open_spectator_stream(address)
+                view = SpectatorView()
+                for _ in range(count):
+                    apply_frame(view, await asyncio.wait_for(read_frame(reader), 2))
+                writer.close()
+                return view
+
+            view = asyncio.run(join_and_read(2))
+        finally:
+            server.stop()
+
+        assert view.player_pos == Position(3, 3)
+        assert view_cell(view, 3, 4) == CellType.VISITED
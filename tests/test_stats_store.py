@@ -0,0 +1,109 @@
+import sqlite3
+
+from mined_out.common import Position
+from mined_out.game_state import GameState
+from mined_out.grid_operations import create_empty_grid
+from mined_out.stats_store import (
+    RunResult, StatsStore, best_runs_per_level, cause_of_death, difficulty_stats, result_from_state
+)
+
+
+def run(seed, level, moves, won=False, agent="bot"):
+    return RunResult(seed, agent, level, moves, moves * 0.1, won, None if won else "mine")
+
+
+class TestStatsStore:
+    """Test batched SQLite run logging."""
+
+    def test_batched_writes_persist_every_run(self, tmp_path):
+        path = str(tmp_path / "stats.db")
+        with StatsStore(path, batch_size=100) as store:
+            for seed in range(1000):
+                store.record(run(seed, 1 + seed % 3, seed))
+
+        assert store.written == 1000
+        with sqlite3.connect(path) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM runs").fetchone() == (1000,)
+            assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_write_errors_are_reported_and_writer_survives(self, tmp_path, capsys):
+        path = str(tmp_path / "stats.db")
+        with StatsStore(path, flush_interval=0.01) as store:
+            with sqlite3.connect(path) as connection:
+                connection.execute("CREATE TRIGGER reject BEFORE INSERT ON runs BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+            store.record(run(1, 1, 10))
+            store.record(run(2, 1, 20))
+
+        assert store.written == 0
+        assert store.dropped == 2
+        assert isinstance(store.error, sqlite3.Error)
+        assert "rejected" in capsys.readouterr().err
+
+    def test_best_runs_per_level(self, tmp_path):
+        path = str(tmp_path / "stats.db")
+        with StatsStore(path) as store:
+            store.record(run(1, 1, 30))
+            store.record(run(2, 1, 10))
+            store.record(run(3, 2, 50, won=True))
+            store.record(run(4, 2, 20))
+
+        best = best_runs_per_level(path, limit=1)
+
+        assert [(r.level_reached, r.seed) for r in best] == [(1, 2), (2, 3)]
+
+    def test_difficulty_stats(self, tmp_path):
+        path = str(tmp_path / "stats.db")
+        with StatsStore(path) as store:
+            for seed in range(6):
+                store.record(run(seed, 1, 5))
+            for seed in range(6, 10):
+                store.record(run(seed, 2, 9))
+            store.record(run(99, 1, 5, agent="human"))
+
+        stats = difficulty_stats(path, agent="bot")
+
+        assert [s.level for s in stats] == [1, 2]
+        assert stats[0].runs_reached == 10
+        assert stats[0].death_rate == 0.6
+        assert stats[1].runs_reached == 4
+        assert stats[1].death_rate == 1.0
+
+    def test_only_mine_deaths_count_as_deaths(self, tmp_path):
+        path = str(tmp_path / "stats.db")
+        with StatsStore(path) as store:
+            store.record(run(1, 1, 5))
+            store.record(RunResult(2, "bot", 1, 500, 1.0, False, "stalled"))
+            store.record(RunResult(3, "bot", 1, 7, 0.7, False, None))
+
+        stats = difficulty_stats(path)
+
+        assert stats[0].runs_reached == 3
+        assert stats[0].deaths == 1
+
+    def test_result_from_state(self):
+        state = GameState(
+            player_pos=Position(1, 1),
+            grid=create_empty_grid(3, 3),
+            items_collected=0,
+            total_items=1,
+            level=3,
+            exit_pos=Position(2, 2),
+            game_over=True
+        )
+        result = result_from_state(state, 42, "human", 17, 3.5)
+        assert result == RunResult(42, "human", 3, 17, 3.5, False, "mine")
+
+    def test_cause_of_death_only_for_lost_games(self):
+        state = GameState(
+            player_pos=Position(1, 1),
+            grid=create_empty_grid(3, 3),
+            items_collected=0,
+            total_items=1,
+            level=1,
+            exit_pos=Position(2, 2)
+        )
+        assert cause_of_death(state) is None
+        state.game_over = True
+        assert cause_of_death(state) == "mine"
+        state.won = True
+        assert cause_of_death(state) is None
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from mined_out.common import CellType
+from mined_out.agents import RandomAgent
+from mined_out.terminal_frontend import (
+    TerminalScreen, KEY_QUIT, compose_frame, diff_frame, run_terminal
+)
+
+
+class FakeWindow:
+    """Stand-in for a curses window that quits after a number of ticks."""
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.writes = []
+
+    def getch(self):
+        if self.ticks == 0:
+            return KEY_QUIT
+        self.ticks -= 1
+        return -1
+
+    def addstr(self, y, x, text):
+        self.writes.append((y, x, text))
+
+    def nodelay(self, flag):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+
+LAYOUT = dict(width=6, height=5, player=(2, 2), exit=(4, 1), items=[(3, 3)])
+
+
+class TestTerminalFrontend:
+    """Test diff-only terminal rendering."""
+
+    def test_compose_frame_lines_are_equal_width(self, make_state):
+        frame = compose_frame(make_state(**LAYOUT))
+        assert len(frame) == 5 + 2
+        assert len({len(line) for line in frame}) == 1
+        assert frame[2].startswith("#.@..#")
+
+    def test_first_frame_writes_every_line(self, make_state):
+        frame = compose_frame(make_state(**LAYOUT))
+        assert diff_frame(None, frame) == [(y, 0, line) for y, line in enumerate(frame)]
+
+    def test_identical_frames_write_nothing(self, make_state):
+        frame = compose_frame(make_state(**LAYOUT))
+        assert diff_frame(frame, list(frame)) == []
+
+    def test_move_writes_only_changed_span(self, make_state):
+        state = make_state(**LAYOUT)
+        before = compose_frame(state)
+        state.grid[2][2] = CellType.VISITED
+        state.grid[2][3] = CellType.PLAYER
+        spans = diff_frame(before, compose_frame(state))
+        assert spans == [(2, 2, ",@")]
+
+    @patch('mined_out.terminal_frontend.curses.doupdate')
+    def test_screen_skips_refresh_when_unchanged(self, mock_doupdate, make_state):
+        screen = TerminalScreen(FakeWindow(0))
+        frame = compose_frame(make_state(**LAYOUT))
+        assert screen.present(frame) == len(frame)
+        assert screen.present(frame) == 0
+        assert mock_doupdate.call_count == 1
+
+    @patch('mined_out.terminal_frontend.curses.doupdate')
+    @patch('mined_out.terminal_frontend.curses.curs_set')
+    def test_bot_playback_at_max_speed(self, mock_curs_set, mock_doupdate, make_state):
+        window = FakeWindow(300)
+        run_terminal(window, RandomAgent(1), fps=0)
+        full_frame_writes = len(compose_frame(make_state(**LAYOUT)))
+        assert len(window.writes) < 300 * full_frame_writes
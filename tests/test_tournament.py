@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from mined_out.agents import RandomAgent
+from mined_out.level_generation import create_level_state
+from mined_out.tournament import (
+    LevelPack, load_checkpoint, load_level, play_game, resolve_agent, run_tournament, summarize,
+    wilson_interval, write_level_pack
+)
+
+SEEDS = [3, 7, 11]
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = str(tmp_path / "levels.pack")
+    write_level_pack(path, SEEDS, 20, 15)
+    return path
+
+
+class TestLevelPack:
+    """Test the memory-mapped level pack."""
+
+    def test_levels_match_generation(self, pack_path):
+        pack = LevelPack(pack_path)
+        assert pack.seeds == SEEDS
+        for level in (1, 3, 5):
+            assert load_level(pack, level, 20, 15, 7) == create_level_state(level, 20, 15, 7)
+
+    def test_loaded_levels_are_independent(self, pack_path):
+        pack = LevelPack(pack_path)
+        first = load_level(pack, 1, 20, 15, 3)
+        first.grid[1][1] = None
+        assert load_level(pack, 1, 20, 15, 3).grid[1][1] is not None
+
+
+class TestTournament:
+    """Test playing and scoring agents."""
+
+    def test_play_game_is_deterministic(self, pack_path, monkeypatch):
+        monkeypatch.setattr("pyxel.play", lambda *args, **kwargs: None)
+        pack = LevelPack(pack_path)
+        first = play_game("random", RandomAgent(1), pack, 3, max_moves=200)
+        second = play_game("random", RandomAgent(1), pack, 3, max_moves=200)
+        assert (first.moves, first.level_reached, first.won) == (second.moves, second.level_reached, second.won)
+        assert 0 < first.moves <= 200
+
+    def test_resumes_from_checkpoint(self, pack_path, tmp_path):
+        checkpoint = str(tmp_path / "results.jsonl")
+        summaries = run_tournament(["random", "planner"], pack_path, checkpoint, workers=1, max_moves=100)
+        assert [s.games for s in summaries] == [3, 3]
+        assert len(load_checkpoint(checkpoint)) == 6
+
+        again = run_tournament(["random", "planner"], pack_path, checkpoint, workers=1, max_moves=100)
+        assert len(load_checkpoint(checkpoint)) == 6
+        assert again == summaries
+
+    def test_torn_checkpoint_line_is_ignored(self, tmp_path):
+        checkpoint = tmp_path / "results.jsonl"
+        row = {"seed": 1, "agent": "random", "level_reached": 2, "moves": 5, "duration": 0.1,
+               "won": False, "cause_of_death": "mine"}
+        checkpoint.write_text(json.dumps(row) + "\n" + '{"seed": 2, "ag')
+        assert len(load_checkpoint(str(checkpoint))) == 1
+        assert checkpoint.read_text() == json.dumps(row) + "\n"
+
+    def test_resume_after_torn_line_appends_cleanly(self, pack_path, tmp_path):
+        checkpoint = tmp_path / "results.jsonl"
+        run_tournament(["random"], pack_path, str(checkpoint), workers=1, max_moves=100)
+        lines = checkpoint.read_text().splitlines(keepends=True)
+        checkpoint.write_text(lines[0] + lines[1][:10])
+
+        run_tournament(["random"], pack_path, str(checkpoint), workers=1, max_moves=100)
+        assert len(load_checkpoint(str(checkpoint))) == 3
+        run_tournament(["random"], pack_path, str(checkpoint), workers=1, max_moves=100)
+        assert len(checkpoint.read_text().splitlines()) == 3
+
+    def test_resolve_agent(self):
+        assert resolve_agent("mined_out.agents:RandomAgent") is RandomAgent
+        with pytest.raises(ValueError):
+            resolve_agent("nonsense")
+
+
+class TestStatistics:
+    """Test confidence intervals."""
+
+    def test_wilson_interval_bounds(self):
+        low, high = wilson_interval(0, 10)
+        assert low == 0.0 and 0.0 < high < 0.4
+        low, high = wilson_interval(50, 100)
+        assert low < 0.5 < high
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_summarize_empty(self):
+        summary = summarize("none", [])
+        assert summary.games == 0 and summary.mean_level == 0.0
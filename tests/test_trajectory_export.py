@@ -0,0 +1,116 @@
+import ast
+import zipfile
+
+import pytest
+
+from mined_out.agents import PlannerAgent, RandomAgent
+from mined_out.common import CELL_CODES, CellType, Direction
+from mined_out.level_generation import create_level_state
+from mined_out import tournament, trajectory_export
+from mined_out.trajectory_export import (
+    TransitionChunk, append_transition, export_trajectories, npy_header, observe, play_transitions,
+    transition_chunks, write_npz
+)
+
+
+def read_npy(data):
+    header_length = int.from_bytes(data[8:10], "little")
+    header = ast.literal_eval(data[10:10 + header_length].decode("latin1"))
+    return header, data[10 + header_length:]
+
+
+class TestObservation:
+    """Test what agents are shown."""
+
+    def test_window_hides_mines_and_pads_with_walls(self):
+        state = create_level_state(1, 20, 15, 2)
+        codes = observe(state, 20, 15, radius=2)
+        assert len(codes) == 25
+        assert CELL_CODES[CellType.MINE] not in codes
+        assert codes[12] == CELL_CODES[CellType.PLAYER]
+        state.player_pos = type(state.player_pos)(0, 0)
+        assert observe(state, 20, 15, radius=2)[:3] == bytes([CELL_CODES[CellType.WALL]]) * 3
+
+
+class TestTransitions:
+    """Test episode streaming and chunking."""
+
+    def test_episode_ends_with_done_or_truncation(self):
+        transitions = list(play_transitions(PlannerAgent(), 5, 20, 15, max_moves=300))
+        assert transitions
+        assert not any(t.done or t.truncated for t in transitions[:-1])
+        assert transitions[-1].done != transitions[-1].truncated
+        assert len(transitions) <= 300
+
+    def test_move_limit_marks_last_step_truncated(self):
+        transitions = list(play_transitions(RandomAgent(2), 2, 20, 15, max_moves=3))
+        assert len(transitions) == 3
+        assert transitions[-1].truncated and not transitions[-1].done
+
+    def test_stalled_agent_marks_last_step_truncated(self):
+        moves = iter([Direction.UP, Direction.DOWN])
+        transitions = list(play_transitions(lambda state, w, h: next(moves, None), 1, 20, 15))
+        assert [t.truncated for t in transitions] == [False, True]
+
+    def test_truncation_marks_episode_boundaries_in_chunks(self):
+        chunk = next(transition_chunks("random", range(3), 20, 15, chunk_size=10000, max_moves=5))
+        ends = [i for i in range(chunk.count) if chunk.dones[i] or chunk.truncateds[i]]
+        assert len(ends) == 3
+        assert ends[-1] == chunk.count - 1
+
+    def test_chunks_respect_size(self):
+        chunks = list(transition_chunks("random", range(3), 20, 15, chunk_size=50, max_moves=100))
+        assert all(chunk.count == 50 for chunk in chunks[:-1])
+        assert 0 < chunks[-1].count <= 50
+
+
+class TestNpzWriting:
+    """Test the stdlib .npz writer."""
+
+    def test_header_is_aligned(self):
+        header = npy_header("<f4", (7,))
+        assert len(header) % 64 == 0
+        assert b"'shape': (7,)" in header
+
+    def test_arrays_round_trip(self, tmp_path):
+        chunk = TransitionChunk(radius=1)
+        for transition in play_transitions(PlannerAgent(), 3, 20, 15, radius=1, max_moves=20):
+            append_transition(chunk, transition)
+        path = str(tmp_path / "chunk.npz")
+        write_npz(path, chunk)
+        with zipfile.ZipFile(path) as archive:
+            assert sorted(archive.namelist()) == ["action.npy", "done.npy", "mine_count.npy", "reward.npy",
+                                                  "truncated.npy", "window.npy"]
+            header, data = read_npy(archive.read("window.npy"))
+            assert header["shape"] == (chunk.count, 3, 3)
+            assert data == bytes(chunk.windows)
+            header, data = read_npy(archive.read("reward.npy"))
+            assert header["descr"] == "<f4" and len(data) == 4 * chunk.count
+
+    def test_parallel_export_matches_serial(self, tmp_path):
+        serial = export_trajectories("random", list(range(4)), str(tmp_path / "serial"), workers=1,
+                                     width=20, height=15, chunk_size=64, max_moves=50)
+        parallel = export_trajectories("random", list(range(4)), str(tmp_path / "parallel"), workers=2,
+                                       width=20, height=15, chunk_size=64, max_moves=50)
+        assert serial[1] == parallel[1]
+
+    def test_writer_error_stops_producers(self, tmp_path, monkeypatch):
+        def failing_write(path, chunk, compress=False):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(trajectory_export, "write_npz", failing_write)
+        # one-transition chunks overflow the queue, so producers are blocked in put() when the write fails
+        with pytest.raises(OSError, match="disk full"):
+            export_trajectories("random", list(range(4)), str(tmp_path), workers=2,
+                                width=20, height=15, chunk_size=1, max_moves=50)
+
+    def test_producer_crash_fails_export(self, tmp_path, monkeypatch):
+        def broken_agent(seed):
+            if seed == 1:
+                raise ValueError("agent blew up")
+            return tournament.random_agent(seed)
+
+        monkeypatch.setitem(tournament.BUILTIN_AGENTS, "broken", broken_agent)
+        with pytest.raises(RuntimeError, match="agent blew up"):
+            export_trajectories("broken", list(range(4)), str(tmp_path), workers=2,
+                                width=20, height=15, chunk_size=64, max_moves=50)